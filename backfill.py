@@ -0,0 +1,120 @@
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+from conn import close_pool, get_backfill_connections, get_backfill_processes, limit_pool
+from main import build_workbook, logger, refresh_tables, year_start_for
+
+class MonthRun(NamedTuple):
+    """
+    Outcome of one month of a backfill: its report end date, the saved
+    workbook (None when it failed) and how long building it took.
+    """
+    end_date: str
+    output_file: Optional[str]
+    seconds: float
+
+def month_ends(start_date: str, end_date: str) -> List[str]:
+    """
+    Return the report end date of every month touched by start_date..end_date:
+    the last day of each month, and end_date itself for the last one.
+    """
+    ends = []
+    month_dt = datetime.strptime(start_date, "%Y-%m-%d").replace(day=1)
+    while month_dt.strftime("%Y-%m-%d") <= end_date:
+        next_month_dt = (month_dt + timedelta(days=32)).replace(day=1)
+        ends.append(min((next_month_dt - timedelta(days=1)).strftime("%Y-%m-%d"), end_date))
+        month_dt = next_month_dt
+    return ends
+
+def year_segments(start_date: str, end_date: str) -> List[Tuple[str, str]]:
+    """
+    Split start_date..end_date at year boundaries. Week and month numbers are
+    counted from the year start, so each year is its own stored procedure run.
+    """
+    segments = []
+    first = start_date
+    while first <= end_date:
+        last = min(f"{first[:4]}-12-31", end_date)
+        segments.append((first, last))
+        first = f"{int(first[:4]) + 1}-01-01"
+    return segments
+
+def build_month(end_date: str) -> MonthRun:
+    """
+    Build one month's workbook in a backfill worker process. The tables were
+    rebuilt by the backfill, so the month is never updated from a prior workbook.
+    """
+    started = time.perf_counter()
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+    try:
+        output_file = build_workbook(end_dt, end_date, year_start_for(end_dt), end_dt.year, incremental=False)
+    except Exception as e:
+        logger.error(f"Error building the workbook for {end_date}: {e}")
+        output_file = None
+    finally:
+        close_pool()
+    return MonthRun(end_date, output_file, time.perf_counter() - started)
+
+def backfill(start_date: str, end_date: str) -> List[MonthRun]:
+    """
+    Rebuild the reporting tables for start_date..end_date with chunked stored
+    procedure runs, then build every touched month's workbook, one worker
+    process per month. The connections held across all processes stay within
+    [backfill] connections. Returns one MonthRun per month, or nothing when
+    the stored procedure failed.
+    """
+    connections = get_backfill_connections()
+    limit_pool(connections)
+
+    started = time.perf_counter()
+    try:
+        for first, last in year_segments(start_date, end_date):
+            if not refresh_tables(first, last, year_start_for(datetime.strptime(first, "%Y-%m-%d"))):
+                logger.error(f"Backfill stopped: the stored procedure failed for {first} to {last}.")
+                return []
+    finally:
+        # Release the driver's connections before the workers open theirs
+        close_pool()
+    logger.info(f"Stored procedure for {start_date} to {end_date} took {time.perf_counter() - started:.1f}s.")
+
+    months = month_ends(start_date, end_date)
+    processes = min(get_backfill_processes(), connections, len(months))
+    logger.info(f"Building {len(months)} monthly workbooks with {processes} processes...")
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=limit_pool, initargs=(max(1, connections // processes),)
+    ) as executor:
+        return list(executor.map(build_month, months))
+
+def log_summary(runs: List[MonthRun], seconds: float) -> None:
+    """Log how long every month took and which ones failed."""
+    logger.info("Backfill summary:")
+    for run in runs:
+        outcome = f"saved {run.output_file}" if run.output_file else "FAILED"
+        logger.info(f"  {run.end_date[:7]} (to {run.end_date}): {run.seconds:.1f}s, {outcome}")
+    failed = sum(1 for run in runs if not run.output_file)
+    logger.info(f"Backfill of {len(runs)} months took {seconds:.1f}s, {failed} failed.")
+
+if __name__ == "__main__":
+    # Regenerate every month of a range after a data fix:
+    #   python backfill.py START_DATE END_DATE
+    if len(sys.argv) != 3:
+        print("Usage: python backfill.py YYYY-MM-DD YYYY-MM-DD")
+        sys.exit(1)
+
+    start_date, end_date = sys.argv[1:3]
+    try:
+        datetime.strptime(start_date, "%Y-%m-%d")
+        datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError:
+        print("Invalid date format. Use YYYY-MM-DD.")
+        sys.exit(1)
+    if start_date > end_date:
+        print("START_DATE must not be after END_DATE.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    runs = backfill(start_date, end_date)
+    log_summary(runs, time.perf_counter() - started)
+    sys.exit(0 if runs and all(run.output_file for run in runs) else 1)
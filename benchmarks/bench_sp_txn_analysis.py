@@ -0,0 +1,210 @@
+"""
+Before/after benchmark for sp_txn_analysis: the per-table procedure, which
+scans the staged transactions once per txn_analysis table, versus the
+single-pass procedure of sql/sp_sla_report.sql, staging in #temp tables and,
+where the scratch database has a MEMORY_OPTIMIZED_DATA filegroup, in the
+memory-optimized table variables of sql/txn_analysis_memory_staging.sql.
+
+Loads a synthetic month of transactions and inserted bills into a scratch
+database on the server of config.ini, with the source indexes of
+sql/tbl_transaction_master_indexes.sql, installs the procedures there with
+their source tables pointed at it, times each on the month and checks that
+all of them fill every txn_analysis table with the same rows. Nothing is
+written outside the scratch database.
+
+    python benchmarks/bench_sp_txn_analysis.py SCRATCH_DATABASE [transactions] [YYYY-MM] [runs]
+"""
+import os
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+import pyodbc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from conn import config, get_connection
+
+SOURCE_DDL = """
+DROP TABLE IF EXISTS [dbo].[TBL_TRANSACTION_MASTER];
+CREATE TABLE [dbo].[TBL_TRANSACTION_MASTER] (
+    TRANSACTION_DATE   DATETIME NOT NULL,
+    CREATED_DATE       DATETIME NULL,
+    UPDATED_DATE       DATETIME NULL,
+    TRANSACTION_CODE   VARCHAR(50) NOT NULL,
+    TERMINAL_CODE      VARCHAR(50) NOT NULL,
+    FINAL_STATUS       VARCHAR(50) NOT NULL,
+    PAY_CASH_AMOUNT    DECIMAL(18,2) NULL,
+    TRANSACTION_AMOUNT DECIMAL(18,2) NULL,
+    CUSTOMER_MOBILE    VARCHAR(20) NULL
+);
+DROP TABLE IF EXISTS [dbo].[TBL_TRANSACTION_INSERTED_BILL_LOGS];
+CREATE TABLE [dbo].[TBL_TRANSACTION_INSERTED_BILL_LOGS] (
+    TERMINAL_CODE    VARCHAR(50) NOT NULL,
+    TRANSACTION_CODE VARCHAR(50) NOT NULL,
+    DENOMINATION     VARCHAR(10) NOT NULL,
+    INSERTED_DATE    DATETIME NOT NULL
+);
+"""
+
+# Transactions spread evenly over the month; the other columns are derived
+# from CHECKSUM of the row number so every load of the same size is identical
+LOAD_TRANSACTIONS = """
+WITH N AS (
+    SELECT TOP (?) CAST(ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS BIGINT) AS I
+    FROM sys.all_objects A CROSS JOIN sys.all_objects B CROSS JOIN sys.all_objects C
+)
+INSERT INTO [dbo].[TBL_TRANSACTION_MASTER]
+SELECT T.TRANSACTION_DATE
+, T.TRANSACTION_DATE
+, DATEADD(SECOND, ABS(CHECKSUM(N.I, 1)) % 200 - 10, T.TRANSACTION_DATE)
+, 'TXN' + CAST(N.I AS VARCHAR(20))
+, 'T' + CAST(N.I % 200 AS VARCHAR(20))
+, CHOOSE(ABS(CHECKSUM(N.I, 2)) % 3 + 1, 'SUCCESS', 'FAILED', 'PENDING')
+, CASE WHEN N.I % 4 = 0 THEN 0 ELSE ABS(CHECKSUM(N.I, 3)) % 8000 END
+, ABS(CHECKSUM(N.I, 4)) % 8000
+, CASE WHEN N.I % 20 = 0 THEN ' ' ELSE '09' + RIGHT('00000000' + CAST(N.I AS VARCHAR(20)), 9) END
+FROM N
+CROSS APPLY (SELECT DATEADD(SECOND, CAST(N.I * ? / ? AS INT), CAST(? AS DATETIME)) AS TRANSACTION_DATE) T
+"""
+
+# One to four bills for about half of the cash transactions
+LOAD_BILLS = """
+INSERT INTO [dbo].[TBL_TRANSACTION_INSERTED_BILL_LOGS]
+SELECT M.TERMINAL_CODE
+, M.TRANSACTION_CODE
+, CHOOSE(ABS(CHECKSUM(M.TRANSACTION_CODE, K.K)) % 6 + 1, '20', '50', '100', '200', '500', '1000')
+, DATEADD(SECOND, K.K, M.TRANSACTION_DATE)
+FROM [dbo].[TBL_TRANSACTION_MASTER] M
+CROSS JOIN (VALUES (1), (2), (3), (4)) K(K)
+WHERE M.PAY_CASH_AMOUNT > 0
+AND CHECKSUM(M.TRANSACTION_CODE) % 2 = 0
+AND K.K <= 1 + ABS(CHECKSUM(M.TRANSACTION_CODE, 0)) % 4
+"""
+
+# (label, procedure, file, @STAGING); the per-table procedure has no @STAGING
+PROCEDURES = (
+    ("per-table", "sp_txn_analysis_per_table", os.path.join(ROOT, "benchmarks", "sp_txn_analysis_per_table.sql"), None),
+    ("single-pass", "sp_txn_analysis", os.path.join(ROOT, "sql", "sp_sla_report.sql"), "TEMP"),
+    ("single-pass memory", "sp_txn_analysis", os.path.join(ROOT, "sql", "sp_sla_report.sql"), "MEMORY"),
+)
+MEMORY_TYPES = os.path.join(ROOT, "sql", "txn_analysis_memory_staging.sql")
+SOURCE_INDEXES = os.path.join(ROOT, "sql", "tbl_transaction_master_indexes.sql")
+
+# Called by the single-pass procedure to keep the week and month rollups and
+# the month partitions it switches in
+HELPER_PROCEDURES = (
+    os.path.join(ROOT, "sql", "sp_txn_analysis_rollup.sql"),
+    os.path.join(ROOT, "sql", "sp_txn_analysis_partitions.sql"),
+)
+ROLLUP_SUFFIXES = ("_week", "_month")
+
+def procedure_batches(path: str) -> list:
+    # Point the cross-database source tables and catalog at the scratch database
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    text = re.sub(r"\[BTIPAYMENTDB\]\.(\[dbo\]|sys)\.", r"\1.", text, flags=re.IGNORECASE)
+    return [batch for batch in re.split(r"^\s*GO\s*$", text, flags=re.MULTILINE) if batch.strip()]
+
+def report_tables(ddl: str) -> list:
+    return re.findall(r"CREATE TABLE \[dbo\]\.\[(\w+)\]", ddl)
+
+def install_memory_types(cursor) -> bool:
+    """
+    Install the memory-optimized staging types, or return False when the scratch
+    database cannot hold memory-optimized data.
+    """
+    try:
+        for batch in procedure_batches(MEMORY_TYPES):
+            cursor.execute(batch)
+        return True
+    except pyodbc.Error as e:
+        print(f"Skipping memory-optimized staging: {e}")
+        return False
+
+def setup(cursor, transactions: int, month_start: date, month_end: date) -> list:
+    with open(os.path.join(ROOT, "sql", "txn_analysis_ddl_compressed.sql"), encoding="utf-8") as f:
+        ddl = f.read()
+    tables = report_tables(ddl)
+    for table in tables:
+        cursor.execute(f"DROP TABLE IF EXISTS [dbo].[{table}]")
+    cursor.execute(ddl)
+    cursor.execute(SOURCE_DDL)
+
+    seconds = ((month_end - month_start).days + 1) * 86400
+    cursor.execute(LOAD_TRANSACTIONS, transactions, seconds - 1, transactions, month_start.isoformat())
+    cursor.execute(LOAD_BILLS)
+    # The recommended source indexes, built offline as any edition can
+    for batch in procedure_batches(SOURCE_INDEXES):
+        cursor.execute(batch.replace("ONLINE = ON, ", ""))
+
+    for path in HELPER_PROCEDURES + (os.path.join(ROOT, "sql", "txn_analysis_partitioning.sql"),):
+        for batch in procedure_batches(path):
+            cursor.execute(batch)
+    for path in dict.fromkeys(path for _, _, path, _ in PROCEDURES):
+        for batch in procedure_batches(path):
+            cursor.execute(batch)
+    # Only the single-pass procedure keeps rollups, so only the daily tables are compared
+    return [table for table in tables if not table.endswith(ROLLUP_SUFFIXES)]
+
+def run(cursor, procedure: str, staging, month_start: date, month_end: date) -> float:
+    params = [month_start, month_end, month_start.replace(month=1)]
+    query = f"EXEC [dbo].[{procedure}] @START_DT = ?, @END_DT = ?, @YEAR_START = ?"
+    if staging:
+        query += ", @STAGING = ?"
+        params.append(staging)
+    started = time.perf_counter()
+    cursor.execute(query, *params)
+    while cursor.nextset():
+        pass
+    return time.perf_counter() - started
+
+def snapshot(cursor, tables: list) -> dict:
+    rows = {}
+    for table in tables:
+        cursor.execute(f"SELECT * FROM [dbo].[{table}] ORDER BY 1, 2, 3")
+        rows[table] = [tuple(row) for row in cursor.fetchall()]
+    return rows
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    database = sys.argv[1]
+    transactions = int(sys.argv[2]) if len(sys.argv) > 2 else 300000
+    month_start = date.fromisoformat((sys.argv[3] if len(sys.argv) > 3 else "2025-06") + "-01")
+    runs = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    month_end = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+    if database.upper() in (config["database"]["DATABASE"].upper(), "BTIPAYMENTDB"):
+        print(f"Refusing to load synthetic data into {database}; use a scratch database.")
+        sys.exit(1)
+
+    conn = get_connection()
+    conn.autocommit = True
+    cursor = conn.cursor()
+    cursor.execute(f"USE [{database}]")
+    tables = setup(cursor, transactions, month_start, month_end)
+    procedures = [entry for entry in PROCEDURES if entry[3] != "MEMORY" or install_memory_types(cursor)]
+
+    timings, outputs = {}, {}
+    for _ in range(runs):
+        for label, procedure, _, staging in procedures:
+            timings.setdefault(label, []).append(run(cursor, procedure, staging, month_start, month_end))
+            outputs[label] = snapshot(cursor, tables)
+    conn.close()
+
+    print(f"{transactions} transactions in {month_start:%Y-%m}, best of {runs} runs")
+    baseline_label = procedures[0][0]
+    baseline = min(timings[baseline_label])
+    width = max(len(label) for label, _, _, _ in procedures)
+    for label, _, _, _ in procedures:
+        best = min(timings[label])
+        print(f"{label + ' procedure:':<{width + 12}} {best:.3f}s ({baseline / best:.1f}x)")
+        mismatched = [table for table in tables if outputs[baseline_label][table] != outputs[label][table]]
+        if mismatched:
+            print(f"  Tables that differ from {baseline_label}: {', '.join(mismatched)}")
+    print(f"Procedures fill every table identically to {baseline_label} unless listed above.")
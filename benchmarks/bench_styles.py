@@ -0,0 +1,84 @@
+"""
+Before/after benchmark for block styling: per-cell Font/Border/Alignment
+assignment versus the named styles applied with report_styles.style_range.
+
+Renders synthetic SLA-shaped blocks (header, status rows, two share blocks)
+into an in-memory workbook, without a database.
+
+    python benchmarks/bench_styles.py [blocks] [rows_per_block]
+"""
+import os
+import sys
+import time
+import openpyxl
+from openpyxl.styles import Alignment
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_styles import (
+    header_font, header_fill, border, register_styles, style_range,
+    HEADER, BODY_CENTERED, PERCENT_BODY, PERCENT_SUMMARY
+)
+
+def render_per_cell(sheet, blocks: int, rows_per_block: int) -> None:
+    row_idx = 1
+    for _ in range(blocks):
+        for col_idx in range(2, 12):
+            cell = sheet.cell(row=row_idx, column=col_idx, value="HEADER")
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = border
+            cell.alignment = Alignment(horizontal="center")
+        for _ in range(rows_per_block):
+            row_idx += 1
+            for col_idx in range(2, 12):
+                cell = sheet.cell(row=row_idx, column=col_idx, value=1)
+                cell.alignment = Alignment(horizontal="center")
+                cell.border = border
+            for col_idx in range(14, 33):
+                cell = sheet.cell(row=row_idx, column=col_idx, value=0.5)
+                cell.alignment = Alignment(horizontal="center")
+                cell.border = border
+                cell.number_format = "0.00%"
+        row_idx += 1
+        for col_idx in range(14, 23):
+            cell = sheet.cell(row=row_idx, column=col_idx, value=1.0)
+            cell.number_format = "0.00%"
+        row_idx += 2
+
+def render_named(sheet, blocks: int, rows_per_block: int) -> None:
+    row_idx = 1
+    for _ in range(blocks):
+        for col_idx in range(2, 12):
+            sheet.cell(row=row_idx, column=col_idx, value="HEADER")
+        style_range(sheet, row_idx, 2, 11, HEADER)
+        for _ in range(rows_per_block):
+            row_idx += 1
+            for col_idx in range(2, 12):
+                sheet.cell(row=row_idx, column=col_idx, value=1)
+            style_range(sheet, row_idx, 2, 11, BODY_CENTERED)
+            for col_idx in range(14, 33):
+                sheet.cell(row=row_idx, column=col_idx, value=0.5)
+            style_range(sheet, row_idx, 14, 32, PERCENT_BODY)
+        row_idx += 1
+        for col_idx in range(14, 23):
+            sheet.cell(row=row_idx, column=col_idx, value=1.0)
+        style_range(sheet, row_idx, 14, 22, PERCENT_SUMMARY)
+        row_idx += 2
+
+def run(render, blocks: int, rows_per_block: int) -> float:
+    wb = openpyxl.Workbook()
+    register_styles(wb)
+    started = time.perf_counter()
+    render(wb.active, blocks, rows_per_block)
+    return time.perf_counter() - started
+
+if __name__ == "__main__":
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    rows_per_block = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    before = run(render_per_cell, blocks, rows_per_block)
+    after = run(render_named, blocks, rows_per_block)
+    print(f"{blocks} blocks x {rows_per_block} rows")
+    print(f"per-cell styles: {before:.3f}s")
+    print(f"named styles:    {after:.3f}s ({before / after:.1f}x)")
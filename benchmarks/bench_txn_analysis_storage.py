@@ -0,0 +1,198 @@
+"""
+Before/after benchmark for the storage of the daily txn_analysis tables: the
+heaps with two nonclustered date indexes of sql/txn_analysis_ddl.sql versus
+the page-compressed clustered tables of sql/txn_analysis_ddl_compressed.sql.
+The heaps are keyed by STATUS_ID like the compressed tables, so only the
+storage differs.
+
+Creates both layouts side by side in a scratch database, as the [heap] and
+[compressed] schemas, and fills them with the same synthetic daily rows. Then
+times the report generators' range queries for the last loaded date and the
+stored procedure's DELETE/INSERT of its last week on each, and prints the
+space each layout takes. Nothing is written outside the scratch database.
+
+    python benchmarks/bench_txn_analysis_storage.py SCRATCH_DATABASE [days] [statuses] [runs]
+"""
+import os
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from conn import config, get_connection
+from report_engine import daily_query, grouped_query, report_range
+from report_specs import MONTH, REPORTS
+
+LAYOUTS = (
+    ("heap", os.path.join(ROOT, "sql", "txn_analysis_ddl.sql")),
+    ("compressed", os.path.join(ROOT, "sql", "txn_analysis_ddl_compressed.sql")),
+)
+ROLLUP_SUFFIXES = ("_week", "_month")
+FIRST_DATE = date(2024, 1, 1)
+
+# Every date of the load crossed with every status; the counts are derived
+# from CHECKSUM of the row so every load of the same size is identical
+LOAD_ROWS = """
+WITH D AS (
+    SELECT TOP (?) DATEADD(DAY, ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) - 1, CAST(? AS DATE)) AS TRANSACTION_DATE
+    FROM sys.all_objects A CROSS JOIN sys.all_objects B
+), S AS (
+    SELECT TOP (?) CAST(ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS TINYINT) AS STATUS_ID
+    FROM sys.all_objects
+)
+INSERT INTO [heap].[{table}] (TRANSACTION_DATE, {key}, STATUS_ID, {columns})
+SELECT D.TRANSACTION_DATE
+, {key_expression}
+, S.STATUS_ID
+, {values}
+FROM D CROSS JOIN S
+"""
+
+# The stored procedure's write of one range, replayed from a copy of its rows
+CYCLE = """
+BEGIN TRANSACTION;
+DELETE FROM [{schema}].[{table}] WHERE TRANSACTION_DATE BETWEEN ? AND ?;
+INSERT INTO [{schema}].[{table}] SELECT * FROM #CYCLE;
+COMMIT TRANSACTION;
+"""
+
+def daily_tables(ddl: str) -> list:
+    """
+    Return (table, period key, bucket columns) of every daily table of a DDL file.
+    """
+    tables = []
+    for table, body in re.findall(r"CREATE TABLE \[dbo\]\.\[(\w+)\] \((.*?)\n\);", ddl, re.S):
+        if table.endswith(ROLLUP_SUFFIXES) or "TRANSACTION_DATE" not in body:
+            continue
+        key = "WEEK_NUM" if re.search(r"^\s*WEEK_NUM\b", body, re.M) else "[MONTH]"
+        columns = [column for column in re.findall(r"^\s*(\[[^\]]+\])", body, re.M) if column != "[MONTH]"]
+        tables.append((table, key, columns))
+    return tables
+
+def status_id_heap(ddl: str) -> str:
+    """
+    Return the legacy heap DDL with its FINAL_STATUS columns and index keys
+    turned into the STATUS_ID of the compressed layout.
+    """
+    ddl = ddl.replace("FINAL_STATUS VARCHAR(50)", "STATUS_ID    TINYINT")
+    return ddl.replace("FINAL_STATUS", "STATUS_ID")
+
+def setup(cursor, days: int, statuses: int) -> list:
+    tables = None
+    for schema, path in LAYOUTS:
+        with open(path, encoding="utf-8") as f:
+            ddl = f.read()
+        if schema == "heap":
+            ddl = status_id_heap(ddl)
+        tables = tables or daily_tables(ddl)
+        cursor.execute(f"IF SCHEMA_ID('{schema}') IS NULL EXEC('CREATE SCHEMA [{schema}]')")
+        for table in re.findall(r"CREATE TABLE \[dbo\]\.\[(\w+)\]", ddl):
+            cursor.execute(f"DROP TABLE IF EXISTS [{schema}].[{table}]")
+        cursor.execute(ddl.replace("[dbo].", f"[{schema}]."))
+
+    for table, key, columns in tables:
+        key_expression = (
+            f"DATEDIFF(WK, '{FIRST_DATE}', D.TRANSACTION_DATE) + 1" if key == "WEEK_NUM" else "MONTH(D.TRANSACTION_DATE)"
+        )
+        values = ", ".join(f"ABS(CHECKSUM(D.TRANSACTION_DATE, S.STATUS_ID, {i})) % 1000" for i in range(len(columns)))
+        cursor.execute(
+            LOAD_ROWS.format(table=table, key=key, columns=", ".join(columns), key_expression=key_expression, values=values),
+            days, FIRST_DATE.isoformat(), statuses
+        )
+        cursor.execute(f"INSERT INTO [compressed].[{table}] SELECT * FROM [heap].[{table}]")
+    return tables
+
+def report_queries(end_date: str) -> list:
+    """
+    Return the (table, query, first date, last date) of every daily table range
+    query the report sheets run for end_date, with the year starting on Jan 1.
+    """
+    year_start = end_date[:4] + "-01-01"
+    queries = []
+    for spec in REPORTS:
+        min_date, max_date = report_range(spec.grain, end_date, year_start)
+        for section in spec.sections:
+            query = grouped_query(spec, section) if spec.grain == MONTH else daily_query(spec, section)
+            queries.append((section.table, query, min_date, max_date))
+    return queries
+
+def time_queries(cursor, schema: str, queries: list, runs: int) -> float:
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        for _, query, min_date, max_date in queries:
+            cursor.execute(query.replace("[dbo].", f"[{schema}]."), min_date, max_date)
+            cursor.fetchall()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def time_cycle(cursor, schema: str, tables: list, week_start: str, week_end: str, runs: int) -> float:
+    best = None
+    for _ in range(runs):
+        elapsed = 0.0
+        for table, _, _ in tables:
+            cursor.execute("DROP TABLE IF EXISTS #CYCLE")
+            cursor.execute(
+                f"SELECT * INTO #CYCLE FROM [{schema}].[{table}] WHERE TRANSACTION_DATE BETWEEN ? AND ?",
+                week_start, week_end
+            )
+            started = time.perf_counter()
+            cursor.execute(CYCLE.format(schema=schema, table=table), week_start, week_end)
+            elapsed += time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def used_kb(cursor, schema: str, tables: list) -> int:
+    total = 0
+    for table, _, _ in tables:
+        cursor.execute(
+            "SELECT SUM(used_page_count) * 8 FROM sys.dm_db_partition_stats WHERE object_id = OBJECT_ID(?)",
+            f"[{schema}].[{table}]"
+        )
+        total += cursor.fetchone()[0] or 0
+    return total
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    database = sys.argv[1]
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 730
+    statuses = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    runs = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+    end_date = FIRST_DATE + timedelta(days=days - 1)
+    week_start = (end_date - timedelta(days=6)).isoformat()
+
+    if database.upper() in (config["database"]["DATABASE"].upper(), "BTIPAYMENTDB"):
+        print(f"Refusing to load synthetic data into {database}; use a scratch database.")
+        sys.exit(1)
+
+    conn = get_connection()
+    conn.autocommit = True
+    cursor = conn.cursor()
+    cursor.execute(f"USE [{database}]")
+    tables = setup(cursor, days, statuses)
+    queries = report_queries(end_date.isoformat())
+
+    results = {}
+    for schema, _ in LAYOUTS:
+        results[schema] = (
+            time_queries(cursor, schema, queries, runs),
+            time_cycle(cursor, schema, tables, week_start, end_date.isoformat(), runs),
+            used_kb(cursor, schema, tables),
+        )
+    conn.close()
+
+    print(f"{days} days x {statuses} statuses per table, {len(queries)} report queries for {end_date}, best of {runs} runs")
+    (before_label, before), (after_label, after) = ((schema, results[schema]) for schema, _ in LAYOUTS)
+    for label, (queries_s, cycle_s, kb) in ((before_label, before), (after_label, after)):
+        print(f"{label:>10}: report queries {queries_s:.3f}s, week DELETE/INSERT {cycle_s:.3f}s, {kb} KB used")
+    print(
+        f"{after_label} vs {before_label}: queries {before[0] / after[0]:.1f}x, "
+        f"DELETE/INSERT {before[1] / after[1]:.1f}x, {after[2] / before[2]:.0%} of the space"
+    )
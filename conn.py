@@ -1,6 +1,11 @@
 import pyodbc
 import configparser
 import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
 
 # Load configuration
 config = configparser.ConfigParser()
@@ -23,6 +28,389 @@ def get_connection() -> pyodbc.Connection:
     )
     return pyodbc.connect(conn_str)
 
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of connections created by get_connection().
+    Idle connections older than max_idle seconds are replaced on checkout,
+    and connections idle longer than ping_after seconds are health checked
+    with SELECT 1 before being handed out.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4,
+        max_idle: float = 300,
+        checkout_timeout: float = 30,
+        ping_after: float = 30
+    ) -> None:
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.checkout_timeout = checkout_timeout
+        self.ping_after = ping_after
+
+        self._cond = threading.Condition()
+        self._idle = []     # (connection, last_used) pairs, most recent last
+        self._size = 0      # open connections, idle and checked out
+        self._closed = False
+        self._stats = {"checkouts": 0, "waits": 0, "reconnects": 0, "opened": 0}
+
+    @contextmanager
+    def connection(self) -> Iterator[pyodbc.Connection]:
+        """
+        Check a connection out of the pool for the duration of the with block.
+        The connection is rolled back and discarded if the block raises and the
+        connection can no longer be used.
+        """
+        conn = self._checkout()
+        try:
+            yield conn
+        except Exception:
+            self._checkin(conn, healthy=self._rollback(conn))
+            raise
+        else:
+            self._checkin(conn, healthy=True)
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the pool counters.
+        """
+        with self._cond:
+            return dict(self._stats, size=self._size, idle=len(self._idle))
+
+    def close(self) -> None:
+        """
+        Close every idle connection and refuse further checkouts.
+        Connections still checked out are closed when they are returned.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def _checkout(self) -> pyodbc.Connection:
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, last_used = None, None
+                    break
+
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    raise TimeoutError(f"No pooled connection available after {self.checkout_timeout}s")
+
+            self._stats["checkouts"] += 1
+
+        try:
+            if conn is None:
+                return self._open()
+
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.max_idle or (idle_for > self.ping_after and not self._ping(conn)):
+                self._close_quietly(conn)
+                with self._cond:
+                    self._stats["reconnects"] += 1
+                return self._open()
+            return conn
+        except Exception:
+            # The slot reserved above was never filled
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, conn: pyodbc.Connection, healthy: bool) -> None:
+        with self._cond:
+            if healthy and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if conn is not None:
+            self._close_quietly(conn)
+
+    def _open(self) -> pyodbc.Connection:
+        conn = get_connection()
+        with self._cond:
+            self._stats["opened"] += 1
+        return conn
+
+    @staticmethod
+    def _ping(conn: pyodbc.Connection) -> bool:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _rollback(conn: pyodbc.Connection) -> bool:
+        try:
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: pyodbc.Connection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+_pool_limit: Optional[int] = None
+
+def get_pool() -> ConnectionPool:
+    """
+    Return the connection pool shared by the whole run, creating it on first use.
+    Reads limits from the optional [pool] section of config.ini.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            max_size = config.getint("pool", "max_size", fallback=4)
+            _pool = ConnectionPool(
+                max_size=min(max_size, _pool_limit) if _pool_limit else max_size,
+                max_idle=config.getfloat("pool", "max_idle", fallback=300),
+                checkout_timeout=config.getfloat("pool", "checkout_timeout", fallback=30),
+                ping_after=config.getfloat("pool", "ping_after", fallback=30),
+            )
+        return _pool
+
+def limit_pool(max_size: int) -> None:
+    """
+    Cap the connections the shared pool of this process may open below [pool]
+    max_size, e.g. in each worker process of a backfill. Applies to the pool
+    created next, so call it before the first query or after close_pool().
+    """
+    global _pool_limit
+    with _pool_lock:
+        _pool_limit = max(1, max_size)
+
+def pooled_connection():
+    """
+    Context manager that checks a connection out of the shared pool.
+    """
+    return get_pool().connection()
+
+def close_pool() -> dict:
+    """
+    Close the shared pool and return its final statistics.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return {}
+    pool.close()
+    return pool.stats()
+
+class QueryCache:
+    """
+    Thread-safe memo of read-only query results for the run, keyed on the SQL
+    text with its whitespace normalized plus the parameters. Holds at most
+    max_entries results, evicting the least recently used, and drops results
+    older than ttl seconds. Threads asking for a query that is already running
+    wait for its result instead of running it again. A max_entries of 0
+    disables it. Results of queries still running when the cache is cleared
+    are not stored.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 900) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()    # key -> (stored_at, columns, rows)
+        self._running: dict = {}                      # key -> Event set once the query finished
+        self._generation = 0                          # bumped by clear()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def fetch_all(self, query: str, *params) -> Tuple[List[str], List[tuple]]:
+        """
+        Return the column names and rows of a query, running it on a pooled
+        connection only when no live result is memoized.
+        """
+        key = (" ".join(query.split()), params)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                    del self._entries[key]
+                    self._stats["expirations"] += 1
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[1], list(entry[2])
+
+                # Another thread is running the same query; wait for its result
+                running = self._running.get(key)
+                if running is None:
+                    generation = self._generation
+                    self._stats["misses"] += 1
+                    if self.max_entries > 0:
+                        self._running[key] = threading.Event()
+                    break
+            running.wait()
+
+        try:
+            with pooled_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, *params)
+                columns = [col[0] for col in cursor.description]
+                rows = [tuple(row) for row in cursor.fetchall()]
+                cursor.close()
+
+            if self.max_entries > 0:
+                with self._lock:
+                    # Cleared while running: the result may predate the refresh,
+                    # so waiters run the query again instead
+                    if generation != self._generation:
+                        return columns, list(rows)
+                    self._entries[key] = (time.monotonic(), columns, rows)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self._stats["evictions"] += 1
+            return columns, list(rows)
+        finally:
+            with self._lock:
+                running = self._running.pop(key, None)
+            if running is not None:
+                running.set()
+
+    def clear(self) -> None:
+        """
+        Drop every memoized result, e.g. after the reporting tables were rebuilt.
+        Queries running meanwhile return their result to their caller only.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the cache counters.
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+_query_cache: Optional[QueryCache] = None
+_query_cache_lock = threading.Lock()
+
+def get_query_cache() -> QueryCache:
+    """
+    Return the query cache shared by the whole run, creating it on first use.
+    Reads limits from the optional [query_cache] section of config.ini.
+    """
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = QueryCache(
+                max_entries=config.getint("query_cache", "max_entries", fallback=128),
+                ttl=config.getfloat("query_cache", "ttl", fallback=900),
+            )
+        return _query_cache
+
+def fetch_all(query: str, *params) -> Tuple[List[str], List[tuple]]:
+    """
+    Run a read-only query through the shared query cache.
+    Returns the column names and the rows as tuples.
+    """
+    return get_query_cache().fetch_all(query, *params)
+
+def get_write_only() -> bool:
+    """
+    Return whether workbooks are streamed with openpyxl's write_only mode.
+    Reads the optional [output] section of config.ini.
+    """
+    return config.getboolean("output", "write_only", fallback=False)
+
+def get_sheet_workers() -> int:
+    """
+    Return how many report sheets are generated concurrently.
+    Reads the optional [output] section of config.ini; 1 keeps the sequential run.
+    """
+    return max(1, config.getint("output", "workers", fallback=1))
+
+def get_procedure_chunk() -> str:
+    """
+    Return the size of the date chunks a stored procedure run is split into, "day" or "week".
+    Reads the optional [procedure] section of config.ini.
+    """
+    return config.get("procedure", "chunk", fallback="week")
+
+def get_procedure_workers() -> int:
+    """
+    Return how many stored procedure chunks run concurrently.
+    Reads the optional [procedure] section of config.ini; 1 runs them in order.
+    """
+    return max(1, config.getint("procedure", "workers", fallback=1))
+
+def get_procedure_retries() -> int:
+    """
+    Return how many more times a failed stored procedure chunk is run.
+    Reads the optional [procedure] section of config.ini.
+    """
+    return max(0, config.getint("procedure", "retries", fallback=1))
+
+def get_procedure_staging() -> str:
+    """
+    Return where the stored procedure stages a run's transactions, "temp" for #temp
+    tables or "memory" for memory-optimized table variables.
+    Reads the optional [procedure] section of config.ini.
+    """
+    return config.get("procedure", "staging", fallback="temp")
+
+def get_backfill_processes() -> int:
+    """
+    Return how many month workbooks a backfill builds concurrently, one process each.
+    Reads the optional [backfill] section of config.ini.
+    """
+    return max(1, config.getint("backfill", "processes", fallback=2))
+
+def get_backfill_connections() -> int:
+    """
+    Return how many database connections a backfill may hold at once across its processes.
+    Reads the optional [backfill] section of config.ini.
+    """
+    return max(1, config.getint("backfill", "connections", fallback=4))
+
+def get_incremental() -> bool:
+    """
+    Return whether a run reuses the blocks of the month's latest workbook.
+    Reads the optional [output] section of config.ini.
+    """
+    return config.getboolean("output", "incremental", fallback=False)
+
+def get_cache_path() -> Optional[str]:
+    """
+    Return the path of the closed-period cache file, or None to disable it.
+    Reads the optional [cache] section of config.ini.
+    """
+    return config.get("cache", "path", fallback=None) or None
+
 def get_base_folder() -> str:
     """
     Return the base folder path from config.ini.
@@ -0,0 +1,281 @@
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from conn import fetch_all
+from period_cache import CacheSlot, closed_through, get_period_cache, open_from
+from report_specs import MONTH
+
+class DailyRows:
+    """
+    Rows of one txn_analysis table over a date range, grouped by TRANSACTION_DATE.
+    The first column of every fetched row must be TRANSACTION_DATE; it is used as
+    the grouping key and dropped from the stored rows. The stored rows start with
+    the period key and FINAL_STATUS.
+    """
+
+    def __init__(self, columns: Sequence[str], rows: Sequence[Sequence]) -> None:
+        self.columns = list(columns)
+        self._by_date: Dict[str, List[Tuple]] = defaultdict(list)
+        self._statuses: Dict[str, int] = {}
+        for row in rows:
+            self._by_date[str(row[0])].append(tuple(row[1:]))
+            self._statuses.setdefault(row[2], len(self._statuses))
+
+    def for_date(self, date: str) -> List[Tuple]:
+        """
+        Return the rows for one 'YYYY-MM-DD' date, in query order.
+        """
+        return self._by_date.get(date, [])
+
+    def dates(self) -> List[str]:
+        """
+        Return every date that has at least one row, ascending.
+        """
+        return sorted(self._by_date)
+
+    def grouped_rows(self, since: Optional[str] = None) -> List[Tuple]:
+        """
+        Sum the rows per period key and FINAL_STATUS, in the shape of a grouped
+        query: key, FINAL_STATUS, first and last date, then the summed columns.
+        Statuses are ordered as first fetched, so a query ordered by FINAL_STATUS
+        first gives the order GROUP BY ... ORDER BY key, FINAL_STATUS would.
+        Dates before since are left out.
+        """
+        groups: Dict[Tuple, list] = {}
+        for date in self.dates():
+            if since and date < since:
+                continue
+            for key, status, *values in self._by_date[date]:
+                group = groups.get((key, status))
+                if group is None:
+                    groups[(key, status)] = [key, status, date, date, *values]
+                    continue
+                group[3] = date
+                group[4:] = [_add(total, value) for total, value in zip(group[4:], values)]
+
+        order = sorted(groups, key=lambda group: (group[0], self._statuses[group[1]]))
+        return [tuple(groups[group]) for group in order]
+
+def fetch_daily_rows(query: str, min_date: str, max_date: str) -> DailyRows:
+    """
+    Run a range query once for min_date..max_date and group its rows by date.
+    The query takes the two dates as its only parameters and returns STATUS_ID
+    as the third column, ordered by it first; it is replaced by its label.
+    """
+    columns, rows = fetch_all(query, min_date, max_date)
+    return DailyRows(columns[1:], status_labels().apply(rows, 2, keyed=False))
+
+class StatusLabels:
+    """
+    FINAL_STATUS label of every STATUS_ID of txn_analysis_status. The fact and
+    rollup tables only hold the id, so queries order by it; rank() gives the
+    position of a label in the server's ORDER BY FINAL_STATUS, which the sheets
+    keep.
+    """
+
+    def __init__(self, rows: Sequence[Sequence]) -> None:
+        self._labels: Dict[int, str] = {}
+        self._ranks: Dict[int, int] = {}
+        for status_id, label in rows:
+            self._labels[status_id] = label
+            self._ranks[status_id] = len(self._ranks)
+
+    def label(self, status_id: int) -> str:
+        """
+        Return the FINAL_STATUS of an id.
+        """
+        return self._labels[status_id]
+
+    def rank(self, status_id: int) -> int:
+        """
+        Return the position of an id's FINAL_STATUS in label order.
+        """
+        return self._ranks[status_id]
+
+    def apply(self, rows: Sequence[Sequence], at: int, keyed: bool = True) -> List[Tuple]:
+        """
+        Replace the STATUS_ID at column at of every row by its label and restore
+        label order. Keyed rows were ordered by their first column, then the id;
+        the others by the id first.
+        """
+        if keyed:
+            order = lambda row: (row[0], self._ranks[row[at]])
+        else:
+            order = lambda row: self._ranks[row[at]]
+        return [
+            tuple(row[:at]) + (self._labels[row[at]],) + tuple(row[at + 1:])
+            for row in sorted(rows, key=order)
+        ]
+
+def status_labels() -> StatusLabels:
+    """
+    Return the status labels, read once per run through the query cache, which
+    is cleared whenever the stored procedure may have added statuses.
+    """
+    _, rows = fetch_all("SELECT STATUS_ID, FINAL_STATUS FROM [dbo].[txn_analysis_status] ORDER BY FINAL_STATUS")
+    return StatusLabels(rows)
+
+class PeriodRows:
+    """
+    Rows of one txn_analysis table grouped by a period key (WEEK_NUM or MONTH).
+    Every fetched row must start with the key, FINAL_STATUS and the first and
+    last TRANSACTION_DATE of its group; the dates are folded into the period
+    bounds and dropped from the stored rows.
+    """
+
+    def __init__(self, rows: Sequence[Sequence]) -> None:
+        self._by_key: Dict[int, List[Tuple]] = defaultdict(list)
+        self._bounds: Dict[int, Tuple] = {}
+        for row in rows:
+            key, first, last = row[0], row[2], row[3]
+            self._by_key[key].append((row[0], row[1]) + tuple(row[4:]))
+            if key in self._bounds:
+                lo, hi = self._bounds[key]
+                first, last = min(lo, first), max(hi, last)
+            self._bounds[key] = (first, last)
+
+    def for_key(self, key: int) -> List[Tuple]:
+        """
+        Return the rows of one period, in query order.
+        """
+        return self._by_key.get(key, [])
+
+    def bounds(self, key: int) -> Tuple:
+        """
+        Return (first date, last date) of a period, or (None, None) if it has no rows.
+        """
+        return self._bounds.get(key, (None, None))
+
+    def keys(self) -> range:
+        """
+        Return every key from the first to the last period with rows.
+        """
+        if not self._bounds:
+            return range(0)
+        return range(min(self._bounds), max(self._bounds) + 1)
+
+def fetch_grouped_rows(query: str, min_date: str, max_date: str, slot: Optional[CacheSlot] = None) -> List[Tuple]:
+    """
+    Run a grouped range query once for min_date..max_date. Every row starts with
+    the period key, FINAL_STATUS and the first and last date of its group, as
+    PeriodRows takes them. The query takes the two dates as its only parameters.
+    With a cache slot, the periods closed by an earlier run are read from the
+    period cache instead. The query returns STATUS_ID, which is replaced by its
+    label before the rows are cached.
+    """
+    def fetch(first: str, last: str) -> List[Tuple]:
+        return status_labels().apply(_fetch_range(query, first, last), 1)
+
+    return _cached_rows(query, min_date, max_date, slot, (2, 3), fetch)
+
+def fetch_paired_rows(query: str, min_date: str, max_date: str, slot: Optional[CacheSlot] = None) -> List[Tuple]:
+    """
+    Run a joined count and volume query once for min_date..max_date. The query
+    takes the two dates once per table and returns STATUS_ID second, which is
+    replaced by its label.
+    """
+    def fetch(first: str, last: str) -> List[Tuple]:
+        _, rows = fetch_all(query, first, last, first, last)
+        return status_labels().apply(rows, 1)
+
+    return _cached_rows(query, min_date, max_date, slot, (2, 3), fetch)
+
+def split_paired_rows(rows: Sequence[Sequence], width: int) -> Tuple[PeriodRows, PeriodRows]:
+    """
+    Split joined count and volume rows into the PeriodRows of each table. Every
+    joined row holds the key, FINAL_STATUS, the first and last date, then per
+    table its matched row count, the width bucket sums and the total; a side
+    without matched rows is left out of its table's rows.
+    """
+    sides: Tuple[List[Tuple], List[Tuple]] = ([], [])
+    for row in rows:
+        head, body = tuple(row[:4]), row[4:]
+        for side, offset in zip(sides, (0, width + 2)):
+            if body[offset]:
+                side.append(head + tuple(body[offset + 1:offset + width + 2]))
+    return PeriodRows(sides[0]), PeriodRows(sides[1])
+
+class MonthCalendar:
+    """
+    [MONTH] numbers of a reporting range with the first and last TRANSACTION_DATE
+    of each. Every monthly table is grouped from the same staged transactions, so
+    the bounds read from txn_analysis_transaction_amount hold for all of them.
+    """
+
+    def __init__(self, bounds: Dict[int, Tuple]) -> None:
+        self._bounds = dict(bounds)
+        self.min_month: Optional[int] = min(self._bounds, default=None)
+        self.max_month: Optional[int] = max(self._bounds, default=None)
+
+    def months(self) -> range:
+        """
+        Return every month number from the first to the last month with data.
+        """
+        if self.min_month is None:
+            return range(0)
+        return range(self.min_month, self.max_month + 1)
+
+    def bounds(self, month: int) -> Tuple:
+        """
+        Return (first date, last date) of a month, or (None, None) if it has no rows.
+        """
+        return self._bounds.get(month, (None, None))
+
+def month_calendar(min_date: str, end_date: str) -> MonthCalendar:
+    """
+    Return the month calendar for min_date..end_date. Months closed by end_date
+    are read from the month rollup and kept in the period cache; the open month
+    after them is bounded from the daily rows. Sheets of the same run share both
+    queries through the query cache.
+    """
+    table = "txn_analysis_transaction_amount"
+    closed, tail_from = closed_through(MONTH, end_date), max(min_date, open_from(MONTH, end_date))
+    bounds = {}
+    if min_date <= closed:
+        slot = CacheSlot(f"{table}:calendar:{min_date}", MONTH, closed)
+        bounds.update(_fetch_bounds(f"{table}_month", "MONTH_START", "FIRST_DATE", "LAST_DATE", min_date, closed, slot))
+    if tail_from <= end_date:
+        bounds.update(_fetch_bounds(table, "TRANSACTION_DATE", "TRANSACTION_DATE", "TRANSACTION_DATE", tail_from, end_date))
+    return MonthCalendar(bounds)
+
+def _fetch_bounds(
+    table: str,
+    date_column: str,
+    first_column: str,
+    last_column: str,
+    min_date: str,
+    max_date: str,
+    slot: Optional[CacheSlot] = None
+) -> Dict[int, Tuple]:
+    query = f"""
+            SELECT [MONTH], MIN({first_column}), MAX({last_column})
+            FROM [dbo].[{table}]
+            WHERE {date_column} BETWEEN ? AND ?
+            GROUP BY [MONTH]
+            ORDER BY [MONTH]
+        """
+    rows = _cached_rows(query, min_date, max_date, slot, (1, 2))
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+def _cached_rows(
+    query: str,
+    min_date: str,
+    max_date: str,
+    slot: Optional[CacheSlot],
+    bounds_at: Tuple[int, int],
+    fetch: Optional[Callable[[str, str], List[Tuple]]] = None
+) -> List[Tuple]:
+    fetch = fetch or (lambda first, last: _fetch_range(query, first, last))
+    cache = get_period_cache() if slot else None
+    if cache is None:
+        return fetch(min_date, max_date)
+    return cache.fetch(slot, query, fetch, min_date, max_date, bounds_at)
+
+def _fetch_range(query: str, min_date: str, max_date: str) -> List[Tuple]:
+    _, rows = fetch_all(query, min_date, max_date)
+    return rows
+
+def _add(total, value):
+    # SUM semantics: NULLs are skipped, all-NULL stays NULL
+    if value is None:
+        return total
+    return value if total is None else total + value
@@ -0,0 +1,115 @@
+import os
+from glob import glob
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import openpyxl
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from report_engine import PERIOD_KEYS, Period, PriorSection, report_range
+from report_specs import DAY, ReportSpec
+
+# Custom document properties recording what a workbook was generated for
+REPORT_END_DATE = "report_end_date"
+REPORT_YEAR_START = "report_year_start"
+
+class PriorReportError(Exception):
+    """
+    The previous workbook of the month cannot be reused and the run has to
+    rebuild every sheet.
+    """
+
+def find_latest_workbook(month_folder: str) -> Optional[str]:
+    """
+    Return the most recent report workbook of a month folder, if any.
+    Timestamped names sort in generation order.
+    """
+    files = sorted(glob(os.path.join(month_folder, "*_txn_analysis_*.xlsx")))
+    return files[-1] if files else None
+
+def load_prior_report(
+    path: str,
+    specs: Sequence[ReportSpec],
+    end_date: str,
+    year_start: str,
+    start_date: Optional[str]
+) -> Dict[str, List[PriorSection]]:
+    """
+    Read back the blocks of a previous workbook of the same month, per sheet
+    and section. start_date is the first date the run rewrote in the reporting
+    tables, None when it rewrote nothing. Raises PriorReportError when the
+    workbook was generated for another range, holds a rewritten date, or its
+    sheets do not have the layout the specs render.
+    """
+    try:
+        wb = openpyxl.load_workbook(path, read_only=True)
+    except Exception as e:
+        raise PriorReportError(f"cannot open {path}: {e}")
+
+    try:
+        props = {prop.name: prop.value for prop in wb.custom_doc_props}
+        prior_end = props.get(REPORT_END_DATE)
+        if prior_end is None:
+            raise PriorReportError(f"{path} does not record its report range")
+        if props.get(REPORT_YEAR_START) != year_start:
+            raise PriorReportError(f"{path} was generated with year start {props.get(REPORT_YEAR_START)}")
+        if prior_end[:7] != end_date[:7] or prior_end >= end_date:
+            raise PriorReportError(f"{path} covers up to {prior_end}, nothing to add for {end_date}")
+        if start_date is not None and start_date <= prior_end:
+            raise PriorReportError(f"{path} covers up to {prior_end}, but the tables were rewritten from {start_date}")
+
+        prior = {}
+        for spec in specs:
+            if spec.sheet_name not in wb.sheetnames:
+                raise PriorReportError(f"{path} has no {spec.sheet_name} sheet")
+            prior[spec.sheet_name] = _read_sections(wb[spec.sheet_name], spec, prior_end, year_start)
+        return prior
+    finally:
+        wb.close()
+
+def _read_sections(ws: ReadOnlyWorksheet, spec: ReportSpec, prior_end: str, year_start: str) -> List[PriorSection]:
+    """
+    Split a sheet into its sections and parse the count block of every period.
+    Only columns of the first block are read; the share and average blocks are
+    derived.
+    """
+    width = len(spec.buckets)
+    header = [PERIOD_KEYS[spec.grain], "FINAL_STATUS", *spec.buckets]
+    titles = [section.title for section in spec.sections]
+
+    sections: List[List[Tuple[Any, str, Period]]] = [[]]
+    label, rows = None, None
+    for values in ws.iter_rows(min_row=2, max_col=width + 4, values_only=True):
+        values = tuple(values) + (None,) * (width + 4 - len(values))
+
+        if spec.average_title and values[1] == spec.average_title:
+            break
+        if len(sections) < len(titles) and values[1] == titles[len(sections)]:
+            if label is not None:
+                raise PriorReportError(f"{ws.title}: unterminated block {label}")
+            sections.append([])
+        elif list(values[1:width + 3]) == header:
+            label, rows = str(values[0]), []
+        elif label is not None and (values[1] or values[2]):
+            rows.append(tuple(values[1:width + 4]))
+        elif label is not None:
+            # The summary row closes the block and must add up to its rows
+            totals = [sum(row[2 + i] or 0 for row in rows) for i in range(width)]
+            if rows and list(values[3:width + 3]) != totals:
+                raise PriorReportError(f"{ws.title}: totals of block {label} do not match its rows")
+            if spec.grain == DAY:
+                sections[-1].append((label, label, Period(f"date {label}", label, rows)))
+            elif rows:
+                key = rows[0][0]
+                sections[-1].append((key, label.split(" - ")[-1], Period(f"{spec.grain} {key}", label, rows)))
+            label = None
+
+    if len(sections) != len(titles):
+        raise PriorReportError(f"{ws.title}: expected {len(titles)} sections, found {len(sections)}")
+
+    if spec.grain == DAY:
+        # Daily sheets must hold one block per date of the month so far
+        min_date, _ = report_range(DAY, prior_end, year_start)
+        expected = [f"{min_date[:8]}{day:02d}" for day in range(1, int(prior_end[8:]) + 1)]
+        for periods in sections:
+            if [key for key, _, _ in periods] != expected:
+                raise PriorReportError(f"{ws.title}: daily blocks do not run from {min_date} to {prior_end}")
+
+    return [PriorSection(prior_end, periods) for periods in sections]
@@ -0,0 +1,55 @@
+from typing import Iterable, Optional, Union
+from openpyxl.cell.cell import Cell
+from openpyxl.worksheet.worksheet import Worksheet
+from report_writer import StreamingSheet
+
+class RowCursor:
+    """
+    Tracks the row layout of a report sheet so the renderers never read
+    Worksheet.max_row, which openpyxl recomputes by scanning every stored cell.
+
+    row:       last row written or skipped; the next append goes below it
+    last_used: last row that holds cells
+    block_top: header row of the block being rendered, shared by its side blocks
+    """
+
+    def __init__(self, sheet: Union[Worksheet, StreamingSheet], row: int = 0) -> None:
+        self.sheet = sheet
+        self.row = row
+        self.last_used = row
+        self.block_top: Optional[int] = None
+
+    def append(self, values: Iterable, start_col: int = 1) -> int:
+        """
+        Write values on the next row from start_col onwards, like Worksheet.append,
+        and return the index of that row.
+        """
+        self.row += 1
+        for col_idx, value in enumerate(values, start=start_col):
+            self.sheet.cell(row=self.row, column=col_idx, value=value)
+            self.last_used = self.row
+        return self.row
+
+    def start_block(self, header: Iterable) -> int:
+        """
+        Append the header row of a new block and anchor the side blocks to it.
+        Rows above a new block are final, so a streaming sheet writes them out here.
+        """
+        if isinstance(self.sheet, StreamingSheet):
+            self.sheet.flush(self.row)
+        self.block_top = self.append(header)
+        return self.block_top
+
+    def skip(self, count: int = 1) -> None:
+        """
+        Leave count empty rows before the next append.
+        """
+        self.row += count
+
+    def title(self, value: str, column: int = 2, gap: int = 2) -> Cell:
+        """
+        Write a section title gap rows below the last used row and continue from there.
+        """
+        self.row = self.last_used + gap
+        self.last_used = self.row
+        return self.sheet.cell(row=self.row, column=column, value=value)
@@ -1,20 +1,17 @@
 import sys
-import openpyxl
 import os
 from datetime import datetime, timedelta
-from conn import get_connection, get_base_folder
-from proc_time_of_day_daily import generate_proc_time_of_day_daily
-from proc_time_of_day_weekly import generate_proc_time_of_day_weekly
-from proc_sla_daily import generate_sla_daily
-from proc_sla_weekly import generate_sla_weekly
-from proc_sla_with_cbi_daily import generate_sla_with_cbi_daily
-from proc_sla_with_cbi_weekly import generate_sla_with_cbi_weekly
-from proc_sla_wo_cbi_daily import generate_sla_wo_cbi_daily
-from proc_sla_wo_cbi_weekly import generate_sla_wo_cbi_weekly
-from proc_transaction_amount_monthly import generate_transaction_amount_monthly
-from proc_pay_cash_amt_monthly import generate_pay_cash_amount_monthly
-from proc_total_denom_cbi_monthly import generate_total_denom_cbi_monthly
-from proc_total_per_cash_bill_monthly import generate_total_per_cash_bill_monthly
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from conn import (
+    close_pool, get_query_cache, get_base_folder, get_write_only, get_sheet_workers, get_incremental
+)
+from incremental import REPORT_END_DATE, REPORT_YEAR_START, PriorReportError, find_latest_workbook, load_prior_report
+from period_cache import get_period_cache
+from report_writer import ReportWorkbook
+from report_engine import generate_report
+from report_specs import REPORTS
+from sp_runner import failed_chunks, run_procedure
 
 
 from init_log import init_logger
@@ -32,73 +29,144 @@ def main(start_date: str, end_date: str, year_start: str, year: str) -> None:
         print("Invalid date format. Use YYYY-MM-DD.")
         return
     
-    # Run the stored procedure for generating the data
     try:
-        # Create DB connection
-        conn = get_connection()
-        cursor = conn.cursor()
+        generate_workbook(start_dt, end_dt, end_date, year_start, year)
+    finally:
+        # Release pooled connections and report how hard the pool was used
+        stats = close_pool()
+        if stats:
+            logger.info(
+                f"Connection pool stats: checkouts={stats['checkouts']}, waits={stats['waits']}, "
+                f"reconnects={stats['reconnects']}, opened={stats['opened']}"
+            )
+        stats = get_query_cache().stats()
+        logger.info(
+            f"Query cache stats: hits={stats['hits']}, misses={stats['misses']}, "
+            f"evictions={stats['evictions']}, expirations={stats['expirations']}"
+        )
+
+def generate_workbook(start_dt: datetime, end_dt: datetime, end_date: str, year_start: str, year: str) -> None:
+    """Run the stored procedure and write every report sheet to a new workbook."""
+    if not refresh_tables(start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"), year_start):
+        return
+    build_workbook(end_dt, end_date, year_start, year, get_incremental(), start_dt.strftime("%Y-%m-%d"))
 
-        # Run stored procedure
+def refresh_tables(start_date: str, end_date: str, year_start: str) -> bool:
+    """Rebuild the reporting tables for a date range and drop the caches it made stale."""
+    # Run the stored procedure for generating the data, chunked per [procedure]
+    try:
         logger.info("Running stored procedure...")
-
-        cursor.execute("EXEC [dbo].[sp_txn_analysis] @START_DT = ?, @END_DT = ?, @YEAR_START = ?", start_dt, end_dt, year_start)
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        logger.info("Stored procedure executed successfully.")
+        results = run_procedure(start_date, end_date, year_start, logger)
     except Exception as e:
         logger.error(f"Error running stored procedure: {e}")
-        return
-    
-    #create a excel workbook
-    wb = openpyxl.Workbook()
-
-    # Remove the default sheet
-    default_sheet = wb.active
-    wb.remove(default_sheet)
-
-    # sheets and corresponding generator functions
-    sheets = [
-        ("TIMEOFDAY_TXNCOUNT_DAILY", generate_proc_time_of_day_daily, "daily"),
-        ("TIMEOFDAY_TXNCOUNT_WEEKLY", generate_proc_time_of_day_weekly, "weekly"),
-        ("SLA_DAILY", generate_sla_daily, "daily"),
-        ("SLA_WEEKLY", generate_sla_weekly, "weekly"),
-        ("SLA_WITH_CBI_DAILY", generate_sla_with_cbi_daily, "daily"),
-        ("SLA_WITH_CBI_WEEKLY", generate_sla_with_cbi_weekly, "weekly"),
-        ("SLA_WO_CBI_DAILY", generate_sla_wo_cbi_daily, "daily"),
-        ("SLA_WO_CBI_WEEKLY", generate_sla_wo_cbi_weekly, "weekly"),
-        ("TRANSACTION_AMOUNT", generate_transaction_amount_monthly, "monthly"),
-        ("PAY_CASH_AMOUNT - TXN MASTER", generate_pay_cash_amount_monthly, "monthly"),
-        ("TOTAL_DENOMINATION - CBI", generate_total_denom_cbi_monthly, "monthly"),
-        ("TOTAL_PER_CASH_BILL - CBI", generate_total_per_cash_bill_monthly, "monthly"),
-    ]
+        return False
 
-    # Generate each sheet
-    for sheet_name, func, categ in sheets:
-        sheet = wb.create_sheet(title=sheet_name)
-        if categ in ("daily", "weekly"):
-            status = func(sheet, end_date, logger)
-        else:
-            status = func(sheet, end_date, logger, year_start)
-        if status is False:
-            logger.error(f"Error generating {sheet_name} sheet. Excel file will not be saved.")
-            return
-            
+    # The reporting tables were just rebuilt, at least for the chunks that committed
+    get_query_cache().clear()
+
+    # Cached periods holding a date the stored procedure rewrote are stale now
+    try:
+        cache = get_period_cache()
+        if cache is not None:
+            dropped = cache.invalidate(start_date)
+            logger.info(f"Period cache: dropped {dropped} periods from {start_date} on.")
+    except Exception as e:
+        logger.error(f"Error invalidating the period cache: {e}")
+        return False
+
+    failed = failed_chunks(results)
+    if failed:
+        ranges = ", ".join(f"{chunk.start} to {chunk.end}" for chunk in failed)
+        logger.error(f"Error running stored procedure for {ranges}; rerun them with sp_runner.py.")
+        return False
+    logger.info("Stored procedure executed successfully.")
+    return True
+
+def build_workbook(
+    end_dt: datetime, end_date: str, year_start: str, year, incremental: bool, start_date: Optional[str] = None
+) -> Optional[str]:
+    """Write every report sheet for end_date to a new workbook; returns its path, or None on failure."""
     #base folder
     base_folder = get_base_folder()
     month_name = end_dt.strftime("%B") 
     year_folder = os.path.join(base_folder, str(year))
     month_folder = os.path.join(year_folder, month_name)
-    
+
+    # Reuse the unchanged blocks of the month's latest workbook, unless start_date rewrote them
+    prior = load_prior(month_folder, end_date, year_start, start_date) if incremental else None
+
+    #create a excel workbook, streamed to disk block by block when write_only is set
+    wb = ReportWorkbook(write_only=get_write_only())
+
+    # Generate each sheet
+    if not generate_sheets(wb, REPORTS, end_date, year_start, get_sheet_workers(), prior):
+        return None
+
     if not os.path.exists(month_folder):
         os.makedirs(month_folder)
 
-    # Save the workbook
+    # Save the workbook, recording its range for the next incremental run
+    wb.set_property(REPORT_END_DATE, end_date)
+    wb.set_property(REPORT_YEAR_START, year_start)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = os.path.join(month_folder, f"{month_name}_txn_analysis_{timestamp}.xlsx")
     wb.save(output_file)
     logger.info(f"Excel file saved as {output_file}")
+    return output_file
+
+def year_start_for(date_dt: datetime) -> str:
+    """First date the week and month numbers of date_dt's year are counted from."""
+    return '2025-06-01' if date_dt.year == 2025 else f"{date_dt.year}-01-01"
+
+def load_prior(month_folder: str, end_date: str, year_start: str, start_date: Optional[str]) -> Optional[dict]:
+    """Read the blocks of the month's latest workbook; None means a full rebuild."""
+    path = find_latest_workbook(month_folder)
+    if path is None:
+        logger.info(f"No previous workbook in {month_folder}, rebuilding every sheet.")
+        return None
+
+    try:
+        prior = load_prior_report(path, REPORTS, end_date, year_start, start_date)
+    except PriorReportError as e:
+        logger.warning(f"Previous workbook not reusable ({e}), rebuilding every sheet.")
+        return None
+
+    logger.info(f"Updating blocks from {path}")
+    return prior
+
+def generate_sheets(
+    wb: ReportWorkbook,
+    specs: tuple,
+    end_date: str,
+    year_start: str,
+    workers: int,
+    prior: Optional[dict] = None
+) -> bool:
+    """Render every sheet in order; False as soon as one fails, so nothing is saved."""
+    prior = prior or {}
+    if workers <= 1:
+        for spec in specs:
+            sheet = wb.create_sheet(title=spec.sheet_name)
+            if generate_report(spec, sheet, end_date, logger, year_start, prior.get(spec.sheet_name)) is False:
+                logger.error(f"Error generating {spec.sheet_name} sheet. Excel file will not be saved.")
+                return False
+        return True
+
+    # Sheets are fetched and rendered concurrently into buffers, then written in sheet order
+    logger.info(f"Generating sheets with {workers} workers...")
+    buffers = [wb.create_sheet(title=spec.sheet_name, buffered=True) for spec in specs]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(generate_report, spec, sheet, end_date, logger, year_start, prior.get(spec.sheet_name))
+            for spec, sheet in zip(specs, buffers)
+        ]
+        for spec, sheet, future in zip(specs, buffers, futures):
+            if future.result() is False:
+                logger.error(f"Error generating {spec.sheet_name} sheet. Excel file will not be saved.")
+                executor.shutdown(cancel_futures=True)
+                return False
+            sheet.replay()
+    return True
 
 if __name__ == "__main__":
     # if len(sys.argv) > 3:
@@ -116,7 +184,7 @@ if __name__ == "__main__":
 
     # Convert start_date string to datetime to extract year
     start_dt_obj = datetime.strptime(start_date, "%Y-%m-%d")
-    year_start = '2025-06-01' if start_dt_obj.year == 2025 else f"{start_dt_obj.year}-01-01"
+    year_start = year_start_for(start_dt_obj)
     
     year = start_dt_obj.year
 
@@ -0,0 +1,232 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from conn import get_cache_path
+from report_specs import WEEK, MONTH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    cache_key    TEXT PRIMARY KEY,
+    grain        TEXT NOT NULL,
+    covered_from TEXT NOT NULL,
+    watermark    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS periods (
+    cache_key  TEXT NOT NULL,
+    period_key TEXT NOT NULL,
+    first_date TEXT NOT NULL,
+    last_date  TEXT NOT NULL,
+    rows       BLOB NOT NULL,
+    PRIMARY KEY (cache_key, period_key)
+);
+"""
+
+class CacheSlot(NamedTuple):
+    """
+    Where the closed periods of one grouped query are cached.
+
+    name:           source of the rows, e.g. "txn_analysis_sla:month:2025-06-01"
+    grain:          period grain of the rows, used to drop whole periods on invalidation
+    closed_through: last date of the last period of the run that can no longer change
+    """
+    name: str
+    grain: str
+    closed_through: str
+
+def period_start(grain: str, date: str) -> str:
+    """
+    Return the first date of the week (Sunday start) or month holding date.
+    Any other grain is its own period.
+    """
+    dt = datetime.strptime(date[:10], "%Y-%m-%d")
+    if grain == WEEK:
+        dt -= timedelta(days=(dt.weekday() + 1) % 7)
+    elif grain == MONTH:
+        dt = dt.replace(day=1)
+    return dt.strftime("%Y-%m-%d")
+
+def closed_through(grain: str, end_date: str) -> str:
+    """
+    Return the last date of the last period that is complete on end_date.
+    """
+    return _shift(period_start(grain, _shift(end_date, 1)), -1)
+
+def open_from(grain: str, end_date: str) -> str:
+    """
+    Return the first date of the period still open on end_date, the day after
+    closed_through.
+    """
+    return period_start(grain, _shift(end_date, 1))
+
+class PeriodCache:
+    """
+    On-disk store of the grouped rows of closed periods, one SQLite file.
+
+    Each cached query has a watermark: every period between its covered_from
+    date and the watermark is complete and stored, so a run only fetches the
+    dates after it. Stored periods are keyed by the query text as well, so a
+    changed query never reads rows of the old shape.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._session() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        # One connection per call, so worker threads never share one
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    def fetch(
+        self,
+        slot: CacheSlot,
+        query: str,
+        fetch_rows: Callable[[str, str], List[Tuple]],
+        min_date: str,
+        max_date: str,
+        bounds_at: Tuple[int, int]
+    ) -> List[Tuple]:
+        """
+        Return the rows of a grouped query for min_date..max_date. Periods up to
+        the watermark are read from the cache, the remaining dates are fetched
+        with fetch_rows(first, last), and the periods that closed since the last
+        run are stored. bounds_at gives the columns holding each row's first and
+        last TRANSACTION_DATE; the period key is the first column. min_date must
+        be the first date of a period.
+        """
+        cache_key = f"{slot.name}:{hashlib.sha1(query.encode()).hexdigest()[:12]}"
+        with self._session() as db:
+            mark = db.execute(
+                "SELECT covered_from, watermark FROM watermarks WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+
+            cached, fetch_from, covered_from, watermark = [], min_date, min_date, None
+            if mark and mark[0] <= min_date:
+                # A run for an earlier end date only reads the periods closed by then.
+                # A range starting past the watermark is fetched from the watermark
+                # on, so the cached dates stay contiguous.
+                covered_from, watermark = mark
+                usable = min(watermark, slot.closed_through)
+                fetch_from = _shift(usable, 1)
+                for (blob,) in db.execute(
+                    "SELECT rows FROM periods WHERE cache_key = ? AND first_date >= ? AND last_date <= ? ORDER BY first_date",
+                    (cache_key, min_date, usable)
+                ):
+                    cached.extend(pickle.loads(blob))
+
+        fetched = fetch_rows(fetch_from, max_date) if fetch_from <= max_date else []
+        if watermark is None and slot.closed_through >= _shift(fetch_from, -1):
+            self._store(slot, cache_key, covered_from, False, fetched, bounds_at)
+        elif watermark is not None and slot.closed_through > watermark:
+            self._store(slot, cache_key, covered_from, True, fetched, bounds_at)
+
+        if fetch_from < min_date:
+            fetched = [row for row in fetched if str(row[bounds_at[0]])[:10] >= min_date]
+        return cached + fetched
+
+    def _store(
+        self,
+        slot: CacheSlot,
+        cache_key: str,
+        covered_from: str,
+        extend: bool,
+        rows: Sequence[Tuple],
+        bounds_at: Tuple[int, int]
+    ) -> None:
+        first_col, last_col = bounds_at
+        periods: Dict[str, List[Tuple]] = defaultdict(list)
+        for row in rows:
+            periods[str(row[0])].append(tuple(row))
+
+        with self._session() as db:
+            if not extend:
+                db.execute("DELETE FROM periods WHERE cache_key = ?", (cache_key,))
+            for period_key, period in periods.items():
+                first = min(str(row[first_col])[:10] for row in period)
+                last = max(str(row[last_col])[:10] for row in period)
+                if last <= slot.closed_through:
+                    db.execute(
+                        "INSERT OR REPLACE INTO periods VALUES (?, ?, ?, ?, ?)",
+                        (cache_key, period_key, first, last, pickle.dumps(period))
+                    )
+            db.execute(
+                "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?)",
+                (cache_key, slot.grain, covered_from, slot.closed_through)
+            )
+
+    def invalidate(self, from_date: Optional[str] = None) -> int:
+        """
+        Forget the cached periods holding from_date or any later date, or every
+        period when no date is given, and lower the watermarks to match.
+        Returns the number of periods dropped.
+        """
+        with self._session() as db:
+            if from_date is None:
+                dropped = db.execute("DELETE FROM periods").rowcount
+                db.execute("DELETE FROM watermarks")
+                return dropped
+
+            dropped = 0
+            marks = db.execute(
+                "SELECT cache_key, grain, covered_from FROM watermarks WHERE watermark >= ?", (from_date,)
+            ).fetchall()
+            for cache_key, grain, covered_from in marks:
+                watermark = _shift(period_start(grain, from_date), -1)
+                dropped += db.execute(
+                    "DELETE FROM periods WHERE cache_key = ? AND last_date > ?", (cache_key, watermark)
+                ).rowcount
+                if watermark < covered_from:
+                    db.execute("DELETE FROM watermarks WHERE cache_key = ?", (cache_key,))
+                else:
+                    db.execute("UPDATE watermarks SET watermark = ? WHERE cache_key = ?", (watermark, cache_key))
+            return dropped
+
+_cache: Optional[PeriodCache] = None
+_cache_lock = threading.Lock()
+
+def get_period_cache() -> Optional[PeriodCache]:
+    """
+    Return the shared period cache, or None when [cache] path is not configured.
+    """
+    global _cache
+    path = get_cache_path()
+    if not path:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.path != path:
+            _cache = PeriodCache(path)
+        return _cache
+
+def _shift(date: str, days: int) -> str:
+    return (datetime.strptime(date[:10], "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+if __name__ == "__main__":
+    # Drop cached periods after historical data was reloaded:
+    #   python period_cache.py invalidate [FROM_DATE]
+    if len(sys.argv) not in (2, 3) or sys.argv[1] != "invalidate":
+        print("Usage: python period_cache.py invalidate [YYYY-MM-DD]")
+        sys.exit(1)
+
+    cache = get_period_cache()
+    if cache is None:
+        print("No [cache] path configured in config.ini.")
+        sys.exit(1)
+
+    from_date = sys.argv[2] if len(sys.argv) == 3 else None
+    print(f"Dropped {cache.invalidate(from_date)} cached periods.")
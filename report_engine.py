@@ -0,0 +1,477 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+from openpyxl.worksheet.worksheet import Worksheet
+from dataset import (
+    PeriodRows, fetch_daily_rows, fetch_grouped_rows, fetch_paired_rows, month_calendar, split_paired_rows
+)
+from layout import RowCursor
+from period_cache import CacheSlot, closed_through, open_from, period_start
+from report_specs import DAY, WEEK, MONTH, ReportSpec, Section
+from report_styles import (
+    title_font, style_range, HEADER, BODY_CENTERED, PERCENT_BODY, PERCENT_SUMMARY, AMOUNT_BODY, AMOUNT_SUMMARY
+)
+from shares import share_blocks
+
+# Column every period is keyed by, per grain
+PERIOD_KEYS = {DAY: "WEEK_NUM", WEEK: "WEEK_NUM", MONTH: "MONTH"}
+
+# Grains whose closed periods are kept in the period cache
+CACHED_GRAINS = (WEEK, MONTH)
+
+# Rollup table suffix and period start column of the grains the stored
+# procedure keeps rolled up, see sql/sp_txn_analysis_rollup.sql
+ROLLUPS = {WEEK: ("week", "WEEK_START"), MONTH: ("month", "MONTH_START")}
+
+# Grain whose range a section's source query reads. Daily sections read the
+# weekly range, so the daily and weekly sheets of a table run the same query
+# and the query cache serves it once per run.
+SOURCE_GRAINS = {DAY: WEEK, WEEK: WEEK, MONTH: MONTH}
+
+class Period(NamedTuple):
+    """
+    One block of a section: its header label and count rows, each row being
+    (period key, FINAL_STATUS, bucket counts..., total).
+    """
+    name: str
+    label: str
+    rows: List[Tuple]
+
+class PriorSection(NamedTuple):
+    """
+    The blocks of one section as rendered by the previous run of the month,
+    each kept as (period key, last TRANSACTION_DATE, period). Blocks without
+    rows are not kept; they are rebuilt like any other empty period.
+    """
+    end_date: str
+    periods: List[Tuple[Any, str, Period]]
+
+def generate_report(
+    spec: ReportSpec,
+    sheet: Worksheet,
+    end_date: str,
+    logger: logging.Logger,
+    year_start: str,
+    prior: Optional[List[PriorSection]] = None
+) -> bool:
+    """Generate one report sheet from its spec, reusing the prior run's blocks when given."""
+    logger.info(f"Generating {spec.name} data...")
+
+    title_cell = sheet.cell(row=1, column=2, value=spec.sections[0].title)
+    title_cell.font = title_font
+    if spec.subtitle:
+        column, text = spec.subtitle
+        sheet.cell(row=1, column=column, value=text).font = title_font
+
+    try:
+        section_periods = plan_sections(spec, end_date, year_start, prior)
+    except Exception as e:
+        logger.error(f"Error fetching data for {' and '.join(section.table for section in spec.sections)}: {e}")
+        return False
+
+    layout = RowCursor(sheet, row=1)
+    for index, (section, periods) in enumerate(zip(spec.sections, section_periods)):
+        if section.log_label:
+            logger.info(f"Processing {section.log_label}")
+
+        # Later sections of a paired sheet open with their own title
+        if index > 0:
+            layout.title(section.title).font = title_font
+            layout.skip()
+
+        for period in periods:
+            logger.info(f"Processing {period.name}")
+            try:
+                render_period(layout, spec, section, period)
+            except Exception as e:
+                logger.error(f"Error building blocks for {period.name}: {e}")
+                return False
+
+    # Paired sheets close with the average ticket, volume over count
+    if spec.average_title:
+        layout.title(spec.average_title).font = title_font
+        layout.skip()
+        for counts, volumes in zip(*section_periods):
+            try:
+                render_average_period(layout, spec, counts, volumes)
+            except Exception as e:
+                logger.error(f"Error building average blocks for {counts.name}: {e}")
+                return False
+
+    logger.info(f"{spec.name} data generation complete.")
+    return True
+
+def report_range(grain: str, end_date: str, year_start: str) -> Tuple[str, str]:
+    """
+    Return the TRANSACTION_DATE range a grain reports on: the month to date for
+    days, from the Sunday starting the month's first week for weeks, and the
+    year to date for months.
+    """
+    if grain == DAY:
+        return end_date[:8] + "01", end_date
+    if grain == WEEK:
+        start_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(day=1)
+        start_week_dt = start_dt - timedelta(days=start_dt.weekday() + 1 if start_dt.weekday() != 6 else 0)
+        return start_week_dt.strftime("%Y-%m-%d"), end_date
+    return year_start, end_date
+
+def refresh_start(grain: str, prior_end: str) -> str:
+    """
+    Return the first TRANSACTION_DATE whose period changes once the days after
+    prior_end are added: the next day, or the start of its week or month.
+    """
+    next_dt = datetime.strptime(prior_end, "%Y-%m-%d") + timedelta(days=1)
+    return period_start(grain, next_dt.strftime("%Y-%m-%d"))
+
+def cache_slot(spec: ReportSpec, source: str, end_date: str, year_start: str) -> Optional[CacheSlot]:
+    """
+    Return where the closed periods read from source are cached, if the grain
+    is. Period keys are counted from the year start, so it is part of the slot.
+    """
+    if spec.grain not in CACHED_GRAINS:
+        return None
+    return CacheSlot(f"{source}:{spec.grain}:{year_start}", spec.grain, closed_through(spec.grain, end_date))
+
+def fetch_start(spec: ReportSpec, end_date: str, year_start: str, prior: Optional[PriorSection] = None) -> str:
+    """
+    Return the first TRANSACTION_DATE a section's source query reads: the start
+    of the source range, or with the prior run's blocks the start of the first
+    period the days after its end date change.
+    """
+    source_grain = SOURCE_GRAINS[spec.grain]
+    fetch_from = report_range(source_grain, end_date, year_start)[0]
+    if prior is not None:
+        fetch_from = max(fetch_from, refresh_start(source_grain, prior.end_date))
+    return fetch_from
+
+def kept_periods(prior: Optional[PriorSection], fetch_from: str) -> dict:
+    """
+    Return the prior run's blocks that end before fetch_from, by period key.
+    """
+    if prior is None:
+        return {}
+    return {key: period for key, last, period in prior.periods if last < fetch_from}
+
+def plan_sections(
+    spec: ReportSpec,
+    end_date: str,
+    year_start: str,
+    prior: Optional[List[PriorSection]] = None
+) -> List[List[Period]]:
+    """
+    Plan the period blocks of every section of a sheet. The count and volume
+    tables of a paired monthly sheet are grouped from the same rows, so both
+    are read with one joined query and cut along the same months.
+    """
+    priors = prior or [None] * len(spec.sections)
+    if not (spec.paired and spec.grain == MONTH):
+        return [
+            plan_periods(spec, section, end_date, year_start, section_prior)
+            for section, section_prior in zip(spec.sections, priors)
+        ]
+
+    _, max_date = report_range(spec.grain, end_date, year_start)
+    fetch_from = fetch_start(spec, end_date, year_start, priors[0])
+    closed, tail_from = rollup_split(spec, fetch_from, end_date)
+    source = "+".join(section.table for section in spec.sections)
+    rows = []
+    if fetch_from <= closed:
+        rows = fetch_paired_rows(paired_rollup_query(spec), fetch_from, closed, cache_slot(spec, source, end_date, year_start))
+    if tail_from <= max_date:
+        rows = rows + fetch_paired_rows(paired_query(spec), tail_from, max_date)
+    return [
+        cut_periods(spec, period_rows, kept_periods(section_prior, fetch_from), end_date, year_start)
+        for period_rows, section_prior in zip(split_paired_rows(rows, len(spec.buckets)), priors)
+    ]
+
+def rollup_split(spec: ReportSpec, fetch_from: str, end_date: str) -> Tuple[str, str]:
+    """
+    Split a weekly or monthly fetch at the periods closed by end_date: return
+    the last date read from the rollup table and the first date of the open
+    period, which is still grouped from the daily rows. The rollups hold whole
+    periods, so the open one would count days after end_date.
+    """
+    return closed_through(spec.grain, end_date), max(fetch_from, open_from(spec.grain, end_date))
+
+def plan_periods(
+    spec: ReportSpec,
+    section: Section,
+    end_date: str,
+    year_start: str,
+    prior: Optional[PriorSection] = None
+) -> List[Period]:
+    """
+    Fetch a section and cut it into period blocks. Daily sections read the
+    per-date rows. Weekly and monthly sections read their closed periods from
+    the week or month rollup table, with each period's date bounds, and group
+    only the open period from the daily rows: weeks sum the daily sheet's rows
+    in memory, months run a grouped query over the month to date.
+
+    With the prior run's blocks, only the periods touched by the days after
+    its end date are fetched; every earlier period is taken from the prior.
+    """
+    min_date, max_date = report_range(spec.grain, end_date, year_start)
+    fetch_from = fetch_start(spec, end_date, year_start, prior)
+    kept = kept_periods(prior, fetch_from)
+
+    if spec.grain == DAY:
+        daily_rows = fetch_daily_rows(daily_query(spec, section), fetch_from, max_date)
+        dates = [f"{min_date[:8]}{day:02d}" for day in range(int(min_date[8:]), int(max_date[8:]) + 1)]
+        return [
+            kept[date] if date < fetch_from else Period(f"date {date}", date, daily_rows.for_date(date))
+            for date in dates
+        ]
+
+    closed, tail_from = rollup_split(spec, fetch_from, end_date)
+    rows = []
+    if fetch_from <= closed:
+        rows = fetch_grouped_rows(
+            rollup_query(spec, section), fetch_from, closed, cache_slot(spec, section.table, end_date, year_start)
+        )
+    if spec.grain == WEEK:
+        rows = rows + fetch_daily_rows(daily_query(spec, section), fetch_from, max_date).grouped_rows(since=tail_from)
+    elif tail_from <= max_date:
+        rows = rows + fetch_grouped_rows(grouped_query(spec, section), tail_from, max_date)
+    return cut_periods(spec, PeriodRows(rows), kept, end_date, year_start)
+
+def cut_periods(spec: ReportSpec, period_rows: PeriodRows, kept: dict, end_date: str, year_start: str) -> List[Period]:
+    """
+    Cut weekly or monthly rows into period blocks, taking the kept block of a
+    period the rows do not cover.
+    """
+    if spec.grain == WEEK:
+        keys, bounds = period_rows.keys(), period_rows.bounds
+        if kept:
+            known = set(kept) | set(keys)
+            keys = range(min(known), max(known) + 1)
+    else:
+        # Months are shared by every monthly sheet of the run
+        min_date, _ = report_range(spec.grain, end_date, year_start)
+        calendar = month_calendar(min_date, end_date)
+        keys, bounds = calendar.months(), calendar.bounds
+
+    periods = []
+    for key in keys:
+        rows = period_rows.for_key(key)
+        if not rows and key in kept:
+            periods.append(kept[key])
+            continue
+        first, last = bounds(key)
+        periods.append(Period(f"{spec.grain} {key}", f"{first} - {last}", rows))
+    return periods
+
+def daily_query(spec: ReportSpec, section: Section) -> str:
+    """
+    Per-date count rows of a section, TRANSACTION_DATE first. Rows are ordered
+    by STATUS_ID first so that, once ranked by label, sums per week keep the
+    SQL status order.
+    """
+    buckets = [f"[{bucket}]" for bucket in spec.buckets]
+    return f"""
+        SELECT
+        [TRANSACTION_DATE],
+        [{PERIOD_KEYS[spec.grain]}],
+        [STATUS_ID],
+        {", ".join(buckets)},
+        {" + ".join(buckets)}
+        FROM [dbo].[{section.table}]
+        WHERE TRANSACTION_DATE BETWEEN ? AND ?
+        ORDER BY STATUS_ID, TRANSACTION_DATE, [{PERIOD_KEYS[spec.grain]}]
+    """
+
+def grouped_query(spec: ReportSpec, section: Section) -> str:
+    """
+    Count rows of every month of a section at once, with the first and last
+    TRANSACTION_DATE of each group.
+    """
+    key = f"[{PERIOD_KEYS[spec.grain]}]"
+    buckets = [f"[{bucket}]" for bucket in spec.buckets]
+    return f"""
+        SELECT
+        {key},
+        [STATUS_ID],
+        MIN(TRANSACTION_DATE),
+        MAX(TRANSACTION_DATE),
+        {", ".join(f"SUM({bucket}) AS {bucket}" for bucket in buckets)},
+        SUM({" + ".join(buckets)})
+        FROM [dbo].[{section.table}]
+        WHERE TRANSACTION_DATE BETWEEN ? AND ?
+        GROUP BY {key}, STATUS_ID
+        ORDER BY {key}, STATUS_ID
+    """
+
+def rollup_query(spec: ReportSpec, section: Section) -> str:
+    """
+    Count rows of a section's closed weeks or months read from its rollup
+    table, in the shape of grouped_query. Takes the range of period starts.
+    """
+    suffix, start = ROLLUPS[spec.grain]
+    key = f"[{PERIOD_KEYS[spec.grain]}]"
+    buckets = [f"[{bucket}]" for bucket in spec.buckets]
+    return f"""
+        SELECT
+        {key},
+        [STATUS_ID],
+        [FIRST_DATE],
+        [LAST_DATE],
+        {", ".join(buckets)},
+        {" + ".join(buckets)}
+        FROM [dbo].[{section.table}_{suffix}]
+        WHERE {start} BETWEEN ? AND ?
+        ORDER BY {key}, STATUS_ID
+    """
+
+def paired_query(spec: ReportSpec) -> str:
+    """
+    Count and volume rows of a paired sheet in one pass: both tables joined on
+    their date, key and STATUS_ID, then grouped per month. Each side starts
+    with how many of its rows matched, so a status found in only one table
+    stays out of the other. Takes the date range once per table.
+    """
+    key = f"[{PERIOD_KEYS[spec.grain]}]"
+    buckets = [f"[{bucket}]" for bucket in spec.buckets]
+    count_table, volume_table = (section.table for section in spec.sections)
+
+    def sums(alias: str) -> str:
+        columns = [f"{alias}.{bucket}" for bucket in buckets]
+        return ", ".join([
+            f"COUNT({alias}.TRANSACTION_DATE)",
+            *(f"SUM({column})" for column in columns),
+            f"SUM({' + '.join(columns)})",
+        ])
+
+    return f"""
+        SELECT
+        COALESCE(t.{key}, v.{key}),
+        COALESCE(t.STATUS_ID, v.STATUS_ID),
+        MIN(COALESCE(t.TRANSACTION_DATE, v.TRANSACTION_DATE)),
+        MAX(COALESCE(t.TRANSACTION_DATE, v.TRANSACTION_DATE)),
+        {sums("t")},
+        {sums("v")}
+        FROM (SELECT * FROM [dbo].[{count_table}] WHERE TRANSACTION_DATE BETWEEN ? AND ?) t
+        FULL OUTER JOIN (SELECT * FROM [dbo].[{volume_table}] WHERE TRANSACTION_DATE BETWEEN ? AND ?) v
+        ON v.TRANSACTION_DATE = t.TRANSACTION_DATE AND v.{key} = t.{key} AND v.STATUS_ID = t.STATUS_ID
+        GROUP BY COALESCE(t.{key}, v.{key}), COALESCE(t.STATUS_ID, v.STATUS_ID)
+        ORDER BY 1, 2
+    """
+
+def paired_rollup_query(spec: ReportSpec) -> str:
+    """
+    Closed months of a paired sheet read from both month rollups, in the shape
+    of paired_query. A rollup row already sums its month, so each side's match
+    count is 1 or 0.
+    """
+    suffix, start = ROLLUPS[spec.grain]
+    key = f"[{PERIOD_KEYS[spec.grain]}]"
+    buckets = [f"[{bucket}]" for bucket in spec.buckets]
+    count_table, volume_table = (section.table for section in spec.sections)
+
+    def sums(alias: str) -> str:
+        columns = [f"{alias}.{bucket}" for bucket in buckets]
+        return ", ".join([
+            f"CASE WHEN {alias}.STATUS_ID IS NULL THEN 0 ELSE 1 END",
+            *columns,
+            " + ".join(columns),
+        ])
+
+    return f"""
+        SELECT
+        COALESCE(t.{key}, v.{key}),
+        COALESCE(t.STATUS_ID, v.STATUS_ID),
+        CASE WHEN v.FIRST_DATE < t.FIRST_DATE OR t.FIRST_DATE IS NULL THEN v.FIRST_DATE ELSE t.FIRST_DATE END,
+        CASE WHEN v.LAST_DATE > t.LAST_DATE OR t.LAST_DATE IS NULL THEN v.LAST_DATE ELSE t.LAST_DATE END,
+        {sums("t")},
+        {sums("v")}
+        FROM (SELECT * FROM [dbo].[{count_table}_{suffix}] WHERE {start} BETWEEN ? AND ?) t
+        FULL OUTER JOIN (SELECT * FROM [dbo].[{volume_table}_{suffix}] WHERE {start} BETWEEN ? AND ?) v
+        ON v.{start} = t.{start} AND v.{key} = t.{key} AND v.STATUS_ID = t.STATUS_ID
+        ORDER BY 1, 2
+    """
+
+def render_period(layout: RowCursor, spec: ReportSpec, section: Section, period: Period) -> None:
+    """
+    Render one period as three side-by-side blocks: the counts with their
+    column totals, each count's share of its column, and each count's share
+    of its row. The side blocks share the header row of the count block.
+    """
+    sheet = layout.sheet
+    width = len(spec.buckets)
+    rows = period.rows
+    statuses = [row[1] for row in rows]
+    blocks = share_blocks([row[2:-1] for row in rows], width, zero_if_null=section.zero_if_null)
+
+    # First block: label, key, status, buckets and an unlabelled total
+    header_row_idx = layout.start_block([period.label, PERIOD_KEYS[spec.grain], "FINAL_STATUS", *spec.buckets, ""])
+    style_range(sheet, header_row_idx, 2, width + 3, HEADER)
+    for row in rows:
+        row_idx = layout.append(("",) + tuple(row))
+        style_range(sheet, row_idx, 2, width + 3, BODY_CENTERED)
+    summary_row_idx = layout.append(["", ""] + blocks.totals, start_col=2)
+
+    # Second block: share of the column total
+    start_col_second = width + 6
+    _write_row(sheet, header_row_idx, start_col_second, ["FINAL_STATUS", *spec.buckets])
+    style_range(sheet, header_row_idx, start_col_second, start_col_second + width, HEADER)
+    for i, (status, shares) in enumerate(zip(statuses, blocks.column_shares), start=1):
+        _write_row(sheet, header_row_idx + i, start_col_second, [status, *shares])
+        style_range(sheet, header_row_idx + i, start_col_second, start_col_second, BODY_CENTERED)
+        style_range(sheet, header_row_idx + i, start_col_second + 1, start_col_second + width, PERCENT_BODY)
+    _write_row(sheet, summary_row_idx, start_col_second, ["", *blocks.total_shares])
+    style_range(sheet, summary_row_idx, start_col_second, start_col_second + width, PERCENT_SUMMARY)
+
+    # Third block: share of the row total, closed by the row's 100%
+    start_col_third = start_col_second + width + 2
+    total_share_style = PERCENT_BODY if spec.border_total_share else PERCENT_SUMMARY
+    _write_row(sheet, header_row_idx, start_col_third, ["FINAL_STATUS", *spec.buckets, ""])
+    style_range(sheet, header_row_idx, start_col_third, start_col_third + width, HEADER)
+    for i, (status, shares) in enumerate(zip(statuses, blocks.row_shares), start=1):
+        _write_row(sheet, header_row_idx + i, start_col_third, [status, *shares])
+        style_range(sheet, header_row_idx + i, start_col_third, start_col_third + width, PERCENT_BODY)
+        style_range(sheet, header_row_idx + i, start_col_third + width + 1, start_col_third + width + 1, total_share_style)
+
+    # Add a blank row after each period's block
+    if rows:
+        layout.skip()
+
+def render_average_period(layout: RowCursor, spec: ReportSpec, counts: Period, volumes: Period) -> None:
+    """
+    Render one period of a paired sheet's average block: each status's volume
+    over its count per bucket and for the row total, closed by the same ratio
+    of the column totals. Buckets without transactions are left empty.
+    """
+    sheet = layout.sheet
+    width = len(spec.buckets)
+    volumes_by_status = {row[1]: row[2:] for row in volumes.rows}
+    count_totals, volume_totals = [None] * (width + 1), [None] * (width + 1)
+
+    header_row_idx = layout.start_block([counts.label, PERIOD_KEYS[spec.grain], "FINAL_STATUS", *spec.buckets, ""])
+    style_range(sheet, header_row_idx, 2, width + 3, HEADER)
+    for row in counts.rows:
+        key, status, values = row[0], row[1], row[2:]
+        amounts = volumes_by_status.get(status, (None,) * (width + 1))
+        row_idx = layout.append(["", key, status, *map(_average, amounts, values)])
+        style_range(sheet, row_idx, 2, 3, BODY_CENTERED)
+        style_range(sheet, row_idx, 4, width + 3, AMOUNT_BODY)
+        style_range(sheet, row_idx, width + 4, width + 4, AMOUNT_SUMMARY)
+        count_totals = list(map(_add, count_totals, values))
+        volume_totals = list(map(_add, volume_totals, amounts))
+    summary_row_idx = layout.append(["", "", *map(_average, volume_totals, count_totals)], start_col=2)
+    style_range(sheet, summary_row_idx, 4, width + 4, AMOUNT_SUMMARY)
+
+    if counts.rows:
+        layout.skip()
+
+def _average(volume, count):
+    # Empty when there is nothing to divide by
+    if volume is None or not count:
+        return None
+    return volume / count
+
+def _add(total, value):
+    if value is None:
+        return total
+    return value if total is None else total + value
+
+def _write_row(sheet: Worksheet, row: int, start_col: int, values: Sequence) -> None:
+    for col_idx, value in enumerate(values, start=start_col):
+        sheet.cell(row=row, column=col_idx, value=value)
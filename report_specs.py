@@ -0,0 +1,133 @@
+from typing import NamedTuple, Optional, Tuple
+
+# Grains a report can be broken down by
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+
+class Section(NamedTuple):
+    """
+    One source table rendered as a run of period blocks under its own title.
+
+    zero_if_null: bucket indexes whose second block shows 0 instead of an empty
+                  share when the bucket has no transactions at all
+    """
+    table: str
+    title: str
+    log_label: Optional[str] = None
+    zero_if_null: Tuple[int, ...] = ()
+
+class ReportSpec(NamedTuple):
+    """
+    Everything the report engine needs to build one sheet.
+
+    name:               label used in the log, e.g. "SLA (DAILY)"
+    buckets:            count columns of the source tables, in sheet order
+    sections:           one section per table; paired sheets list txn then vol
+    subtitle:           optional (column, text) written next to the first title
+    border_total_share: whether the 100% column of the row-share block is bordered
+    average_title:      title of the volume / count block closing a paired sheet, if any
+    """
+    sheet_name: str
+    name: str
+    grain: str
+    buckets: Tuple[str, ...]
+    sections: Tuple[Section, ...]
+    subtitle: Optional[Tuple[int, str]] = None
+    border_total_share: bool = False
+    average_title: Optional[str] = None
+
+    @property
+    def paired(self) -> bool:
+        """
+        Whether the sheet lists a count table and the volume table filled
+        from the same rows, fetched together.
+        """
+        return len(self.sections) == 2
+
+SLA_BUCKETS = (
+    "SLA-<0", "SLA-=0", "SLA-1TO30", "SLA-31TO60",
+    "SLA-61TO90", "SLA-91TO120", "SLA-121TO150", "SLA->150",
+)
+SLA_SUBTITLE = (9, "SLA- (UPDATED DATE - CREATED DATE)")
+TIME_OF_DAY_BUCKETS = ("0-8", "9-12", "13-16", "17-20", "21-23")
+AMOUNT_BUCKETS = ("< 500", "500 TO 999", "1000 TO 2999", "3000 TO 4999", ">= 5000")
+PAY_CASH_BUCKETS = (
+    "PAY_CASH=0", "PAY_CASH=1TO499", "PAY_CASH=500T999",
+    "PAY_CASH=1000TO2999", "PAY_CASH=3000TO4999", "PAY_CASH>=5000",
+)
+DENOMINATION_BUCKETS = (
+    "DENOMINATION=0", "DENOMINATION=1TO499", "DENOMINATION=500T999",
+    "DENOMINATION=1000TO2999", "DENOMINATION=3000TO4999", "DENOMINATION>=5000",
+)
+CASH_BILL_BUCKETS = ("P20_DENOM", "P50_DENOM", "P100_DENOM", "P200_DENOM", "P500_DENOM", "P1000_DENOM")
+
+TIME_OF_DAY_TITLE = "TRANSACTION COUNT PER TIME OF DAY AND FINAL STATUS"
+SLA_TITLE = "TRANSACTION COUNT PER SLA- IN SECONDS AND FINAL STATUS"
+SLA_WITH_CBI_TITLE = "TRANSACTION COUNT PER SLA (WITH CBI)- IN SECONDS AND FINAL STATUS"
+SLA_WO_CBI_TITLE = "TRANSACTION COUNT PER SLA (WITHOUT CBI)- IN SECONDS AND FINAL STATUS"
+
+# Every sheet of the workbook, in sheet order
+REPORTS = (
+    ReportSpec(
+        "TIMEOFDAY_TXNCOUNT_DAILY", "TIME OF DAY - TXN_COUNT (DAILY)", DAY, TIME_OF_DAY_BUCKETS,
+        (Section("txn_analysis_time_of_day_txn_count", TIME_OF_DAY_TITLE),),
+    ),
+    ReportSpec(
+        "TIMEOFDAY_TXNCOUNT_WEEKLY", "TIME OF DAY - TXN_COUNT (WEEKLY)", WEEK, TIME_OF_DAY_BUCKETS,
+        (Section("txn_analysis_time_of_day_txn_count", TIME_OF_DAY_TITLE),),
+    ),
+    ReportSpec(
+        "SLA_DAILY", "SLA (DAILY)", DAY, SLA_BUCKETS,
+        (Section("txn_analysis_sla", SLA_TITLE),), subtitle=SLA_SUBTITLE,
+    ),
+    ReportSpec(
+        "SLA_WEEKLY", "SLA (WEEKLY)", WEEK, SLA_BUCKETS,
+        (Section("txn_analysis_sla", SLA_TITLE),), subtitle=SLA_SUBTITLE,
+    ),
+    ReportSpec(
+        "SLA_WITH_CBI_DAILY", "SLA WITH CBI (DAILY)", DAY, SLA_BUCKETS,
+        (Section("txn_analysis_sla_with_cbi", SLA_WITH_CBI_TITLE),), subtitle=SLA_SUBTITLE,
+    ),
+    ReportSpec(
+        "SLA_WITH_CBI_WEEKLY", "SLA WITH CBI (WEEKLY)", WEEK, SLA_BUCKETS,
+        (Section("txn_analysis_sla_with_cbi", SLA_WITH_CBI_TITLE),), subtitle=SLA_SUBTITLE,
+    ),
+    ReportSpec(
+        "SLA_WO_CBI_DAILY", "SLA WO CBI (DAILY)", DAY, SLA_BUCKETS,
+        (Section("txn_analysis_sla_wo_cbi", SLA_WO_CBI_TITLE),), subtitle=SLA_SUBTITLE,
+    ),
+    ReportSpec(
+        "SLA_WO_CBI_WEEKLY", "SLA WO CBI (WEEKLY)", WEEK, SLA_BUCKETS,
+        (Section("txn_analysis_sla_wo_cbi", SLA_WO_CBI_TITLE),), subtitle=SLA_SUBTITLE,
+    ),
+    ReportSpec(
+        "TRANSACTION_AMOUNT", "TRANSACTION AMOUNT (MONTHLY)", MONTH, AMOUNT_BUCKETS,
+        (Section("txn_analysis_transaction_amount", "TRANSACTION COUNT PER TRANSACTION AMOUNT RANGE AND FINAL STATUS"),),
+        border_total_share=True,
+    ),
+    ReportSpec(
+        "PAY_CASH_AMOUNT - TXN MASTER", "PAY_CASH_AMOUNT - TXN MASTER (MONTHLY)", MONTH, PAY_CASH_BUCKETS,
+        (
+            Section("txn_analysis_pay_cash_amt_txn", "TRANSACTION COUNT PER PAY CASH AMOUNT RANGE AND FINAL STATUS", "TXN AMOUNT"),
+            Section("txn_analysis_pay_cash_amt_vol", "VOLUME PER PAY CASH AMOUNT RANGE AND FINAL STATUS", "Volume", (0,)),
+        ),
+        average_title="AVERAGE TICKET PER PAY CASH AMOUNT RANGE AND FINAL STATUS",
+    ),
+    ReportSpec(
+        "TOTAL_DENOMINATION - CBI", "TOTAL_DENOMINATION - CBI (MONTHLY)", MONTH, DENOMINATION_BUCKETS,
+        (
+            Section("txn_analysis_total_denom_cbi_txn", "TRANSACTION COUNT PER TOTAL DENOM RANGE AND FINAL STATUS", "TXN AMOUNT"),
+            Section("txn_analysis_total_denom_cbi_vol", "VOLUME PER TOTAL DENOM RANGE AND FINAL STATUS", "Volume", (0,)),
+        ),
+        average_title="AVERAGE TICKET PER TOTAL DENOM RANGE AND FINAL STATUS",
+    ),
+    # Volume per bill is the bill's face value, so this sheet has no average block
+    ReportSpec(
+        "TOTAL_PER_CASH_BILL - CBI", "TOTAL_PER CASH BILL - CBI (MONTHLY)", MONTH, CASH_BILL_BUCKETS,
+        (
+            Section("txn_analysis_total_per_cash_bill_cbi_txn", "COUNT PER BILL INSERTED AND FINAL STATUS", "COUNT"),
+            Section("txn_analysis_total_per_cash_bill_cbi_vol", "TOTAL VOLUME PER BILL INSERTED AND FINAL STATUS", "Volume", (0,)),
+        ),
+    ),
+)
@@ -0,0 +1,66 @@
+from copy import copy
+from typing import List
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+# Define styles
+title_font = Font(bold=True, color="008000", size=11)  # Green bold title
+header_font = Font(bold=True, color="FFFFFF")          # White bold header
+header_fill = PatternFill(start_color="156082", end_color="156082", fill_type="solid")  # Light green fill
+border = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin")
+)
+center = Alignment(horizontal="center")
+percent_format = "0.00%"
+amount_format = "#,##0.00"
+
+# Named styles shared by every report block
+HEADER = "header"
+BODY_CENTERED = "body-centered"
+PERCENT_BODY = "percent-body"
+PERCENT_SUMMARY = "percent-summary"
+AMOUNT_BODY = "amount-body"
+AMOUNT_SUMMARY = "amount-summary"
+
+def report_named_styles() -> List[NamedStyle]:
+    """
+    Return fresh NamedStyle definitions for the report blocks. Attributes a
+    block does not set keep the workbook defaults, as on an unstyled cell.
+    """
+    return [
+        NamedStyle(name=HEADER, font=header_font, fill=header_fill, border=border, alignment=center),
+        NamedStyle(name=BODY_CENTERED, font=DEFAULT_FONT, border=border, alignment=center),
+        NamedStyle(name=PERCENT_BODY, font=DEFAULT_FONT, border=border, alignment=center, number_format=percent_format),
+        NamedStyle(name=PERCENT_SUMMARY, font=DEFAULT_FONT, border=DEFAULT_BORDER, number_format=percent_format),
+        NamedStyle(name=AMOUNT_BODY, font=DEFAULT_FONT, border=border, alignment=center, number_format=amount_format),
+        NamedStyle(name=AMOUNT_SUMMARY, font=DEFAULT_FONT, border=DEFAULT_BORDER, number_format=amount_format),
+    ]
+
+def register_styles(workbook) -> None:
+    """
+    Add the report named styles to a workbook, skipping any already present.
+    """
+    for style in report_named_styles():
+        if style.name not in workbook.named_styles:
+            workbook.add_named_style(style)
+
+    # Intern the title font up front so sheets rendered on worker threads only read it
+    workbook._fonts.add(title_font)
+
+def style_range(sheet, row: int, first_col: int, last_col: int, style: str) -> None:
+    """
+    Apply a report named style to the cells of one row, first_col..last_col inclusive.
+    The style is resolved once and its style array copied into each cell, which is
+    what assigning cell.style does without the per-cell name lookup.
+    """
+    workbook = sheet.parent
+    if style not in workbook.named_styles:
+        register_styles(workbook)
+    template = workbook._named_styles[style].as_tuple()
+
+    for col_idx in range(first_col, last_col + 1):
+        sheet.cell(row=row, column=col_idx)._style = copy(template)
@@ -0,0 +1,143 @@
+from copy import copy
+from typing import Dict, List, Optional, Tuple, Union
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import Cell
+from openpyxl.packaging.custom import StringProperty
+from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from report_styles import register_styles
+
+class StreamingSheet:
+    """
+    Worksheet stand-in for write_only workbooks. Cells are created with
+    sheet.cell() as on a regular worksheet, but only rows that have not been
+    streamed yet are kept in memory. flush() writes the finished rows to the
+    underlying sheet in order, each row exactly once.
+    """
+
+    def __init__(self, ws: WriteOnlyWorksheet) -> None:
+        self._ws = ws
+        self._rows: Dict[int, Dict[int, Cell]] = {}
+        self._flushed = 0   # last row already written to the stream
+        self.title = ws.title
+        self.parent = ws.parent
+
+    def cell(self, row: int, column: int, value=None) -> Cell:
+        """
+        Return the buffered cell at row/column, creating it if needed.
+        Setting a value of None leaves the current value alone, as Worksheet.cell does.
+        """
+        if row <= self._flushed:
+            raise ValueError(f"Row {row} of sheet {self.title} has already been written")
+
+        cells = self._rows.setdefault(row, {})
+        cell = cells.get(column)
+        if cell is None:
+            cell = cells[column] = WriteOnlyCell(self._ws)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def flush(self, upto: Optional[int] = None) -> None:
+        """
+        Write every buffered row up to and including row upto, or all of them.
+        Rows without cells are written as empty rows.
+        """
+        last = max(self._rows, default=self._flushed) if upto is None else upto
+        for row_idx in range(self._flushed + 1, last + 1):
+            cells = self._rows.pop(row_idx, {})
+            self._ws.append([cells.get(col_idx) for col_idx in range(1, max(cells, default=0) + 1)])
+        self._flushed = max(self._flushed, last)
+
+class BufferedSheet:
+    """
+    Sheet stand-in for generators running on worker threads. Cells are kept in
+    memory, bound to the destination worksheet so named styles resolve, and
+    replay() copies them into the destination sheet in row order. Rendering
+    only reads the workbook's registered styles; all writes happen in replay(),
+    which must run on the thread that owns the workbook.
+    """
+
+    def __init__(self, target: Union[Worksheet, StreamingSheet], ws: Union[Worksheet, WriteOnlyWorksheet]) -> None:
+        self._target = target
+        self._ws = ws
+        self._cells: Dict[Tuple[int, int], Cell] = {}
+        self.title = ws.title
+        self.parent = ws.parent
+
+    def cell(self, row: int, column: int, value=None) -> Cell:
+        """
+        Return the recorded cell at row/column, creating it if needed.
+        """
+        cell = self._cells.get((row, column))
+        if cell is None:
+            cell = self._cells[(row, column)] = Cell(self._ws, row=row, column=column)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def replay(self) -> None:
+        """
+        Copy the recorded cells into the destination sheet and drop them.
+        Streaming destinations are flushed row by row as they fill up.
+        """
+        streaming = isinstance(self._target, StreamingSheet)
+        current_row = 0
+        for row, column in sorted(self._cells):
+            if streaming and row != current_row:
+                self._target.flush(row - 1)
+                current_row = row
+
+            source = self._cells[(row, column)]
+            cell = self._target.cell(row=row, column=column, value=source.value)
+            cell._style = copy(source._style)
+        self._cells.clear()
+
+class ReportWorkbook:
+    """
+    Workbook the report generators render into. The default backend keeps
+    every sheet in memory until save(); the write_only backend streams each
+    block to disk once the next one starts, so only one block is resident.
+    """
+
+    def __init__(self, write_only: bool = False) -> None:
+        self.write_only = write_only
+        self._wb = openpyxl.Workbook(write_only=write_only)
+        self._streams: List[StreamingSheet] = []
+
+        # Remove the default sheet
+        if not write_only:
+            self._wb.remove(self._wb.active)
+
+        register_styles(self._wb)
+
+    def create_sheet(self, title: str, buffered: bool = False) -> Union[Worksheet, StreamingSheet, BufferedSheet]:
+        """
+        Add a sheet and return the object the generators should write into.
+        A buffered sheet can be rendered off the main thread and is written
+        into the workbook by its replay().
+        """
+        ws = self._wb.create_sheet(title=title)
+        sheet = ws
+        if self.write_only:
+            sheet = StreamingSheet(ws)
+            self._streams.append(sheet)
+
+        if buffered:
+            return BufferedSheet(sheet, ws)
+        return sheet
+
+    def set_property(self, name: str, value: str) -> None:
+        """
+        Record a custom document property, e.g. the range the report covers.
+        """
+        self._wb.custom_doc_props.append(StringProperty(name=name, value=value))
+
+    def save(self, filename: str) -> None:
+        """
+        Write out whatever is still buffered and save the workbook.
+        """
+        for sheet in self._streams:
+            sheet.flush()
+        self._wb.save(filename)
@@ -0,0 +1,100 @@
+from decimal import Decimal
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+import numpy as np
+
+# Shares are DECIMAL(10,6): kept as integer millionths until they are emitted
+SHARE_SCALE = 10 ** 6
+SHARE_QUANTUM = Decimal("0.000001")
+ROW_TOTAL_SHARE = Decimal("1.000000")
+ZERO_SHARE = Decimal("0.000000")
+
+# Largest count for which 2 * count * SHARE_SCALE still fits in int64
+_INT64_SAFE = (2 ** 63 - 1) // (2 * SHARE_SCALE)
+
+class ShareBlocks(NamedTuple):
+    """
+    Everything the report derives from one count block.
+
+    totals:        vertical summary of the count block (None when it has no rows)
+    column_shares: second block, each cell over its column total
+    total_shares:  second block summary, each column total over itself
+    row_shares:    third block, each cell over its row total plus the 100% column
+    """
+    totals: List[Optional[int]]
+    column_shares: List[List[Optional[Decimal]]]
+    total_shares: List[Optional[Decimal]]
+    row_shares: List[List[Optional[Decimal]]]
+
+def share_blocks(
+    counts: Sequence[Sequence[int]],
+    width: int,
+    zero_if_null: Iterable[int] = ()
+) -> ShareBlocks:
+    """
+    Compute the summary and percentage blocks from a count matrix with one
+    row per FINAL_STATUS and one column per bucket. Counts are non-negative.
+
+    Every share follows CAST(x * 1.0 / NULLIF(total, 0) AS DECIMAL(10,6)):
+    rounded half away from zero to six places, and None where the total is 0.
+    Columns listed in zero_if_null report 0 instead of None in the second
+    block, as the volume queries did with ISNULL(..., 0).
+    """
+    if not counts:
+        totals = [None] * width
+        return ShareBlocks(totals, [], [None] * width, [])
+
+    matrix = _as_matrix(counts)
+    column_total = matrix.sum(axis=0)
+    row_total = matrix.sum(axis=1, keepdims=True)
+
+    column_shares = _to_decimal(*_millionths(matrix, column_total[np.newaxis, :]))
+    total_shares = _to_decimal(*_millionths(column_total, column_total))
+    row_shares = _to_decimal(*_millionths(matrix, row_total))
+
+    for col in zero_if_null:
+        for row in column_shares:
+            if row[col] is None:
+                row[col] = ZERO_SHARE
+        if total_shares[col] is None:
+            total_shares[col] = ZERO_SHARE
+
+    return ShareBlocks(
+        totals=[int(total) for total in column_total],
+        column_shares=column_shares,
+        total_shares=total_shares,
+        row_shares=[row + [ROW_TOTAL_SHARE] for row in row_shares],
+    )
+
+def _as_matrix(counts: Sequence[Sequence[int]]) -> np.ndarray:
+    """
+    int64 matrix of the counts, or Python ints when the volumes are too large
+    for the fixed-point arithmetic below to stay exact in int64.
+    """
+    matrix = np.array([[int(value) for value in row] for row in counts], dtype=object)
+    if int(matrix.sum()) <= _INT64_SAFE:
+        return matrix.astype(np.int64)
+    return matrix
+
+def _millionths(parts: np.ndarray, wholes: np.ndarray):
+    """
+    parts / wholes in millionths, rounded half up, together with the mask of
+    cells whose whole is zero (the NULLIF case).
+    """
+    parts, wholes = np.broadcast_arrays(parts, wholes)
+    valid = wholes != 0
+    safe_wholes = np.where(valid, wholes, 1)
+    return (2 * parts * SHARE_SCALE + safe_wholes) // (2 * safe_wholes), valid
+
+def _to_decimal(values: np.ndarray, valid: np.ndarray):
+    """
+    Convert millionths back to DECIMAL(10,6)-shaped Decimals, keeping the shape.
+    """
+    def convert(value, ok):
+        return Decimal(int(value)).scaleb(-6).quantize(SHARE_QUANTUM) if ok else None
+
+    if values.ndim == 1:
+        return [convert(value, ok) for value, ok in zip(values.tolist(), valid.tolist())]
+    return [
+        [convert(value, ok) for value, ok in zip(row, row_ok)]
+        for row, row_ok in zip(values.tolist(), valid.tolist())
+    ]
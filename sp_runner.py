@@ -0,0 +1,139 @@
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+from conn import (
+    get_pool, pooled_connection, get_procedure_chunk, get_procedure_workers, get_procedure_retries, get_procedure_staging
+)
+from period_cache import period_start
+from report_specs import DAY, WEEK
+
+PROCEDURE = "EXEC [dbo].[sp_txn_analysis] @START_DT = ?, @END_DT = ?, @YEAR_START = ?, @STAGING = ?"
+STAGINGS = ("temp", "memory")
+
+class Chunk(NamedTuple):
+    """
+    One @START_DT..@END_DT slice of a stored procedure run, as 'YYYY-MM-DD' dates.
+    """
+    start: str
+    end: str
+
+class ChunkResult(NamedTuple):
+    """
+    Outcome of one chunk: whether it committed, how many times it was run,
+    and the last error when it never did.
+    """
+    chunk: Chunk
+    ok: bool
+    attempts: int
+    error: Optional[str] = None
+
+def split_range(start_date: str, end_date: str, grain: str = WEEK) -> List[Chunk]:
+    """
+    Split start_date..end_date into one chunk per day, or per Sunday-start week
+    clipped to the range.
+    """
+    if grain not in (DAY, WEEK):
+        raise ValueError(f"Unknown chunk size {grain!r}, expected {DAY!r} or {WEEK!r}")
+
+    chunks = []
+    first = start_date
+    while first <= end_date:
+        last = first if grain == DAY else min(_shift(period_start(WEEK, first), 6), end_date)
+        chunks.append(Chunk(first, last))
+        first = _shift(last, 1)
+    return chunks
+
+def run_chunk(chunk: Chunk, year_start: str, staging: str = "temp") -> None:
+    """
+    Run the stored procedure for one chunk on a pooled connection and commit it.
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(PROCEDURE, chunk.start, chunk.end, year_start, staging.upper())
+        conn.commit()
+        cursor.close()
+
+def run_procedure(
+    start_date: str,
+    end_date: str,
+    year_start: str,
+    logger: logging.Logger,
+    grain: Optional[str] = None,
+    workers: Optional[int] = None,
+    retries: Optional[int] = None,
+    staging: Optional[str] = None
+) -> List[ChunkResult]:
+    """
+    Run sp_txn_analysis over start_date..end_date in day or week chunks, up to
+    workers chunks at a time on their own pooled connections. Every chunk
+    commits on its own, so a failed chunk is run again alone, up to retries
+    more times, without touching the others. staging picks #temp tables or
+    memory-optimized table variables for the procedure's staged rows. Settings
+    not given are read from the [procedure] section of config.ini.
+    """
+    grain = grain or get_procedure_chunk()
+    workers = min(workers or get_procedure_workers(), get_pool().max_size)
+    retries = get_procedure_retries() if retries is None else retries
+    staging = staging or get_procedure_staging()
+    if staging not in STAGINGS:
+        raise ValueError(f"Unknown staging {staging!r}, expected one of {STAGINGS}")
+    chunks = split_range(start_date, end_date, grain)
+
+    def run(chunk: Chunk) -> ChunkResult:
+        error = None
+        for attempt in range(1, retries + 2):
+            try:
+                run_chunk(chunk, year_start, staging)
+                logger.info(f"Stored procedure done for {chunk.start} to {chunk.end}.")
+                return ChunkResult(chunk, True, attempt)
+            except Exception as e:
+                error = str(e)
+                logger.warning(f"Stored procedure failed for {chunk.start} to {chunk.end} (attempt {attempt}): {e}")
+        return ChunkResult(chunk, False, retries + 1, error)
+
+    if workers <= 1 or len(chunks) <= 1:
+        return [run(chunk) for chunk in chunks]
+
+    logger.info(f"Running {len(chunks)} stored procedure chunks with {workers} workers...")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, chunks))
+
+def failed_chunks(results: List[ChunkResult]) -> List[Chunk]:
+    """
+    Return the chunks of a run that never committed.
+    """
+    return [result.chunk for result in results if not result.ok]
+
+def _shift(date: str, days: int) -> str:
+    return (datetime.strptime(date[:10], "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+if __name__ == "__main__":
+    # Re-run the stored procedure for a range, e.g. a chunk that failed:
+    #   python sp_runner.py START_DATE END_DATE YEAR_START [day|week]
+    if len(sys.argv) not in (4, 5):
+        print("Usage: python sp_runner.py YYYY-MM-DD YYYY-MM-DD YEAR_START [day|week]")
+        sys.exit(1)
+
+    from conn import close_pool
+    from init_log import init_logger
+    from period_cache import get_period_cache
+
+    logger = init_logger(log_dir="logs/txn_analysis", log_name="sp_runner")
+    start_date, end_date, year_start = sys.argv[1:4]
+    try:
+        results = run_procedure(start_date, end_date, year_start, logger, sys.argv[4] if len(sys.argv) == 5 else None)
+    finally:
+        close_pool()
+
+    # Cached periods holding a rewritten date are stale now
+    rewritten = [result.chunk.start for result in results if result.ok]
+    cache = get_period_cache()
+    if cache is not None and rewritten:
+        cache.invalidate(min(rewritten))
+
+    failed = failed_chunks(results)
+    for chunk in failed:
+        logger.error(f"Chunk {chunk.start} to {chunk.end} failed; retry with: python sp_runner.py {chunk.start} {chunk.end} {year_start}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,184 @@
+--Converts the txn_analysis tables created by sql/txn_analysis_ddl.sql in place to
+--the layout of sql/txn_analysis_ddl_compressed.sql. Runs as one transaction: a
+--table with rows the clustered key cannot hold stops it with every table untouched.
+--Run it while no report or stored procedure is running; the rebuilds lock each table.
+--The tables keep their FINAL_STATUS column and key. It is the first step of an
+--upgrade from sql/txn_analysis_ddl.sql, which runs, in order:
+--  1. sql/migrate_txn_analysis_compressed.sql
+--  2. sql/sp_txn_analysis_partitions.sql
+--  3. sql/txn_analysis_partitioning.sql
+--  4. sql/migrate_txn_analysis_status.sql
+--  5. sql/sp_txn_analysis_rollup.sql and sql/sp_sla_report.sql
+--  6. sql/migrate_txn_analysis_rollups.sql
+SET XACT_ABORT ON;
+
+BEGIN TRANSACTION;
+
+--TIME OF DAY TXN COUNT
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_time_of_day_txn_count]
+    GROUP BY TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_time_of_day_txn_count has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_time_of_day_txn_count_date_status ON [dbo].[txn_analysis_time_of_day_txn_count];
+DROP INDEX IF EXISTS idx_txn_analysis_time_of_day_txn_count_date ON [dbo].[txn_analysis_time_of_day_txn_count];
+ALTER TABLE [dbo].[txn_analysis_time_of_day_txn_count] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_time_of_day_txn_count] ADD CONSTRAINT pk_txn_analysis_time_of_day_txn_count PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--SLA
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_sla]
+    GROUP BY TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_sla has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_sla_date_status ON [dbo].[txn_analysis_sla];
+DROP INDEX IF EXISTS idx_txn_analysis_sla_date ON [dbo].[txn_analysis_sla];
+ALTER TABLE [dbo].[txn_analysis_sla] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_sla] ADD CONSTRAINT pk_txn_analysis_sla PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--SLA WO CBI
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_sla_wo_cbi]
+    GROUP BY TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_sla_wo_cbi has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_sla_wo_cbi_date_status ON [dbo].[txn_analysis_sla_wo_cbi];
+DROP INDEX IF EXISTS idx_txn_analysis_sla_wo_cbi_date ON [dbo].[txn_analysis_sla_wo_cbi];
+ALTER TABLE [dbo].[txn_analysis_sla_wo_cbi] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_sla_wo_cbi] ADD CONSTRAINT pk_txn_analysis_sla_wo_cbi PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--SLA WITH CBI
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_sla_with_cbi]
+    GROUP BY TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_sla_with_cbi has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_sla_with_cbi_date_status ON [dbo].[txn_analysis_sla_with_cbi];
+DROP INDEX IF EXISTS idx_txn_analysis_sla_with_cbi_date ON [dbo].[txn_analysis_sla_with_cbi];
+ALTER TABLE [dbo].[txn_analysis_sla_with_cbi] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_sla_with_cbi] ADD CONSTRAINT pk_txn_analysis_sla_with_cbi PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--TRANSACTION AMOUNT
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_transaction_amount]
+    GROUP BY TRANSACTION_DATE, [MONTH], FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_transaction_amount has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_transaction_amount_date_status ON [dbo].[txn_analysis_transaction_amount];
+DROP INDEX IF EXISTS idx_txn_analysis_transaction_amount_date ON [dbo].[txn_analysis_transaction_amount];
+ALTER TABLE [dbo].[txn_analysis_transaction_amount] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_transaction_amount] ADD CONSTRAINT pk_txn_analysis_transaction_amount PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--PAY CASH AMT TXN
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_pay_cash_amt_txn]
+    GROUP BY TRANSACTION_DATE, [MONTH], FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_pay_cash_amt_txn has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_pay_cash_amt_txn_date_status ON [dbo].[txn_analysis_pay_cash_amt_txn];
+DROP INDEX IF EXISTS idx_txn_analysis_pay_cash_amt_txn_date ON [dbo].[txn_analysis_pay_cash_amt_txn];
+ALTER TABLE [dbo].[txn_analysis_pay_cash_amt_txn] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_pay_cash_amt_txn] ADD CONSTRAINT pk_txn_analysis_pay_cash_amt_txn PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--PAY CASH AMT VOL
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_pay_cash_amt_vol]
+    GROUP BY TRANSACTION_DATE, [MONTH], FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_pay_cash_amt_vol has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_pay_cash_amt_vol_date_status ON [dbo].[txn_analysis_pay_cash_amt_vol];
+DROP INDEX IF EXISTS idx_txn_analysis_pay_cash_amt_vol_date ON [dbo].[txn_analysis_pay_cash_amt_vol];
+ALTER TABLE [dbo].[txn_analysis_pay_cash_amt_vol] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_pay_cash_amt_vol] ADD CONSTRAINT pk_txn_analysis_pay_cash_amt_vol PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--TOTAL DENOM CBI TXN
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_total_denom_cbi_txn]
+    GROUP BY TRANSACTION_DATE, [MONTH], FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_total_denom_cbi_txn has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_total_denom_cbi_txn_date_status ON [dbo].[txn_analysis_total_denom_cbi_txn];
+DROP INDEX IF EXISTS idx_txn_analysis_total_denom_cbi_txn_date ON [dbo].[txn_analysis_total_denom_cbi_txn];
+ALTER TABLE [dbo].[txn_analysis_total_denom_cbi_txn] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_total_denom_cbi_txn] ADD CONSTRAINT pk_txn_analysis_total_denom_cbi_txn PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--TOTAL DENOM CBI VOL
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_total_denom_cbi_vol]
+    GROUP BY TRANSACTION_DATE, [MONTH], FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_total_denom_cbi_vol has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_total_denom_cbi_vol_date_status ON [dbo].[txn_analysis_total_denom_cbi_vol];
+DROP INDEX IF EXISTS idx_txn_analysis_total_denom_cbi_vol_date ON [dbo].[txn_analysis_total_denom_cbi_vol];
+ALTER TABLE [dbo].[txn_analysis_total_denom_cbi_vol] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_total_denom_cbi_vol] ADD CONSTRAINT pk_txn_analysis_total_denom_cbi_vol PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--TOTAL PER CASH BILL CBI TXN
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn]
+    GROUP BY TRANSACTION_DATE, [MONTH], FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_total_per_cash_bill_cbi_txn has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_total_per_cash_bill_cbi_txn_date_status ON [dbo].[txn_analysis_total_per_cash_bill_cbi_txn];
+DROP INDEX IF EXISTS idx_txn_analysis_total_per_cash_bill_cbi_txn_date ON [dbo].[txn_analysis_total_per_cash_bill_cbi_txn];
+ALTER TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] ADD CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--TOTAL PER CASH BILL CBI VOL
+IF EXISTS (
+    SELECT 1 FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol]
+    GROUP BY TRANSACTION_DATE, [MONTH], FINAL_STATUS
+    HAVING COUNT(*) > 1 OR TRANSACTION_DATE IS NULL
+)
+    THROW 50000, 'txn_analysis_total_per_cash_bill_cbi_vol has undated or duplicate rows; rerun sp_txn_analysis for their dates first.', 1;
+
+DROP INDEX IF EXISTS idx_txn_analysis_total_per_cash_bill_cbi_vol_date_status ON [dbo].[txn_analysis_total_per_cash_bill_cbi_vol];
+DROP INDEX IF EXISTS idx_txn_analysis_total_per_cash_bill_cbi_vol_date ON [dbo].[txn_analysis_total_per_cash_bill_cbi_vol];
+ALTER TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] ALTER COLUMN TRANSACTION_DATE DATE NOT NULL;
+ALTER TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] ADD CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], FINAL_STATUS)
+WITH (DATA_COMPRESSION = PAGE);
+
+--WEEK AND MONTH ROLLUPS
+ALTER INDEX pk_txn_analysis_time_of_day_txn_count_week ON [dbo].[txn_analysis_time_of_day_txn_count_week] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_sla_week ON [dbo].[txn_analysis_sla_week] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_sla_wo_cbi_week ON [dbo].[txn_analysis_sla_wo_cbi_week] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_sla_with_cbi_week ON [dbo].[txn_analysis_sla_with_cbi_week] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_transaction_amount_month ON [dbo].[txn_analysis_transaction_amount_month] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_pay_cash_amt_txn_month ON [dbo].[txn_analysis_pay_cash_amt_txn_month] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_pay_cash_amt_vol_month ON [dbo].[txn_analysis_pay_cash_amt_vol_month] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_total_denom_cbi_txn_month ON [dbo].[txn_analysis_total_denom_cbi_txn_month] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_total_denom_cbi_vol_month ON [dbo].[txn_analysis_total_denom_cbi_vol_month] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_total_per_cash_bill_cbi_txn_month ON [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month] REBUILD WITH (DATA_COMPRESSION = PAGE);
+ALTER INDEX pk_txn_analysis_total_per_cash_bill_cbi_vol_month ON [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month] REBUILD WITH (DATA_COMPRESSION = PAGE);
+
+COMMIT TRANSACTION;
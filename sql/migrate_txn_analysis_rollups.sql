@@ -0,0 +1,215 @@
+--Fills the week and month rollups of an install that loaded days before
+--sp_txn_analysis_rollup existed; until it runs, the report finds no rows for the
+--closed weeks and months of that history. Creates any rollup table the install
+--does not have yet, then regroups every loaded date. Running it again only rebuilds
+--the same rows. It is the last step of an upgrade from sql/txn_analysis_ddl.sql,
+--which runs, in order:
+--  1. sql/migrate_txn_analysis_compressed.sql
+--  2. sql/sp_txn_analysis_partitions.sql
+--  3. sql/txn_analysis_partitioning.sql
+--  4. sql/migrate_txn_analysis_status.sql
+--  5. sql/sp_txn_analysis_rollup.sql and sql/sp_sla_report.sql
+--  6. sql/migrate_txn_analysis_rollups.sql
+SET XACT_ABORT ON;
+
+IF OBJECT_ID(N'dbo.txn_analysis_time_of_day_txn_count_week', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count_week] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [0-8] INT NOT NULL DEFAULT 0,
+        [9-12] INT NOT NULL DEFAULT 0,
+        [13-16] INT NOT NULL DEFAULT 0,
+        [17-20] INT NOT NULL DEFAULT 0,
+        [21-23] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_time_of_day_txn_count_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_sla_week', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_sla_week] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [SLA-<0] INT NOT NULL DEFAULT 0,
+        [SLA-=0] INT NOT NULL DEFAULT 0,
+        [SLA-1TO30] INT NOT NULL DEFAULT 0,
+        [SLA-31TO60] INT NOT NULL DEFAULT 0,
+        [SLA-61TO90] INT NOT NULL DEFAULT 0,
+        [SLA-91TO120] INT NOT NULL DEFAULT 0,
+        [SLA-121TO150] INT NOT NULL DEFAULT 0,
+        [SLA->150] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_sla_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_sla_wo_cbi_week', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_sla_wo_cbi_week] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [SLA-<0] INT NOT NULL DEFAULT 0,
+        [SLA-=0] INT NOT NULL DEFAULT 0,
+        [SLA-1TO30] INT NOT NULL DEFAULT 0,
+        [SLA-31TO60] INT NOT NULL DEFAULT 0,
+        [SLA-61TO90] INT NOT NULL DEFAULT 0,
+        [SLA-91TO120] INT NOT NULL DEFAULT 0,
+        [SLA-121TO150] INT NOT NULL DEFAULT 0,
+        [SLA->150] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_sla_wo_cbi_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_sla_with_cbi_week', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_sla_with_cbi_week] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [SLA-<0] INT NOT NULL DEFAULT 0,
+        [SLA-=0] INT NOT NULL DEFAULT 0,
+        [SLA-1TO30] INT NOT NULL DEFAULT 0,
+        [SLA-31TO60] INT NOT NULL DEFAULT 0,
+        [SLA-61TO90] INT NOT NULL DEFAULT 0,
+        [SLA-91TO120] INT NOT NULL DEFAULT 0,
+        [SLA-121TO150] INT NOT NULL DEFAULT 0,
+        [SLA->150] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_sla_with_cbi_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_transaction_amount_month', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_transaction_amount_month] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [< 500] INT NOT NULL DEFAULT 0,
+        [500 TO 999] INT NOT NULL DEFAULT 0,
+        [1000 TO 2999] INT NOT NULL DEFAULT 0,
+        [3000 TO 4999] INT NOT NULL DEFAULT 0,
+        [>= 5000] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_transaction_amount_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_pay_cash_amt_txn_month', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn_month] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [PAY_CASH=0] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=1TO499] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=500T999] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=1000TO2999] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=3000TO4999] INT NOT NULL DEFAULT 0,
+        [PAY_CASH>=5000] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_pay_cash_amt_txn_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_pay_cash_amt_vol_month', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol_month] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [PAY_CASH=0] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=1TO499] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=500T999] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH>=5000] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_pay_cash_amt_vol_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_total_denom_cbi_txn_month', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn_month] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [DENOMINATION=0] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=1TO499] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=500T999] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=1000TO2999] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=3000TO4999] INT NOT NULL DEFAULT 0,
+        [DENOMINATION>=5000] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_denom_cbi_txn_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_total_denom_cbi_vol_month', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol_month] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [DENOMINATION=0] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=1TO499] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=500T999] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION>=5000] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_denom_cbi_vol_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_total_per_cash_bill_cbi_txn_month', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+IF OBJECT_ID(N'dbo.txn_analysis_total_per_cash_bill_cbi_vol_month', N'U') IS NULL
+    CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+--LOADED DATES
+DECLARE @START_DT DATE;
+DECLARE @END_DT DATE;
+
+SELECT @START_DT = MIN(FIRST_DATE), @END_DT = MAX(LAST_DATE)
+FROM (
+    SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_time_of_day_txn_count]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_sla]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_sla_wo_cbi]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_sla_with_cbi]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_transaction_amount]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_pay_cash_amt_txn]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_pay_cash_amt_vol]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_total_denom_cbi_txn]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_total_denom_cbi_vol]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn]
+    UNION ALL SELECT MIN(TRANSACTION_DATE), MAX(TRANSACTION_DATE) FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol]
+) D (FIRST_DATE, LAST_DATE);
+
+IF @START_DT IS NOT NULL
+    EXEC [dbo].[sp_txn_analysis_rollup] @START_DT = @START_DT, @END_DT = @END_DT;
@@ -0,0 +1,768 @@
+--Moves an install made before txn_analysis_status existed, with FINAL_STATUS
+--strings in every reporting table and the layout of sql/txn_analysis_partitioning.sql,
+--to STATUS_ID keys. Every table is copied into its new shape and renamed over the
+--old one; the empty _stage tables are recreated. Week and month rollups the install
+--does not have yet are skipped. Runs as one transaction. It is step 4 of an upgrade
+--from sql/txn_analysis_ddl.sql, which runs, in order:
+--  1. sql/migrate_txn_analysis_compressed.sql
+--  2. sql/sp_txn_analysis_partitions.sql
+--  3. sql/txn_analysis_partitioning.sql
+--  4. sql/migrate_txn_analysis_status.sql
+--  5. sql/sp_txn_analysis_rollup.sql and sql/sp_sla_report.sql
+--  6. sql/migrate_txn_analysis_rollups.sql
+SET XACT_ABORT ON;
+
+BEGIN TRANSACTION;
+
+CREATE TABLE [dbo].[txn_analysis_status] (
+    STATUS_ID    TINYINT IDENTITY(1,1) NOT NULL,
+    FINAL_STATUS VARCHAR(50) NOT NULL,
+    CONSTRAINT pk_txn_analysis_status PRIMARY KEY CLUSTERED (STATUS_ID),
+    CONSTRAINT uq_txn_analysis_status_final_status UNIQUE (FINAL_STATUS)
+);
+
+--Keys are handed out in label order
+INSERT INTO [dbo].[txn_analysis_status] (FINAL_STATUS)
+SELECT FINAL_STATUS FROM (
+    SELECT FINAL_STATUS FROM [dbo].[txn_analysis_time_of_day_txn_count]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_sla]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_sla_wo_cbi]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_sla_with_cbi]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_transaction_amount]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_pay_cash_amt_txn]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_pay_cash_amt_vol]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_total_denom_cbi_txn]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_total_denom_cbi_vol]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn]
+    UNION SELECT FINAL_STATUS FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol]
+) A
+ORDER BY FINAL_STATUS;
+
+--TIME OF DAY TXN COUNT
+CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [0-8]        INT NOT NULL DEFAULT 0,
+    [9-12]       INT NOT NULL DEFAULT 0,
+    [13-16]      INT NOT NULL DEFAULT 0,
+    [17-20]      INT NOT NULL DEFAULT 0,
+    [21-23]      INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_time_of_day_txn_count_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_time_of_day_txn_count_new] (TRANSACTION_DATE, WEEK_NUM, STATUS_ID, [0-8], [9-12], [13-16], [17-20], [21-23])
+SELECT T.TRANSACTION_DATE, T.WEEK_NUM, S.STATUS_ID, T.[0-8], T.[9-12], T.[13-16], T.[17-20], T.[21-23]
+FROM [dbo].[txn_analysis_time_of_day_txn_count] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_time_of_day_txn_count];
+EXEC sp_rename N'dbo.txn_analysis_time_of_day_txn_count_new', N'txn_analysis_time_of_day_txn_count';
+EXEC sp_rename N'dbo.pk_txn_analysis_time_of_day_txn_count_new', N'pk_txn_analysis_time_of_day_txn_count', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_time_of_day_txn_count_stage];
+CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [0-8]        INT NOT NULL DEFAULT 0,
+    [9-12]       INT NOT NULL DEFAULT 0,
+    [13-16]      INT NOT NULL DEFAULT 0,
+    [17-20]      INT NOT NULL DEFAULT 0,
+    [21-23]      INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_time_of_day_txn_count_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--SLA
+CREATE TABLE [dbo].[txn_analysis_sla_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_sla_new] (TRANSACTION_DATE, WEEK_NUM, STATUS_ID, [SLA-<0], [SLA-=0], [SLA-1TO30], [SLA-31TO60], [SLA-61TO90], [SLA-91TO120], [SLA-121TO150], [SLA->150])
+SELECT T.TRANSACTION_DATE, T.WEEK_NUM, S.STATUS_ID, T.[SLA-<0], T.[SLA-=0], T.[SLA-1TO30], T.[SLA-31TO60], T.[SLA-61TO90], T.[SLA-91TO120], T.[SLA-121TO150], T.[SLA->150]
+FROM [dbo].[txn_analysis_sla] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_sla];
+EXEC sp_rename N'dbo.txn_analysis_sla_new', N'txn_analysis_sla';
+EXEC sp_rename N'dbo.pk_txn_analysis_sla_new', N'pk_txn_analysis_sla', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_sla_stage];
+CREATE TABLE [dbo].[txn_analysis_sla_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--SLA WO CBI
+CREATE TABLE [dbo].[txn_analysis_sla_wo_cbi_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_wo_cbi_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_sla_wo_cbi_new] (TRANSACTION_DATE, WEEK_NUM, STATUS_ID, [SLA-<0], [SLA-=0], [SLA-1TO30], [SLA-31TO60], [SLA-61TO90], [SLA-91TO120], [SLA-121TO150], [SLA->150])
+SELECT T.TRANSACTION_DATE, T.WEEK_NUM, S.STATUS_ID, T.[SLA-<0], T.[SLA-=0], T.[SLA-1TO30], T.[SLA-31TO60], T.[SLA-61TO90], T.[SLA-91TO120], T.[SLA-121TO150], T.[SLA->150]
+FROM [dbo].[txn_analysis_sla_wo_cbi] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_sla_wo_cbi];
+EXEC sp_rename N'dbo.txn_analysis_sla_wo_cbi_new', N'txn_analysis_sla_wo_cbi';
+EXEC sp_rename N'dbo.pk_txn_analysis_sla_wo_cbi_new', N'pk_txn_analysis_sla_wo_cbi', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_sla_wo_cbi_stage];
+CREATE TABLE [dbo].[txn_analysis_sla_wo_cbi_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_wo_cbi_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--SLA WITH CBI
+CREATE TABLE [dbo].[txn_analysis_sla_with_cbi_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_with_cbi_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_sla_with_cbi_new] (TRANSACTION_DATE, WEEK_NUM, STATUS_ID, [SLA-<0], [SLA-=0], [SLA-1TO30], [SLA-31TO60], [SLA-61TO90], [SLA-91TO120], [SLA-121TO150], [SLA->150])
+SELECT T.TRANSACTION_DATE, T.WEEK_NUM, S.STATUS_ID, T.[SLA-<0], T.[SLA-=0], T.[SLA-1TO30], T.[SLA-31TO60], T.[SLA-61TO90], T.[SLA-91TO120], T.[SLA-121TO150], T.[SLA->150]
+FROM [dbo].[txn_analysis_sla_with_cbi] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_sla_with_cbi];
+EXEC sp_rename N'dbo.txn_analysis_sla_with_cbi_new', N'txn_analysis_sla_with_cbi';
+EXEC sp_rename N'dbo.pk_txn_analysis_sla_with_cbi_new', N'pk_txn_analysis_sla_with_cbi', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_sla_with_cbi_stage];
+CREATE TABLE [dbo].[txn_analysis_sla_with_cbi_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_with_cbi_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TRANSACTION AMOUNT
+CREATE TABLE [dbo].[txn_analysis_transaction_amount_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [< 500] INT NOT NULL DEFAULT 0,
+    [500 TO 999] INT NOT NULL DEFAULT 0,
+    [1000 TO 2999] INT NOT NULL DEFAULT 0,
+    [3000 TO 4999] INT NOT NULL DEFAULT 0,
+    [>= 5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_transaction_amount_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_transaction_amount_new] (TRANSACTION_DATE, [MONTH], STATUS_ID, [< 500], [500 TO 999], [1000 TO 2999], [3000 TO 4999], [>= 5000])
+SELECT T.TRANSACTION_DATE, T.[MONTH], S.STATUS_ID, T.[< 500], T.[500 TO 999], T.[1000 TO 2999], T.[3000 TO 4999], T.[>= 5000]
+FROM [dbo].[txn_analysis_transaction_amount] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_transaction_amount];
+EXEC sp_rename N'dbo.txn_analysis_transaction_amount_new', N'txn_analysis_transaction_amount';
+EXEC sp_rename N'dbo.pk_txn_analysis_transaction_amount_new', N'pk_txn_analysis_transaction_amount', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_transaction_amount_stage];
+CREATE TABLE [dbo].[txn_analysis_transaction_amount_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [< 500] INT NOT NULL DEFAULT 0,
+    [500 TO 999] INT NOT NULL DEFAULT 0,
+    [1000 TO 2999] INT NOT NULL DEFAULT 0,
+    [3000 TO 4999] INT NOT NULL DEFAULT 0,
+    [>= 5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_transaction_amount_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--PAY CASH AMT TXN
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [PAY_CASH=0] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] INT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_txn_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_txn_new] (TRANSACTION_DATE, [MONTH], STATUS_ID, [PAY_CASH=0], [PAY_CASH=1TO499], [PAY_CASH=500T999], [PAY_CASH=1000TO2999], [PAY_CASH=3000TO4999], [PAY_CASH>=5000])
+SELECT T.TRANSACTION_DATE, T.[MONTH], S.STATUS_ID, T.[PAY_CASH=0], T.[PAY_CASH=1TO499], T.[PAY_CASH=500T999], T.[PAY_CASH=1000TO2999], T.[PAY_CASH=3000TO4999], T.[PAY_CASH>=5000]
+FROM [dbo].[txn_analysis_pay_cash_amt_txn] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_pay_cash_amt_txn];
+EXEC sp_rename N'dbo.txn_analysis_pay_cash_amt_txn_new', N'txn_analysis_pay_cash_amt_txn';
+EXEC sp_rename N'dbo.pk_txn_analysis_pay_cash_amt_txn_new', N'pk_txn_analysis_pay_cash_amt_txn', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_pay_cash_amt_txn_stage];
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [PAY_CASH=0] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] INT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_txn_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--PAY CASH AMT VOL
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [PAY_CASH=0] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_vol_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_vol_new] (TRANSACTION_DATE, [MONTH], STATUS_ID, [PAY_CASH=0], [PAY_CASH=1TO499], [PAY_CASH=500T999], [PAY_CASH=1000TO2999], [PAY_CASH=3000TO4999], [PAY_CASH>=5000])
+SELECT T.TRANSACTION_DATE, T.[MONTH], S.STATUS_ID, T.[PAY_CASH=0], T.[PAY_CASH=1TO499], T.[PAY_CASH=500T999], T.[PAY_CASH=1000TO2999], T.[PAY_CASH=3000TO4999], T.[PAY_CASH>=5000]
+FROM [dbo].[txn_analysis_pay_cash_amt_vol] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_pay_cash_amt_vol];
+EXEC sp_rename N'dbo.txn_analysis_pay_cash_amt_vol_new', N'txn_analysis_pay_cash_amt_vol';
+EXEC sp_rename N'dbo.pk_txn_analysis_pay_cash_amt_vol_new', N'pk_txn_analysis_pay_cash_amt_vol', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_pay_cash_amt_vol_stage];
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [PAY_CASH=0] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_vol_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL DENOM CBI TXN
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [DENOMINATION=0] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] INT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_txn_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_txn_new] (TRANSACTION_DATE, [MONTH], STATUS_ID, [DENOMINATION=0], [DENOMINATION=1TO499], [DENOMINATION=500T999], [DENOMINATION=1000TO2999], [DENOMINATION=3000TO4999], [DENOMINATION>=5000])
+SELECT T.TRANSACTION_DATE, T.[MONTH], S.STATUS_ID, T.[DENOMINATION=0], T.[DENOMINATION=1TO499], T.[DENOMINATION=500T999], T.[DENOMINATION=1000TO2999], T.[DENOMINATION=3000TO4999], T.[DENOMINATION>=5000]
+FROM [dbo].[txn_analysis_total_denom_cbi_txn] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_total_denom_cbi_txn];
+EXEC sp_rename N'dbo.txn_analysis_total_denom_cbi_txn_new', N'txn_analysis_total_denom_cbi_txn';
+EXEC sp_rename N'dbo.pk_txn_analysis_total_denom_cbi_txn_new', N'pk_txn_analysis_total_denom_cbi_txn', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_total_denom_cbi_txn_stage];
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [DENOMINATION=0] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] INT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_txn_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL DENOM CBI VOL
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [DENOMINATION=0] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_vol_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_vol_new] (TRANSACTION_DATE, [MONTH], STATUS_ID, [DENOMINATION=0], [DENOMINATION=1TO499], [DENOMINATION=500T999], [DENOMINATION=1000TO2999], [DENOMINATION=3000TO4999], [DENOMINATION>=5000])
+SELECT T.TRANSACTION_DATE, T.[MONTH], S.STATUS_ID, T.[DENOMINATION=0], T.[DENOMINATION=1TO499], T.[DENOMINATION=500T999], T.[DENOMINATION=1000TO2999], T.[DENOMINATION=3000TO4999], T.[DENOMINATION>=5000]
+FROM [dbo].[txn_analysis_total_denom_cbi_vol] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_total_denom_cbi_vol];
+EXEC sp_rename N'dbo.txn_analysis_total_denom_cbi_vol_new', N'txn_analysis_total_denom_cbi_vol';
+EXEC sp_rename N'dbo.pk_txn_analysis_total_denom_cbi_vol_new', N'pk_txn_analysis_total_denom_cbi_vol', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_total_denom_cbi_vol_stage];
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [DENOMINATION=0] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_vol_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL PER CASH BILL CBI TXN
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_new] (TRANSACTION_DATE, [MONTH], STATUS_ID, [P20_DENOM], [P50_DENOM], [P100_DENOM], [P200_DENOM], [P500_DENOM], [P1000_DENOM])
+SELECT T.TRANSACTION_DATE, T.[MONTH], S.STATUS_ID, T.[P20_DENOM], T.[P50_DENOM], T.[P100_DENOM], T.[P200_DENOM], T.[P500_DENOM], T.[P1000_DENOM]
+FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn];
+EXEC sp_rename N'dbo.txn_analysis_total_per_cash_bill_cbi_txn_new', N'txn_analysis_total_per_cash_bill_cbi_txn';
+EXEC sp_rename N'dbo.pk_txn_analysis_total_per_cash_bill_cbi_txn_new', N'pk_txn_analysis_total_per_cash_bill_cbi_txn', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_stage];
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL PER CASH BILL CBI VOL
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_new] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol_new PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_new] (TRANSACTION_DATE, [MONTH], STATUS_ID, [P20_DENOM], [P50_DENOM], [P100_DENOM], [P200_DENOM], [P500_DENOM], [P1000_DENOM])
+SELECT T.TRANSACTION_DATE, T.[MONTH], S.STATUS_ID, T.[P20_DENOM], T.[P50_DENOM], T.[P100_DENOM], T.[P200_DENOM], T.[P500_DENOM], T.[P1000_DENOM]
+FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] T
+INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+DROP TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol];
+EXEC sp_rename N'dbo.txn_analysis_total_per_cash_bill_cbi_vol_new', N'txn_analysis_total_per_cash_bill_cbi_vol';
+EXEC sp_rename N'dbo.pk_txn_analysis_total_per_cash_bill_cbi_vol_new', N'pk_txn_analysis_total_per_cash_bill_cbi_vol', N'OBJECT';
+
+DROP TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_stage];
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TIME OF DAY TXN COUNT WEEK
+IF OBJECT_ID(N'dbo.txn_analysis_time_of_day_txn_count_week', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count_week_new] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [0-8] INT NOT NULL DEFAULT 0,
+        [9-12] INT NOT NULL DEFAULT 0,
+        [13-16] INT NOT NULL DEFAULT 0,
+        [17-20] INT NOT NULL DEFAULT 0,
+        [21-23] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_time_of_day_txn_count_week_new PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_time_of_day_txn_count_week_new] (WEEK_START, WEEK_NUM, STATUS_ID, FIRST_DATE, LAST_DATE, [0-8], [9-12], [13-16], [17-20], [21-23])
+    SELECT T.WEEK_START, T.WEEK_NUM, S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[0-8], T.[9-12], T.[13-16], T.[17-20], T.[21-23]
+    FROM [dbo].[txn_analysis_time_of_day_txn_count_week] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_time_of_day_txn_count_week];
+    EXEC sp_rename N'dbo.txn_analysis_time_of_day_txn_count_week_new', N'txn_analysis_time_of_day_txn_count_week';
+    EXEC sp_rename N'dbo.pk_txn_analysis_time_of_day_txn_count_week_new', N'pk_txn_analysis_time_of_day_txn_count_week', N'OBJECT';
+END
+
+--SLA WEEK
+IF OBJECT_ID(N'dbo.txn_analysis_sla_week', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_sla_week_new] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [SLA-<0] INT NOT NULL DEFAULT 0,
+        [SLA-=0] INT NOT NULL DEFAULT 0,
+        [SLA-1TO30] INT NOT NULL DEFAULT 0,
+        [SLA-31TO60] INT NOT NULL DEFAULT 0,
+        [SLA-61TO90] INT NOT NULL DEFAULT 0,
+        [SLA-91TO120] INT NOT NULL DEFAULT 0,
+        [SLA-121TO150] INT NOT NULL DEFAULT 0,
+        [SLA->150] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_sla_week_new PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_sla_week_new] (WEEK_START, WEEK_NUM, STATUS_ID, FIRST_DATE, LAST_DATE, [SLA-<0], [SLA-=0], [SLA-1TO30], [SLA-31TO60], [SLA-61TO90], [SLA-91TO120], [SLA-121TO150], [SLA->150])
+    SELECT T.WEEK_START, T.WEEK_NUM, S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[SLA-<0], T.[SLA-=0], T.[SLA-1TO30], T.[SLA-31TO60], T.[SLA-61TO90], T.[SLA-91TO120], T.[SLA-121TO150], T.[SLA->150]
+    FROM [dbo].[txn_analysis_sla_week] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_sla_week];
+    EXEC sp_rename N'dbo.txn_analysis_sla_week_new', N'txn_analysis_sla_week';
+    EXEC sp_rename N'dbo.pk_txn_analysis_sla_week_new', N'pk_txn_analysis_sla_week', N'OBJECT';
+END
+
+--SLA WO CBI WEEK
+IF OBJECT_ID(N'dbo.txn_analysis_sla_wo_cbi_week', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_sla_wo_cbi_week_new] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [SLA-<0] INT NOT NULL DEFAULT 0,
+        [SLA-=0] INT NOT NULL DEFAULT 0,
+        [SLA-1TO30] INT NOT NULL DEFAULT 0,
+        [SLA-31TO60] INT NOT NULL DEFAULT 0,
+        [SLA-61TO90] INT NOT NULL DEFAULT 0,
+        [SLA-91TO120] INT NOT NULL DEFAULT 0,
+        [SLA-121TO150] INT NOT NULL DEFAULT 0,
+        [SLA->150] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_sla_wo_cbi_week_new PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_sla_wo_cbi_week_new] (WEEK_START, WEEK_NUM, STATUS_ID, FIRST_DATE, LAST_DATE, [SLA-<0], [SLA-=0], [SLA-1TO30], [SLA-31TO60], [SLA-61TO90], [SLA-91TO120], [SLA-121TO150], [SLA->150])
+    SELECT T.WEEK_START, T.WEEK_NUM, S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[SLA-<0], T.[SLA-=0], T.[SLA-1TO30], T.[SLA-31TO60], T.[SLA-61TO90], T.[SLA-91TO120], T.[SLA-121TO150], T.[SLA->150]
+    FROM [dbo].[txn_analysis_sla_wo_cbi_week] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_sla_wo_cbi_week];
+    EXEC sp_rename N'dbo.txn_analysis_sla_wo_cbi_week_new', N'txn_analysis_sla_wo_cbi_week';
+    EXEC sp_rename N'dbo.pk_txn_analysis_sla_wo_cbi_week_new', N'pk_txn_analysis_sla_wo_cbi_week', N'OBJECT';
+END
+
+--SLA WITH CBI WEEK
+IF OBJECT_ID(N'dbo.txn_analysis_sla_with_cbi_week', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_sla_with_cbi_week_new] (
+        WEEK_START   DATE NOT NULL,
+        WEEK_NUM     INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [SLA-<0] INT NOT NULL DEFAULT 0,
+        [SLA-=0] INT NOT NULL DEFAULT 0,
+        [SLA-1TO30] INT NOT NULL DEFAULT 0,
+        [SLA-31TO60] INT NOT NULL DEFAULT 0,
+        [SLA-61TO90] INT NOT NULL DEFAULT 0,
+        [SLA-91TO120] INT NOT NULL DEFAULT 0,
+        [SLA-121TO150] INT NOT NULL DEFAULT 0,
+        [SLA->150] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_sla_with_cbi_week_new PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_sla_with_cbi_week_new] (WEEK_START, WEEK_NUM, STATUS_ID, FIRST_DATE, LAST_DATE, [SLA-<0], [SLA-=0], [SLA-1TO30], [SLA-31TO60], [SLA-61TO90], [SLA-91TO120], [SLA-121TO150], [SLA->150])
+    SELECT T.WEEK_START, T.WEEK_NUM, S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[SLA-<0], T.[SLA-=0], T.[SLA-1TO30], T.[SLA-31TO60], T.[SLA-61TO90], T.[SLA-91TO120], T.[SLA-121TO150], T.[SLA->150]
+    FROM [dbo].[txn_analysis_sla_with_cbi_week] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_sla_with_cbi_week];
+    EXEC sp_rename N'dbo.txn_analysis_sla_with_cbi_week_new', N'txn_analysis_sla_with_cbi_week';
+    EXEC sp_rename N'dbo.pk_txn_analysis_sla_with_cbi_week_new', N'pk_txn_analysis_sla_with_cbi_week', N'OBJECT';
+END
+
+--TRANSACTION AMOUNT MONTH
+IF OBJECT_ID(N'dbo.txn_analysis_transaction_amount_month', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_transaction_amount_month_new] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [< 500] INT NOT NULL DEFAULT 0,
+        [500 TO 999] INT NOT NULL DEFAULT 0,
+        [1000 TO 2999] INT NOT NULL DEFAULT 0,
+        [3000 TO 4999] INT NOT NULL DEFAULT 0,
+        [>= 5000] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_transaction_amount_month_new PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_transaction_amount_month_new] (MONTH_START, [MONTH], STATUS_ID, FIRST_DATE, LAST_DATE, [< 500], [500 TO 999], [1000 TO 2999], [3000 TO 4999], [>= 5000])
+    SELECT T.MONTH_START, T.[MONTH], S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[< 500], T.[500 TO 999], T.[1000 TO 2999], T.[3000 TO 4999], T.[>= 5000]
+    FROM [dbo].[txn_analysis_transaction_amount_month] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_transaction_amount_month];
+    EXEC sp_rename N'dbo.txn_analysis_transaction_amount_month_new', N'txn_analysis_transaction_amount_month';
+    EXEC sp_rename N'dbo.pk_txn_analysis_transaction_amount_month_new', N'pk_txn_analysis_transaction_amount_month', N'OBJECT';
+END
+
+--PAY CASH AMT TXN MONTH
+IF OBJECT_ID(N'dbo.txn_analysis_pay_cash_amt_txn_month', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn_month_new] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [PAY_CASH=0] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=1TO499] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=500T999] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=1000TO2999] INT NOT NULL DEFAULT 0,
+        [PAY_CASH=3000TO4999] INT NOT NULL DEFAULT 0,
+        [PAY_CASH>=5000] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_pay_cash_amt_txn_month_new PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_pay_cash_amt_txn_month_new] (MONTH_START, [MONTH], STATUS_ID, FIRST_DATE, LAST_DATE, [PAY_CASH=0], [PAY_CASH=1TO499], [PAY_CASH=500T999], [PAY_CASH=1000TO2999], [PAY_CASH=3000TO4999], [PAY_CASH>=5000])
+    SELECT T.MONTH_START, T.[MONTH], S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[PAY_CASH=0], T.[PAY_CASH=1TO499], T.[PAY_CASH=500T999], T.[PAY_CASH=1000TO2999], T.[PAY_CASH=3000TO4999], T.[PAY_CASH>=5000]
+    FROM [dbo].[txn_analysis_pay_cash_amt_txn_month] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_pay_cash_amt_txn_month];
+    EXEC sp_rename N'dbo.txn_analysis_pay_cash_amt_txn_month_new', N'txn_analysis_pay_cash_amt_txn_month';
+    EXEC sp_rename N'dbo.pk_txn_analysis_pay_cash_amt_txn_month_new', N'pk_txn_analysis_pay_cash_amt_txn_month', N'OBJECT';
+END
+
+--PAY CASH AMT VOL MONTH
+IF OBJECT_ID(N'dbo.txn_analysis_pay_cash_amt_vol_month', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol_month_new] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [PAY_CASH=0] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=1TO499] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=500T999] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+        [PAY_CASH>=5000] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_pay_cash_amt_vol_month_new PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_pay_cash_amt_vol_month_new] (MONTH_START, [MONTH], STATUS_ID, FIRST_DATE, LAST_DATE, [PAY_CASH=0], [PAY_CASH=1TO499], [PAY_CASH=500T999], [PAY_CASH=1000TO2999], [PAY_CASH=3000TO4999], [PAY_CASH>=5000])
+    SELECT T.MONTH_START, T.[MONTH], S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[PAY_CASH=0], T.[PAY_CASH=1TO499], T.[PAY_CASH=500T999], T.[PAY_CASH=1000TO2999], T.[PAY_CASH=3000TO4999], T.[PAY_CASH>=5000]
+    FROM [dbo].[txn_analysis_pay_cash_amt_vol_month] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_pay_cash_amt_vol_month];
+    EXEC sp_rename N'dbo.txn_analysis_pay_cash_amt_vol_month_new', N'txn_analysis_pay_cash_amt_vol_month';
+    EXEC sp_rename N'dbo.pk_txn_analysis_pay_cash_amt_vol_month_new', N'pk_txn_analysis_pay_cash_amt_vol_month', N'OBJECT';
+END
+
+--TOTAL DENOM CBI TXN MONTH
+IF OBJECT_ID(N'dbo.txn_analysis_total_denom_cbi_txn_month', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn_month_new] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [DENOMINATION=0] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=1TO499] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=500T999] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=1000TO2999] INT NOT NULL DEFAULT 0,
+        [DENOMINATION=3000TO4999] INT NOT NULL DEFAULT 0,
+        [DENOMINATION>=5000] INT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_denom_cbi_txn_month_new PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_total_denom_cbi_txn_month_new] (MONTH_START, [MONTH], STATUS_ID, FIRST_DATE, LAST_DATE, [DENOMINATION=0], [DENOMINATION=1TO499], [DENOMINATION=500T999], [DENOMINATION=1000TO2999], [DENOMINATION=3000TO4999], [DENOMINATION>=5000])
+    SELECT T.MONTH_START, T.[MONTH], S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[DENOMINATION=0], T.[DENOMINATION=1TO499], T.[DENOMINATION=500T999], T.[DENOMINATION=1000TO2999], T.[DENOMINATION=3000TO4999], T.[DENOMINATION>=5000]
+    FROM [dbo].[txn_analysis_total_denom_cbi_txn_month] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_total_denom_cbi_txn_month];
+    EXEC sp_rename N'dbo.txn_analysis_total_denom_cbi_txn_month_new', N'txn_analysis_total_denom_cbi_txn_month';
+    EXEC sp_rename N'dbo.pk_txn_analysis_total_denom_cbi_txn_month_new', N'pk_txn_analysis_total_denom_cbi_txn_month', N'OBJECT';
+END
+
+--TOTAL DENOM CBI VOL MONTH
+IF OBJECT_ID(N'dbo.txn_analysis_total_denom_cbi_vol_month', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol_month_new] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [DENOMINATION=0] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=1TO499] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=500T999] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+        [DENOMINATION>=5000] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_denom_cbi_vol_month_new PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_total_denom_cbi_vol_month_new] (MONTH_START, [MONTH], STATUS_ID, FIRST_DATE, LAST_DATE, [DENOMINATION=0], [DENOMINATION=1TO499], [DENOMINATION=500T999], [DENOMINATION=1000TO2999], [DENOMINATION=3000TO4999], [DENOMINATION>=5000])
+    SELECT T.MONTH_START, T.[MONTH], S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[DENOMINATION=0], T.[DENOMINATION=1TO499], T.[DENOMINATION=500T999], T.[DENOMINATION=1000TO2999], T.[DENOMINATION=3000TO4999], T.[DENOMINATION>=5000]
+    FROM [dbo].[txn_analysis_total_denom_cbi_vol_month] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_total_denom_cbi_vol_month];
+    EXEC sp_rename N'dbo.txn_analysis_total_denom_cbi_vol_month_new', N'txn_analysis_total_denom_cbi_vol_month';
+    EXEC sp_rename N'dbo.pk_txn_analysis_total_denom_cbi_vol_month_new', N'pk_txn_analysis_total_denom_cbi_vol_month', N'OBJECT';
+END
+
+--TOTAL PER CASH BILL CBI TXN MONTH
+IF OBJECT_ID(N'dbo.txn_analysis_total_per_cash_bill_cbi_txn_month', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month_new] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn_month_new PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month_new] (MONTH_START, [MONTH], STATUS_ID, FIRST_DATE, LAST_DATE, [P20_DENOM], [P50_DENOM], [P100_DENOM], [P200_DENOM], [P500_DENOM], [P1000_DENOM])
+    SELECT T.MONTH_START, T.[MONTH], S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[P20_DENOM], T.[P50_DENOM], T.[P100_DENOM], T.[P200_DENOM], T.[P500_DENOM], T.[P1000_DENOM]
+    FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month];
+    EXEC sp_rename N'dbo.txn_analysis_total_per_cash_bill_cbi_txn_month_new', N'txn_analysis_total_per_cash_bill_cbi_txn_month';
+    EXEC sp_rename N'dbo.pk_txn_analysis_total_per_cash_bill_cbi_txn_month_new', N'pk_txn_analysis_total_per_cash_bill_cbi_txn_month', N'OBJECT';
+END
+
+--TOTAL PER CASH BILL CBI VOL MONTH
+IF OBJECT_ID(N'dbo.txn_analysis_total_per_cash_bill_cbi_vol_month', N'U') IS NOT NULL
+BEGIN
+    CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month_new] (
+        MONTH_START  DATE NOT NULL,
+        [MONTH]      INT NOT NULL,
+        STATUS_ID    TINYINT NOT NULL,
+        FIRST_DATE   DATE NOT NULL,
+        LAST_DATE    DATE NOT NULL,
+        [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+        [P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+        CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol_month_new PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+    );
+
+    INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month_new] (MONTH_START, [MONTH], STATUS_ID, FIRST_DATE, LAST_DATE, [P20_DENOM], [P50_DENOM], [P100_DENOM], [P200_DENOM], [P500_DENOM], [P1000_DENOM])
+    SELECT T.MONTH_START, T.[MONTH], S.STATUS_ID, T.FIRST_DATE, T.LAST_DATE, T.[P20_DENOM], T.[P50_DENOM], T.[P100_DENOM], T.[P200_DENOM], T.[P500_DENOM], T.[P1000_DENOM]
+    FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month] T
+    INNER JOIN [dbo].[txn_analysis_status] S ON S.FINAL_STATUS = T.FINAL_STATUS;
+
+    DROP TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month];
+    EXEC sp_rename N'dbo.txn_analysis_total_per_cash_bill_cbi_vol_month_new', N'txn_analysis_total_per_cash_bill_cbi_vol_month';
+    EXEC sp_rename N'dbo.pk_txn_analysis_total_per_cash_bill_cbi_vol_month_new', N'pk_txn_analysis_total_per_cash_bill_cbi_vol_month', N'OBJECT';
+END
+
+COMMIT TRANSACTION;
@@ -1,12 +1,62 @@
 CREATE OR ALTER   PROCEDURE [dbo].[sp_txn_analysis]
 	@YEAR_START DATE,
     @START_DT DATE,
-    @END_DT   DATE
+    @END_DT   DATE,
+    @STAGING  VARCHAR(10) = 'TEMP'
 AS
 BEGIN
 SET NOCOUNT ON;
-
-DROP TABLE IF EXISTS TMP_TXN;
+SET XACT_ABORT ON;
+
+--Staging lives in #temp tables, private to this call and dropped when it returns,
+--so runs for other date ranges can execute concurrently on other connections.
+
+--With @STAGING = 'MEMORY' the transactions and cash bills of 1A to 1C are staged in
+--memory-optimized table variables instead, which are never written to tempdb or the
+--log. Their types come from sql/txn_analysis_memory_staging.sql. Either way the
+--staged rows are indexed on (TRANSACTION_CODE, TERMINAL_CODE) before they are joined.
+IF @STAGING NOT IN ('TEMP', 'MEMORY')
+    THROW 50000, 'sp_txn_analysis: @STAGING must be TEMP or MEMORY.', 1;
+
+--Filled by 1D. FINAL_STATUS and PAY_CASH_AMOUNT keep the source's types; the
+--buckets, counts and denomination sums have the types their expressions in 1C and 1D
+--produce whatever the source.
+SELECT TOP (0) CAST(NULL AS DATE) AS TRANSACTION_DATE
+, CAST(NULL AS INT) AS WEEK_NUM
+, CAST(NULL AS INT) AS [MONTH]
+, FINAL_STATUS
+, CAST(NULL AS INT) AS HOUR_BUCKET
+, CAST(NULL AS INT) AS SLA_BUCKET
+, CAST(NULL AS INT) AS AMOUNT_BUCKET
+, CAST(NULL AS INT) AS PAY_CASH_BUCKET
+, PAY_CASH_AMOUNT
+, CAST(0 AS INT) AS HAS_CBI
+, CAST(NULL AS INT) AS DENOMINATION_BUCKET
+, CAST(NULL AS DECIMAL(38,0)) AS TOTAL_DENOMINATION
+, CAST(NULL AS INT) AS P20
+, CAST(NULL AS INT) AS P50
+, CAST(NULL AS INT) AS P100
+, CAST(NULL AS INT) AS P200
+, CAST(NULL AS INT) AS P500
+, CAST(NULL AS INT) AS P1000
+INTO #TMP_TXN_ENRICHED
+FROM [BTIPAYMENTDB].[dbo].[TBL_TRANSACTION_MASTER];
+
+--1A to 1D run as one batch, written once for both kinds of staging: {TXN},
+--{RANKEDBILLS} and {CASHBILL1} name the staged tables and {TABLOCK} is the insert
+--hint, which only the #temp tables take.
+DECLARE @STAGE NVARCHAR(MAX) = N'
+--1A. TRANSACTIONS OF THE RANGE
+INSERT INTO {TXN}{TABLOCK} (
+	TRANSACTION_DATE,
+	CREATED_DATE,
+	UPDATED_DATE,
+	TRANSACTION_CODE,
+	TERMINAL_CODE,
+	FINAL_STATUS,
+	PAY_CASH_AMOUNT,
+	TRANSACTION_AMOUNT
+)
 SELECT TRANSACTION_DATE
 , CREATED_DATE
 , UPDATED_DATE
@@ -15,216 +65,578 @@ SELECT TRANSACTION_DATE
 , FINAL_STATUS
 , PAY_CASH_AMOUNT
 , TRANSACTION_AMOUNT
-INTO TMP_TXN
 FROM [BTIPAYMENTDB].[dbo].[TBL_TRANSACTION_MASTER]
-WHERE TRIM(CUSTOMER_MOBILE) <> ''
-AND CONVERT(DATE,TRANSACTION_DATE) BETWEEN @START_DT AND @END_DT
-;
+--Half-open range on the bare column, so it seeks. A blank CUSTOMER_MOBILE equals
+--'''' because trailing spaces are ignored, which matches the filtered index of
+--sql/tbl_transaction_master_indexes.sql and keeps the rows TRIM(...) <> '''' kept.
+WHERE TRANSACTION_DATE >= @START_DT
+AND TRANSACTION_DATE < DATEADD(DAY, 1, @END_DT)
+AND CUSTOMER_MOBILE <> '''';
 
 --1B. CASH BILL INSERTED TEMP TABLE - DEDUP
-DROP TABLE IF EXISTS TMP_RANKEDBILLS;
+INSERT INTO {RANKEDBILLS}{TABLOCK} (
+	TERMINAL_CODE,
+	TRANSACTION_CODE,
+	DENOMINATION,
+	INSERTED_DATE
+)
 SELECT A.TERMINAL_CODE
 , A.TRANSACTION_CODE
 , A.DENOMINATION
 , A.INSERTED_DATE
-INTO TMP_RANKEDBILLS
 FROM [BTIPAYMENTDB].[DBO].[TBL_TRANSACTION_INSERTED_BILL_LOGS] A
-INNER JOIN TMP_TXN B
+INNER JOIN {TXN} B
 ON A.TRANSACTION_CODE = B.TRANSACTION_CODE
---WHERE CONVERT(DATE,A.INSERTED_DATE) BETWEEN @START_DT AND @END_DT
 GROUP BY A.TERMINAL_CODE
 , A.TRANSACTION_CODE
 , A.DENOMINATION
 , A.INSERTED_DATE;
 
 --1C. CASH BILL INSERTED TEMP TABLE
-DROP TABLE IF EXISTS TMP_CASHBILL1;
+INSERT INTO {CASHBILL1}{TABLOCK} (
+	TRANSACTION_CODE,
+	TERMINAL_CODE,
+	START_INSERTED_DATE,
+	END_INSERTED_DATE,
+	P20,
+	P50,
+	P100,
+	P200,
+	P500,
+	P1000,
+	TOTAL_DENOMINATION
+)
 SELECT TRANSACTION_CODE
 , TERMINAL_CODE
 , MIN(INSERTED_DATE) AS START_INSERTED_DATE
 , MAX(INSERTED_DATE) AS END_INSERTED_DATE
-, SUM(CASE WHEN DENOMINATION = '20' THEN 1 ELSE 0 END) AS P20
-, SUM(CASE WHEN DENOMINATION = '50' THEN 1 ELSE 0 END) AS P50
-, SUM(CASE WHEN DENOMINATION = '100' THEN 1 ELSE 0 END) AS P100
-, SUM(CASE WHEN DENOMINATION = '200' THEN 1 ELSE 0 END) AS P200
-, SUM(CASE WHEN DENOMINATION = '500' THEN 1 ELSE 0 END) AS P500
-, SUM(CASE WHEN DENOMINATION = '1000' THEN 1 ELSE 0 END) AS P1000
+, SUM(CASE WHEN DENOMINATION = ''20'' THEN 1 ELSE 0 END) AS P20
+, SUM(CASE WHEN DENOMINATION = ''50'' THEN 1 ELSE 0 END) AS P50
+, SUM(CASE WHEN DENOMINATION = ''100'' THEN 1 ELSE 0 END) AS P100
+, SUM(CASE WHEN DENOMINATION = ''200'' THEN 1 ELSE 0 END) AS P200
+, SUM(CASE WHEN DENOMINATION = ''500'' THEN 1 ELSE 0 END) AS P500
+, SUM(CASE WHEN DENOMINATION = ''1000'' THEN 1 ELSE 0 END) AS P1000
 , SUM(CONVERT(DECIMAL,DENOMINATION)) AS TOTAL_DENOMINATION
-INTO TMP_CASHBILL1
-FROM TMP_RANKEDBILLS
+FROM {RANKEDBILLS}
 GROUP BY TRANSACTION_CODE, TERMINAL_CODE;
 
---TIME OF DAY - TXN_COUNT
+--1D. ENRICHED TRANSACTIONS - ONE ROW PER TRANSACTION, EVERY BUCKET AND THE CBI JOIN RESOLVED ONCE
 SET DATEFIRST 7;
 
-DELETE FROM [dbo].[txn_analysis_time_of_day_txn_count] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
-
-INSERT INTO [dbo].[txn_analysis_time_of_day_txn_count] (
-TRANSACTION_DATE,
-WEEK_NUM,
-FINAL_STATUS,
-[0-8],
-[9-12],
-[13-16],
-[17-20],
-[21-23]
+INSERT INTO #TMP_TXN_ENRICHED WITH (TABLOCK)
+SELECT CAST(A.TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
+, DATEDIFF(WK, @YEAR_START, A.TRANSACTION_DATE) + 1 AS WEEK_NUM
+, MONTH(A.TRANSACTION_DATE) AS [MONTH]
+, A.FINAL_STATUS
+, CASE WHEN M.HOUR_OF_DAY BETWEEN 0 AND 8 THEN 0
+	WHEN M.HOUR_OF_DAY BETWEEN 9 AND 12 THEN 1
+	WHEN M.HOUR_OF_DAY BETWEEN 13 AND 16 THEN 2
+	WHEN M.HOUR_OF_DAY BETWEEN 17 AND 20 THEN 3
+	WHEN M.HOUR_OF_DAY BETWEEN 21 AND 23 THEN 4
+	END AS HOUR_BUCKET
+, CASE WHEN M.SLA_SECONDS < 0 THEN 0
+	WHEN M.SLA_SECONDS = 0 THEN 1
+	WHEN M.SLA_SECONDS BETWEEN 1 AND 30 THEN 2
+	WHEN M.SLA_SECONDS BETWEEN 31 AND 60 THEN 3
+	WHEN M.SLA_SECONDS BETWEEN 61 AND 90 THEN 4
+	WHEN M.SLA_SECONDS BETWEEN 91 AND 120 THEN 5
+	WHEN M.SLA_SECONDS BETWEEN 121 AND 150 THEN 6
+	WHEN M.SLA_SECONDS > 150 THEN 7
+	END AS SLA_BUCKET
+, CASE WHEN COALESCE(A.TRANSACTION_AMOUNT,0) < 500 THEN 0
+	WHEN A.TRANSACTION_AMOUNT < 1000 THEN 1
+	WHEN A.TRANSACTION_AMOUNT < 3000 THEN 2
+	WHEN A.TRANSACTION_AMOUNT < 5000 THEN 3
+	ELSE 4
+	END AS AMOUNT_BUCKET
+, CASE WHEN COALESCE(A.PAY_CASH_AMOUNT,0) = 0 THEN 0
+	WHEN A.PAY_CASH_AMOUNT BETWEEN 1 AND 499 THEN 1
+	WHEN A.PAY_CASH_AMOUNT BETWEEN 500 AND 999 THEN 2
+	WHEN A.PAY_CASH_AMOUNT BETWEEN 1000 AND 2999 THEN 3
+	WHEN A.PAY_CASH_AMOUNT BETWEEN 3000 AND 4999 THEN 4
+	WHEN A.PAY_CASH_AMOUNT >= 5000 THEN 5
+	END AS PAY_CASH_BUCKET
+, A.PAY_CASH_AMOUNT
+, CASE WHEN B.TOTAL_DENOMINATION IS NULL THEN 0 ELSE 1 END AS HAS_CBI
+, CASE WHEN COALESCE(B.TOTAL_DENOMINATION,0) = 0 THEN 0
+	WHEN B.TOTAL_DENOMINATION BETWEEN 1 AND 499 THEN 1
+	WHEN B.TOTAL_DENOMINATION BETWEEN 500 AND 999 THEN 2
+	WHEN B.TOTAL_DENOMINATION BETWEEN 1000 AND 2999 THEN 3
+	WHEN B.TOTAL_DENOMINATION BETWEEN 3000 AND 4999 THEN 4
+	WHEN B.TOTAL_DENOMINATION >= 5000 THEN 5
+	END AS DENOMINATION_BUCKET
+, B.TOTAL_DENOMINATION
+, B.P20
+, B.P50
+, B.P100
+, B.P200
+, B.P500
+, B.P1000
+FROM {TXN} A
+CROSS APPLY (
+	SELECT DATEPART(HH,A.TRANSACTION_DATE) AS HOUR_OF_DAY
+	, DATEDIFF(SS,A.CREATED_DATE,A.UPDATED_DATE) AS SLA_SECONDS
+) M
+LEFT JOIN {CASHBILL1} B
+ON A.TRANSACTION_CODE = B.TRANSACTION_CODE
+AND A.TERMINAL_CODE = B.TERMINAL_CODE;
+';
+
+IF @STAGING = 'MEMORY'
+BEGIN
+    SET @STAGE = N'
+DECLARE @TMP_TXN [dbo].[txn_analysis_stage_txn];
+DECLARE @TMP_RANKEDBILLS [dbo].[txn_analysis_stage_bill];
+DECLARE @TMP_CASHBILL1 [dbo].[txn_analysis_stage_cashbill];
+' + REPLACE(REPLACE(REPLACE(REPLACE(@STAGE,
+        N'{TXN}', N'@TMP_TXN'),
+        N'{RANKEDBILLS}', N'@TMP_RANKEDBILLS'),
+        N'{CASHBILL1}', N'@TMP_CASHBILL1'),
+        N'{TABLOCK}', N'');
+END
+ELSE
+BEGIN
+    --Empty copies of the staged columns, so every type, length and nullability is the
+    --source's, exactly as SELECT ... INTO would make them; indexed before they are filled
+    SELECT TOP (0) TRANSACTION_DATE
+    , CREATED_DATE
+    , UPDATED_DATE
+    , TRANSACTION_CODE
+    , TERMINAL_CODE
+    , FINAL_STATUS
+    , PAY_CASH_AMOUNT
+    , TRANSACTION_AMOUNT
+    INTO #TMP_TXN
+    FROM [BTIPAYMENTDB].[dbo].[TBL_TRANSACTION_MASTER];
+    CREATE CLUSTERED INDEX ix_tmp_txn_code ON #TMP_TXN (TRANSACTION_CODE, TERMINAL_CODE);
+
+    SELECT TOP (0) TERMINAL_CODE
+    , TRANSACTION_CODE
+    , DENOMINATION
+    , INSERTED_DATE
+    INTO #TMP_RANKEDBILLS
+    FROM [BTIPAYMENTDB].[DBO].[TBL_TRANSACTION_INSERTED_BILL_LOGS];
+    CREATE CLUSTERED INDEX ix_tmp_rankedbills_code ON #TMP_RANKEDBILLS (TRANSACTION_CODE, TERMINAL_CODE);
+
+    --Same select list as 1C, so the aggregates get the types 1C produces
+    SELECT TOP (0) TRANSACTION_CODE
+    , TERMINAL_CODE
+    , MIN(INSERTED_DATE) AS START_INSERTED_DATE
+    , MAX(INSERTED_DATE) AS END_INSERTED_DATE
+    , SUM(CASE WHEN DENOMINATION = '20' THEN 1 ELSE 0 END) AS P20
+    , SUM(CASE WHEN DENOMINATION = '50' THEN 1 ELSE 0 END) AS P50
+    , SUM(CASE WHEN DENOMINATION = '100' THEN 1 ELSE 0 END) AS P100
+    , SUM(CASE WHEN DENOMINATION = '200' THEN 1 ELSE 0 END) AS P200
+    , SUM(CASE WHEN DENOMINATION = '500' THEN 1 ELSE 0 END) AS P500
+    , SUM(CASE WHEN DENOMINATION = '1000' THEN 1 ELSE 0 END) AS P1000
+    , SUM(CONVERT(DECIMAL,DENOMINATION)) AS TOTAL_DENOMINATION
+    INTO #TMP_CASHBILL1
+    FROM #TMP_RANKEDBILLS
+    GROUP BY TRANSACTION_CODE, TERMINAL_CODE;
+    CREATE UNIQUE CLUSTERED INDEX ix_tmp_cashbill1_code ON #TMP_CASHBILL1 (TRANSACTION_CODE, TERMINAL_CODE);
+
+    SET @STAGE = REPLACE(REPLACE(REPLACE(REPLACE(@STAGE,
+        N'{TXN}', N'#TMP_TXN'),
+        N'{RANKEDBILLS}', N'#TMP_RANKEDBILLS'),
+        N'{CASHBILL1}', N'#TMP_CASHBILL1'),
+        N'{TABLOCK}', N' WITH (TABLOCK)');
+END
+
+EXEC sp_executesql @STAGE,
+    N'@YEAR_START DATE, @START_DT DATE, @END_DT DATE',
+    @YEAR_START, @START_DT, @END_DT;
+
+--1E. STATUS KEYS - FINAL_STATUS VALUES NOT SEEN BEFORE ARE REGISTERED FIRST
+--Runs register one at a time, so two of them never add the same status
+BEGIN TRANSACTION;
+
+EXEC sp_getapplock @Resource = 'txn_analysis_rollup', @LockMode = 'Exclusive', @LockOwner = 'Transaction';
+
+INSERT INTO [dbo].[txn_analysis_status] (FINAL_STATUS)
+SELECT DISTINCT A.FINAL_STATUS
+FROM #TMP_TXN_ENRICHED A
+WHERE NOT EXISTS (SELECT 1 FROM [dbo].[txn_analysis_status] S WHERE S.FINAL_STATUS = A.FINAL_STATUS);
+
+COMMIT TRANSACTION;
+
+--1F. DAILY TOTALS - ONE GROUPED PASS OVER THE ENRICHED TRANSACTIONS, KEYED BY STATUS_ID
+--Split by HAS_CBI so the SLA tables with and without CBI read the same totals.
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, [MONTH]
+, STATUS_ID
+, HAS_CBI
+, SUM(CASE WHEN HOUR_BUCKET = 0 THEN 1 ELSE 0 END) AS [0-8]
+, SUM(CASE WHEN HOUR_BUCKET = 1 THEN 1 ELSE 0 END) AS [9-12]
+, SUM(CASE WHEN HOUR_BUCKET = 2 THEN 1 ELSE 0 END) AS [13-16]
+, SUM(CASE WHEN HOUR_BUCKET = 3 THEN 1 ELSE 0 END) AS [17-20]
+, SUM(CASE WHEN HOUR_BUCKET = 4 THEN 1 ELSE 0 END) AS [21-23]
+, SUM(CASE WHEN SLA_BUCKET = 0 THEN 1 ELSE 0 END) AS [SLA-<0]
+, SUM(CASE WHEN SLA_BUCKET = 1 THEN 1 ELSE 0 END) AS [SLA-=0]
+, SUM(CASE WHEN SLA_BUCKET = 2 THEN 1 ELSE 0 END) AS [SLA-1TO30]
+, SUM(CASE WHEN SLA_BUCKET = 3 THEN 1 ELSE 0 END) AS [SLA-31TO60]
+, SUM(CASE WHEN SLA_BUCKET = 4 THEN 1 ELSE 0 END) AS [SLA-61TO90]
+, SUM(CASE WHEN SLA_BUCKET = 5 THEN 1 ELSE 0 END) AS [SLA-91TO120]
+, SUM(CASE WHEN SLA_BUCKET = 6 THEN 1 ELSE 0 END) AS [SLA-121TO150]
+, SUM(CASE WHEN SLA_BUCKET = 7 THEN 1 ELSE 0 END) AS [SLA->150]
+, SUM(CASE WHEN AMOUNT_BUCKET = 0 THEN 1 ELSE 0 END) AS [< 500]
+, SUM(CASE WHEN AMOUNT_BUCKET = 1 THEN 1 ELSE 0 END) AS [500 TO 999]
+, SUM(CASE WHEN AMOUNT_BUCKET = 2 THEN 1 ELSE 0 END) AS [1000 TO 2999]
+, SUM(CASE WHEN AMOUNT_BUCKET = 3 THEN 1 ELSE 0 END) AS [3000 TO 4999]
+, SUM(CASE WHEN AMOUNT_BUCKET = 4 THEN 1 ELSE 0 END) AS [>= 5000]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 0 THEN 1 ELSE 0 END) AS [PAY_CASH=0 TXN]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 1 THEN 1 ELSE 0 END) AS [PAY_CASH=1TO499 TXN]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 2 THEN 1 ELSE 0 END) AS [PAY_CASH=500T999 TXN]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 3 THEN 1 ELSE 0 END) AS [PAY_CASH=1000TO2999 TXN]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 4 THEN 1 ELSE 0 END) AS [PAY_CASH=3000TO4999 TXN]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 5 THEN 1 ELSE 0 END) AS [PAY_CASH>=5000 TXN]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 0 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=0 VOL]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 1 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=1TO499 VOL]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 2 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=500T999 VOL]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 3 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=1000TO2999 VOL]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 4 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=3000TO4999 VOL]
+, SUM(CASE WHEN PAY_CASH_BUCKET = 5 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH>=5000 VOL]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 0 THEN 1 ELSE 0 END) AS [DENOMINATION=0 TXN]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 1 THEN 1 ELSE 0 END) AS [DENOMINATION=1TO499 TXN]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 2 THEN 1 ELSE 0 END) AS [DENOMINATION=500T999 TXN]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 3 THEN 1 ELSE 0 END) AS [DENOMINATION=1000TO2999 TXN]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 4 THEN 1 ELSE 0 END) AS [DENOMINATION=3000TO4999 TXN]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 5 THEN 1 ELSE 0 END) AS [DENOMINATION>=5000 TXN]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 0 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=0 VOL]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 1 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=1TO499 VOL]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 2 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=500T999 VOL]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 3 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=1000TO2999 VOL]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 4 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=3000TO4999 VOL]
+, SUM(CASE WHEN DENOMINATION_BUCKET = 5 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION>=5000 VOL]
+, SUM(P20) AS P20
+, SUM(P50) AS P50
+, SUM(P100) AS P100
+, SUM(P200) AS P200
+, SUM(P500) AS P500
+, SUM(P1000) AS P1000
+INTO #TMP_TXN_DAILY
+FROM #TMP_TXN_ENRICHED E
+INNER JOIN [dbo].[txn_analysis_status] S
+ON S.FINAL_STATUS = E.FINAL_STATUS
+GROUP BY TRANSACTION_DATE
+, WEEK_NUM
+, [MONTH]
+, STATUS_ID
+, HAS_CBI;
+
+--The reporting tables are partitioned by month. Every month the range touches is
+--rebuilt whole in the _stage tables and switched in at the end, so the live tables
+--only see metadata operations. The rebuild and the switch happen in one transaction,
+--so a failed run leaves them untouched and can be retried on its own.
+DECLARE @MONTH_FROM DATE = DATEFROMPARTS(YEAR(@START_DT), MONTH(@START_DT), 1);
+DECLARE @MONTH_LAST DATE = DATEFROMPARTS(YEAR(@END_DT), MONTH(@END_DT), 1);
+DECLARE @MONTH_AFTER DATE = DATEADD(MONTH, 1, @MONTH_LAST);
+
+--Every touched month needs a partition of its own before it can be switched. A split
+--locks every table on the partition scheme against readers, so it commits on its own
+--before the rebuild starts; months split ahead of the data stay empty until switched.
+BEGIN TRANSACTION;
+
+--Splits wait for the switches of parallel runs, which use the same partitions
+EXEC sp_getapplock @Resource = 'txn_analysis_rollup', @LockMode = 'Exclusive', @LockOwner = 'Transaction';
+
+EXEC [dbo].[sp_txn_analysis_add_partitions] @START_DT = @START_DT, @END_DT = @END_DT;
+
+COMMIT TRANSACTION;
+
+BEGIN TRANSACTION;
+
+--Parallel runs write one at a time: the touched months are rebuilt whole, and
+--another run may be rewriting days of the same months
+EXEC sp_getapplock @Resource = 'txn_analysis_rollup', @LockMode = 'Exclusive', @LockOwner = 'Transaction';
+
+--TIME OF DAY - TXN_COUNT
+TRUNCATE TABLE [dbo].[txn_analysis_time_of_day_txn_count_stage];
+
+--Days of the touched months outside the range are kept as they are
+INSERT INTO [dbo].[txn_analysis_time_of_day_txn_count_stage] (
+	TRANSACTION_DATE,
+    WEEK_NUM,
+    STATUS_ID,
+	[0-8],
+	[9-12],
+	[13-16],
+	[17-20],
+	[21-23]
+)
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, [0-8]
+, [9-12]
+, [13-16]
+, [17-20]
+, [21-23]
+FROM [dbo].[txn_analysis_time_of_day_txn_count]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_time_of_day_txn_count_stage] (
+	TRANSACTION_DATE,
+    WEEK_NUM,
+    STATUS_ID,
+	[0-8],
+	[9-12],
+	[13-16],
+	[17-20],
+	[21-23]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-, DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1 AS WEEK_NUM
-, FINAL_STATUS	
-, SUM(CASE WHEN DATEPART(HH,TRANSACTION_DATE) BETWEEN 0 AND 8 THEN 1 ELSE 0 END) AS [0-8]
-, SUM(CASE WHEN DATEPART(HH,TRANSACTION_DATE) BETWEEN 9 AND 12 THEN 1 ELSE 0 END) AS [9-12]
-, SUM(CASE WHEN DATEPART(HH,TRANSACTION_DATE) BETWEEN 13 AND 16 THEN 1 ELSE 0 END) AS [13-16]
-, SUM(CASE WHEN DATEPART(HH,TRANSACTION_DATE) BETWEEN 17 AND 20 THEN 1 ELSE 0 END) AS [17-20]
-, SUM(CASE WHEN DATEPART(HH,TRANSACTION_DATE) BETWEEN 21 AND 23 THEN 1 ELSE 0 END) AS [21-23]
-FROM TMP_TXN A
-GROUP BY DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1
-, FINAL_STATUS	
-, CAST(TRANSACTION_DATE AS DATE);
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, SUM([0-8]) AS [0-8]
+, SUM([9-12]) AS [9-12]
+, SUM([13-16]) AS [13-16]
+, SUM([17-20]) AS [17-20]
+, SUM([21-23]) AS [21-23]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID;
 
 --SLA
-DELETE FROM [dbo].[txn_analysis_sla] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
-
-INSERT INTO [dbo].[txn_analysis_sla] (
-TRANSACTION_DATE,
-WEEK_NUM,
-FINAL_STATUS,
-[SLA-<0],
-[SLA-=0],
-[SLA-1TO30],
-[SLA-31TO60],
-[SLA-61TO90],
-[SLA-91TO120],
-[SLA-121TO150],
-[SLA->150]
+TRUNCATE TABLE [dbo].[txn_analysis_sla_stage];
+
+INSERT INTO [dbo].[txn_analysis_sla_stage] (
+	TRANSACTION_DATE,
+    WEEK_NUM,
+    STATUS_ID,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
+	[SLA-91TO120],
+	[SLA-121TO150],
+	[SLA->150]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1 AS WEEK_NUM
-, FINAL_STATUS	
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) < 0 THEN 1 ELSE 0 END) AS [SLA-<0]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) = 0 THEN 1 ELSE 0 END) AS [SLA-=0]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 1 AND 30 THEN 1 ELSE 0 END) AS [SLA-1TO30]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 31 AND 60 THEN 1 ELSE 0 END) AS [SLA-31TO60]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 61 AND 90 THEN 1 ELSE 0 END) AS [SLA-61TO90]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 91 AND 120 THEN 1 ELSE 0 END) AS [SLA-91TO120]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 121 AND 150 THEN 1 ELSE 0 END) AS [SLA-121TO150]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) > 150 THEN 1 ELSE 0 END) AS [SLA->150]
-FROM TMP_TXN A
-GROUP BY DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, [SLA-<0]
+, [SLA-=0]
+, [SLA-1TO30]
+, [SLA-31TO60]
+, [SLA-61TO90]
+, [SLA-91TO120]
+, [SLA-121TO150]
+, [SLA->150]
+FROM [dbo].[txn_analysis_sla]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_sla_stage] (
+	TRANSACTION_DATE,
+    WEEK_NUM,
+    STATUS_ID,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
+	[SLA-91TO120],
+	[SLA-121TO150],
+	[SLA->150]
+)
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, SUM([SLA-<0]) AS [SLA-<0]
+, SUM([SLA-=0]) AS [SLA-=0]
+, SUM([SLA-1TO30]) AS [SLA-1TO30]
+, SUM([SLA-31TO60]) AS [SLA-31TO60]
+, SUM([SLA-61TO90]) AS [SLA-61TO90]
+, SUM([SLA-91TO120]) AS [SLA-91TO120]
+, SUM([SLA-121TO150]) AS [SLA-121TO150]
+, SUM([SLA->150]) AS [SLA->150]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID;
 
 --SLA WO CBI
+TRUNCATE TABLE [dbo].[txn_analysis_sla_wo_cbi_stage];
 
-DELETE FROM [dbo].[txn_analysis_sla_wo_cbi] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
-
-INSERT INTO [dbo].[txn_analysis_sla_wo_cbi] (
+INSERT INTO [dbo].[txn_analysis_sla_wo_cbi_stage] (
 	TRANSACTION_DATE,
     WEEK_NUM,
-    FINAL_STATUS,
-    [SLA-<0],
-    [SLA-=0],
-    [SLA-1TO30],
-    [SLA-31TO60],
-    [SLA-61TO90],
+    STATUS_ID,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
 	[SLA-91TO120],
 	[SLA-121TO150],
 	[SLA->150]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-, DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1 AS WEEK_NUM
-, FINAL_STATUS	
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) < 0 THEN 1 ELSE 0 END) AS [SLA-<0]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) = 0 THEN 1 ELSE 0 END) AS [SLA-=0]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 1 AND 30 THEN 1 ELSE 0 END) AS [SLA-0TO30]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 31 AND 60 THEN 1 ELSE 0 END) AS [SLA-31TO60]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 61 AND 90 THEN 1 ELSE 0 END) AS [SLA-61TO90]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 91 AND 120 THEN 1 ELSE 0 END) AS [SLA-91TO120]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 121 AND 150 THEN 1 ELSE 0 END) AS [SLA-121TO150]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) > 150 THEN 1 ELSE 0 END) AS [SLA->150]
-FROM TMP_TXN A
-LEFT JOIN TMP_CASHBILL1 B
-ON A.TRANSACTION_CODE = B.TRANSACTION_CODE 
-AND A.TERMINAL_CODE = B.TERMINAL_CODE
-WHERE B.TOTAL_DENOMINATION IS NULL
-GROUP BY DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
-
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, [SLA-<0]
+, [SLA-=0]
+, [SLA-1TO30]
+, [SLA-31TO60]
+, [SLA-61TO90]
+, [SLA-91TO120]
+, [SLA-121TO150]
+, [SLA->150]
+FROM [dbo].[txn_analysis_sla_wo_cbi]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_sla_wo_cbi_stage] (
+	TRANSACTION_DATE,
+    WEEK_NUM,
+    STATUS_ID,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
+	[SLA-91TO120],
+	[SLA-121TO150],
+	[SLA->150]
+)
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, SUM([SLA-<0]) AS [SLA-<0]
+, SUM([SLA-=0]) AS [SLA-=0]
+, SUM([SLA-1TO30]) AS [SLA-1TO30]
+, SUM([SLA-31TO60]) AS [SLA-31TO60]
+, SUM([SLA-61TO90]) AS [SLA-61TO90]
+, SUM([SLA-91TO120]) AS [SLA-91TO120]
+, SUM([SLA-121TO150]) AS [SLA-121TO150]
+, SUM([SLA->150]) AS [SLA->150]
+FROM #TMP_TXN_DAILY
+WHERE HAS_CBI = 0
+GROUP BY TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID;
 
 --SLA W CBI
-DELETE FROM [dbo].[txn_analysis_sla_with_cbi] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
+TRUNCATE TABLE [dbo].[txn_analysis_sla_with_cbi_stage];
 
-INSERT INTO [dbo].[txn_analysis_sla_with_cbi] (
+INSERT INTO [dbo].[txn_analysis_sla_with_cbi_stage] (
 	TRANSACTION_DATE,
     WEEK_NUM,
-    FINAL_STATUS,
-    [SLA-<0],
-    [SLA-=0],
-    [SLA-1TO30],
-    [SLA-31TO60],
-    [SLA-61TO90],
+    STATUS_ID,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
 	[SLA-91TO120],
 	[SLA-121TO150],
 	[SLA->150]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-, DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1 AS WEEK_NUM
-, FINAL_STATUS	
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) < 0 THEN 1 ELSE 0 END) AS [SLA-<0]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) = 0 THEN 1 ELSE 0 END) AS [SLA-=0]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 1 AND 30 THEN 1 ELSE 0 END) AS [SLA-0TO30]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 31 AND 60 THEN 1 ELSE 0 END) AS [SLA-31TO60]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 61 AND 90 THEN 1 ELSE 0 END) AS [SLA-61TO90]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 91 AND 120 THEN 1 ELSE 0 END) AS [SLA-91TO120]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) BETWEEN 121 AND 150 THEN 1 ELSE 0 END) AS [SLA-121TO150]
-, SUM(CASE WHEN DATEDIFF(SS,CREATED_DATE,UPDATED_DATE) > 150 THEN 1 ELSE 0 END) AS [SLA->150]
-FROM TMP_TXN A
-LEFT JOIN TMP_CASHBILL1 B
-ON A.TRANSACTION_CODE = B.TRANSACTION_CODE 
-AND A.TERMINAL_CODE = B.TERMINAL_CODE
-WHERE B.TOTAL_DENOMINATION IS NOT NULL
-GROUP BY DATEDIFF(WK, @YEAR_START, TRANSACTION_DATE) + 1
-, FINAL_STATUS	
-, CAST(TRANSACTION_DATE AS DATE);
-
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, [SLA-<0]
+, [SLA-=0]
+, [SLA-1TO30]
+, [SLA-31TO60]
+, [SLA-61TO90]
+, [SLA-91TO120]
+, [SLA-121TO150]
+, [SLA->150]
+FROM [dbo].[txn_analysis_sla_with_cbi]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_sla_with_cbi_stage] (
+	TRANSACTION_DATE,
+    WEEK_NUM,
+    STATUS_ID,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
+	[SLA-91TO120],
+	[SLA-121TO150],
+	[SLA->150]
+)
+SELECT TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID
+, SUM([SLA-<0]) AS [SLA-<0]
+, SUM([SLA-=0]) AS [SLA-=0]
+, SUM([SLA-1TO30]) AS [SLA-1TO30]
+, SUM([SLA-31TO60]) AS [SLA-31TO60]
+, SUM([SLA-61TO90]) AS [SLA-61TO90]
+, SUM([SLA-91TO120]) AS [SLA-91TO120]
+, SUM([SLA-121TO150]) AS [SLA-121TO150]
+, SUM([SLA->150]) AS [SLA->150]
+FROM #TMP_TXN_DAILY
+WHERE HAS_CBI = 1
+GROUP BY TRANSACTION_DATE
+, WEEK_NUM
+, STATUS_ID;
 
 --TRANSACTION_AMOUNT
-DELETE FROM [dbo].[txn_analysis_transaction_amount] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
+TRUNCATE TABLE [dbo].[txn_analysis_transaction_amount_stage];
 
-INSERT INTO [dbo].[txn_analysis_transaction_amount] (
+INSERT INTO [dbo].[txn_analysis_transaction_amount_stage] (
 	TRANSACTION_DATE,
     [MONTH],
-    FINAL_STATUS,
+    STATUS_ID,
 	[< 500],
-    [500 TO 999],
-    [1000 TO 2999],
-    [3000 TO 4999],
+	[500 TO 999],
+	[1000 TO 2999],
+	[3000 TO 4999],
 	[>= 5000]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,MONTH(TRANSACTION_DATE) AS MONTH
-, FINAL_STATUS
-, SUM(CASE WHEN COALESCE(TRANSACTION_AMOUNT,0) < 500 THEN 1 ELSE 0 END) AS [< 500]
-, SUM(CASE WHEN TRANSACTION_AMOUNT >= 500 AND TRANSACTION_AMOUNT < 1000 THEN 1 ELSE 0 END) AS [500 TO 999]
-, SUM(CASE WHEN TRANSACTION_AMOUNT >= 1000 AND TRANSACTION_AMOUNT < 3000 THEN 1 ELSE 0 END) AS [1000 TO 2999]
-, SUM(CASE WHEN TRANSACTION_AMOUNT >= 3000 AND TRANSACTION_AMOUNT < 5000 THEN 1 ELSE 0 END) AS [3000 TO 4999]
-, SUM(CASE WHEN TRANSACTION_AMOUNT >= 5000 THEN 1 ELSE 0 END) AS [>= 5000]
-FROM TMP_TXN A
-GROUP BY MONTH(TRANSACTION_DATE)
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
-
-
---PAY_CASH_AMOUNT - TXN MASTER 
-
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, [< 500]
+, [500 TO 999]
+, [1000 TO 2999]
+, [3000 TO 4999]
+, [>= 5000]
+FROM [dbo].[txn_analysis_transaction_amount]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_transaction_amount_stage] (
+	TRANSACTION_DATE,
+    [MONTH],
+    STATUS_ID,
+	[< 500],
+	[500 TO 999],
+	[1000 TO 2999],
+	[3000 TO 4999],
+	[>= 5000]
+)
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, SUM([< 500]) AS [< 500]
+, SUM([500 TO 999]) AS [500 TO 999]
+, SUM([1000 TO 2999]) AS [1000 TO 2999]
+, SUM([3000 TO 4999]) AS [3000 TO 4999]
+, SUM([>= 5000]) AS [>= 5000]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID;
+
+--PAY_CASH_AMOUNT - TXN MASTER
 --TRANSACTION COUNT PER PAY CASH AMOUNT RANGE AND FINAL STATUS
-DELETE FROM [dbo].[txn_analysis_pay_cash_amt_txn] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
+TRUNCATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn_stage];
 
-INSERT INTO [dbo].[txn_analysis_pay_cash_amt_txn] (
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_txn_stage] (
 	TRANSACTION_DATE,
     [MONTH],
-    FINAL_STATUS,
+    STATUS_ID,
 	[PAY_CASH=0],
 	[PAY_CASH=1TO499],
 	[PAY_CASH=500T999],
@@ -232,27 +644,51 @@ INSERT INTO [dbo].[txn_analysis_pay_cash_amt_txn] (
 	[PAY_CASH=3000TO4999],
 	[PAY_CASH>=5000]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,MONTH(TRANSACTION_DATE) AS MONTH
-, FINAL_STATUS
-, SUM(CASE WHEN COALESCE(PAY_CASH_AMOUNT,0) = 0 THEN 1 ELSE 0 END) AS [PAY_CASH=0]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 1 AND 499 THEN 1 ELSE 0 END) AS [PAY_CASH=1TO499]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 500 AND 999 THEN 1 ELSE 0 END) AS [PAY_CASH=500T999]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 1000 AND 2999 THEN 1 ELSE 0 END) AS [PAY_CASH=1000TO2999]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 3000 AND 4999 THEN 1 ELSE 0 END) AS [PAY_CASH=3000TO4999]
-, SUM(CASE WHEN PAY_CASH_AMOUNT >= 5000 THEN 1 ELSE 0 END) AS [PAY_CASH>=5000]
-FROM TMP_TXN A
-GROUP BY MONTH(TRANSACTION_DATE)
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, [PAY_CASH=0]
+, [PAY_CASH=1TO499]
+, [PAY_CASH=500T999]
+, [PAY_CASH=1000TO2999]
+, [PAY_CASH=3000TO4999]
+, [PAY_CASH>=5000]
+FROM [dbo].[txn_analysis_pay_cash_amt_txn]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_txn_stage] (
+	TRANSACTION_DATE,
+    [MONTH],
+    STATUS_ID,
+	[PAY_CASH=0],
+	[PAY_CASH=1TO499],
+	[PAY_CASH=500T999],
+	[PAY_CASH=1000TO2999],
+	[PAY_CASH=3000TO4999],
+	[PAY_CASH>=5000]
+)
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, SUM([PAY_CASH=0 TXN]) AS [PAY_CASH=0]
+, SUM([PAY_CASH=1TO499 TXN]) AS [PAY_CASH=1TO499]
+, SUM([PAY_CASH=500T999 TXN]) AS [PAY_CASH=500T999]
+, SUM([PAY_CASH=1000TO2999 TXN]) AS [PAY_CASH=1000TO2999]
+, SUM([PAY_CASH=3000TO4999 TXN]) AS [PAY_CASH=3000TO4999]
+, SUM([PAY_CASH>=5000 TXN]) AS [PAY_CASH>=5000]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID;
 
 --VOLUME PER PAY CASH AMOUNT RANGE AND FINAL STATUS
-DELETE FROM [dbo].[txn_analysis_pay_cash_amt_vol] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
+TRUNCATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol_stage];
 
-INSERT INTO [dbo].[txn_analysis_pay_cash_amt_vol] (
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_vol_stage] (
 	TRANSACTION_DATE,
     [MONTH],
-    FINAL_STATUS,
+    STATUS_ID,
 	[PAY_CASH=0],
 	[PAY_CASH=1TO499],
 	[PAY_CASH=500T999],
@@ -260,28 +696,52 @@ INSERT INTO [dbo].[txn_analysis_pay_cash_amt_vol] (
 	[PAY_CASH=3000TO4999],
 	[PAY_CASH>=5000]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,MONTH(TRANSACTION_DATE) AS MONTH
-, FINAL_STATUS
-, SUM(CASE WHEN COALESCE(PAY_CASH_AMOUNT,0) = 0 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=0]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 1 AND 499 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=1TO499]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 500 AND 999 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=500T999]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 1000 AND 2999 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=1000TO2999]
-, SUM(CASE WHEN PAY_CASH_AMOUNT BETWEEN 3000 AND 4999 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH=3000TO4999]
-, SUM(CASE WHEN PAY_CASH_AMOUNT >= 5000 THEN PAY_CASH_AMOUNT ELSE 0 END) AS [PAY_CASH>=5000]
-FROM TMP_TXN A
-GROUP BY MONTH(TRANSACTION_DATE)
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, [PAY_CASH=0]
+, [PAY_CASH=1TO499]
+, [PAY_CASH=500T999]
+, [PAY_CASH=1000TO2999]
+, [PAY_CASH=3000TO4999]
+, [PAY_CASH>=5000]
+FROM [dbo].[txn_analysis_pay_cash_amt_vol]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_vol_stage] (
+	TRANSACTION_DATE,
+    [MONTH],
+    STATUS_ID,
+	[PAY_CASH=0],
+	[PAY_CASH=1TO499],
+	[PAY_CASH=500T999],
+	[PAY_CASH=1000TO2999],
+	[PAY_CASH=3000TO4999],
+	[PAY_CASH>=5000]
+)
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, SUM([PAY_CASH=0 VOL]) AS [PAY_CASH=0]
+, SUM([PAY_CASH=1TO499 VOL]) AS [PAY_CASH=1TO499]
+, SUM([PAY_CASH=500T999 VOL]) AS [PAY_CASH=500T999]
+, SUM([PAY_CASH=1000TO2999 VOL]) AS [PAY_CASH=1000TO2999]
+, SUM([PAY_CASH=3000TO4999 VOL]) AS [PAY_CASH=3000TO4999]
+, SUM([PAY_CASH>=5000 VOL]) AS [PAY_CASH>=5000]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID;
 
 --TOTAL_DENOMINATION - CBI
 --TRANSACTION COUNT PER TOTAL DENOM RANGE AND FINAL STATUS
-DELETE FROM [dbo].[txn_analysis_total_denom_cbi_txn] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
+TRUNCATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn_stage];
 
-INSERT INTO [dbo].[txn_analysis_total_denom_cbi_txn] (
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_txn_stage] (
 	TRANSACTION_DATE,
     [MONTH],
-    FINAL_STATUS,
+    STATUS_ID,
 	[DENOMINATION=0],
 	[DENOMINATION=1TO499],
 	[DENOMINATION=500T999],
@@ -289,31 +749,51 @@ INSERT INTO [dbo].[txn_analysis_total_denom_cbi_txn] (
 	[DENOMINATION=3000TO4999],
 	[DENOMINATION>=5000]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,MONTH(TRANSACTION_DATE) AS MONTH
-, FINAL_STATUS
-, SUM(CASE WHEN COALESCE(TOTAL_DENOMINATION,0) = 0 THEN 1 ELSE 0 END) AS [DENOMINATION=0]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 1 AND 499 THEN 1 ELSE 0 END) AS [DENOMINATION=1TO499]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 500 AND 999 THEN 1 ELSE 0 END) AS [DENOMINATION=500T999]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 1000 AND 2999 THEN 1 ELSE 0 END) AS [DENOMINATION=1000TO2999]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 3000 AND 4999 THEN 1 ELSE 0 END) AS [DENOMINATION=3000TO4999]
-, SUM(CASE WHEN TOTAL_DENOMINATION >= 5000 THEN 1 ELSE 0 END) AS [DENOMINATION>=5000]
-FROM TMP_TXN A
-LEFT JOIN TMP_CASHBILL1 B
-ON A.TRANSACTION_CODE = B.TRANSACTION_CODE 
-AND A.TERMINAL_CODE = B.TERMINAL_CODE
-GROUP BY MONTH(TRANSACTION_DATE)
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, [DENOMINATION=0]
+, [DENOMINATION=1TO499]
+, [DENOMINATION=500T999]
+, [DENOMINATION=1000TO2999]
+, [DENOMINATION=3000TO4999]
+, [DENOMINATION>=5000]
+FROM [dbo].[txn_analysis_total_denom_cbi_txn]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_txn_stage] (
+	TRANSACTION_DATE,
+    [MONTH],
+    STATUS_ID,
+	[DENOMINATION=0],
+	[DENOMINATION=1TO499],
+	[DENOMINATION=500T999],
+	[DENOMINATION=1000TO2999],
+	[DENOMINATION=3000TO4999],
+	[DENOMINATION>=5000]
+)
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, SUM([DENOMINATION=0 TXN]) AS [DENOMINATION=0]
+, SUM([DENOMINATION=1TO499 TXN]) AS [DENOMINATION=1TO499]
+, SUM([DENOMINATION=500T999 TXN]) AS [DENOMINATION=500T999]
+, SUM([DENOMINATION=1000TO2999 TXN]) AS [DENOMINATION=1000TO2999]
+, SUM([DENOMINATION=3000TO4999 TXN]) AS [DENOMINATION=3000TO4999]
+, SUM([DENOMINATION>=5000 TXN]) AS [DENOMINATION>=5000]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID;
 
 --VOLUME PER TOTAL DENOM RANGE AND FINAL STATUS
+TRUNCATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol_stage];
 
-DELETE FROM [dbo].[txn_analysis_total_denom_cbi_vol] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
-
-INSERT INTO [dbo].[txn_analysis_total_denom_cbi_vol] (
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_vol_stage] (
 	TRANSACTION_DATE,
     [MONTH],
-    FINAL_STATUS,
+    STATUS_ID,
 	[DENOMINATION=0],
 	[DENOMINATION=1TO499],
 	[DENOMINATION=500T999],
@@ -321,32 +801,52 @@ INSERT INTO [dbo].[txn_analysis_total_denom_cbi_vol] (
 	[DENOMINATION=3000TO4999],
 	[DENOMINATION>=5000]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,MONTH(TRANSACTION_DATE) AS MONTH
-, FINAL_STATUS
-, ISNULL(SUM(CASE WHEN COALESCE(TOTAL_DENOMINATION,0) = 0 THEN TOTAL_DENOMINATION ELSE 0 END) , 0) AS [DENOMINATION=0]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 1 AND 499 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=1TO499]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 500 AND 999 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=500T999]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 1000 AND 2999 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=1000TO2999]
-, SUM(CASE WHEN TOTAL_DENOMINATION BETWEEN 3000 AND 4999 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION=3000TO4999]
-, SUM(CASE WHEN TOTAL_DENOMINATION >= 5000 THEN TOTAL_DENOMINATION ELSE 0 END) AS [DENOMINATION>=5000]
-FROM TMP_TXN A
-LEFT JOIN TMP_CASHBILL1 B
-ON A.TRANSACTION_CODE = B.TRANSACTION_CODE 
-AND A.TERMINAL_CODE = B.TERMINAL_CODE
-GROUP BY MONTH(TRANSACTION_DATE)
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, [DENOMINATION=0]
+, [DENOMINATION=1TO499]
+, [DENOMINATION=500T999]
+, [DENOMINATION=1000TO2999]
+, [DENOMINATION=3000TO4999]
+, [DENOMINATION>=5000]
+FROM [dbo].[txn_analysis_total_denom_cbi_vol]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_vol_stage] (
+	TRANSACTION_DATE,
+    [MONTH],
+    STATUS_ID,
+	[DENOMINATION=0],
+	[DENOMINATION=1TO499],
+	[DENOMINATION=500T999],
+	[DENOMINATION=1000TO2999],
+	[DENOMINATION=3000TO4999],
+	[DENOMINATION>=5000]
+)
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, ISNULL(SUM([DENOMINATION=0 VOL]), 0) AS [DENOMINATION=0]
+, SUM([DENOMINATION=1TO499 VOL]) AS [DENOMINATION=1TO499]
+, SUM([DENOMINATION=500T999 VOL]) AS [DENOMINATION=500T999]
+, SUM([DENOMINATION=1000TO2999 VOL]) AS [DENOMINATION=1000TO2999]
+, SUM([DENOMINATION=3000TO4999 VOL]) AS [DENOMINATION=3000TO4999]
+, SUM([DENOMINATION>=5000 VOL]) AS [DENOMINATION>=5000]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID;
 
 --TOTAL_PER CASH BILL - CBI
-
 -- TRANSACTION COUNT TOTAL_PER CASH BILL
-DELETE FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
+TRUNCATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_stage];
 
-INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] (
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_stage] (
 	TRANSACTION_DATE,
     [MONTH],
-    FINAL_STATUS,
+    STATUS_ID,
 	[P20_DENOM],
 	[P50_DENOM],
 	[P100_DENOM],
@@ -354,30 +854,51 @@ INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] (
 	[P500_DENOM],
 	[P1000_DENOM]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,MONTH(TRANSACTION_DATE) AS MONTH
-, FINAL_STATUS
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, [P20_DENOM]
+, [P50_DENOM]
+, [P100_DENOM]
+, [P200_DENOM]
+, [P500_DENOM]
+, [P1000_DENOM]
+FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_stage] (
+	TRANSACTION_DATE,
+    [MONTH],
+    STATUS_ID,
+	[P20_DENOM],
+	[P50_DENOM],
+	[P100_DENOM],
+	[P200_DENOM],
+	[P500_DENOM],
+	[P1000_DENOM]
+)
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
 , SUM(P20) AS [P20_DENOM]
 , SUM(P50) AS [P50_DENOM]
 , SUM(P100) AS [P100_DENOM]
 , SUM(P200) AS [P200_DENOM]
 , SUM(P500) AS [P500_DENOM]
 , SUM(P1000) AS [P1000_DENOM]
-FROM TMP_TXN A
-LEFT JOIN TMP_CASHBILL1 B
-ON A.TRANSACTION_CODE = B.TRANSACTION_CODE
-AND A.TERMINAL_CODE = B.TERMINAL_CODE
-GROUP BY MONTH(TRANSACTION_DATE)
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID;
 
 -- VOLUME COUNT TOTAL_PER CASH BILL
-DELETE FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] WHERE TRANSACTION_DATE BETWEEN @START_DT AND @END_DT;
+TRUNCATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_stage];
 
-INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] (
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_stage] (
 	TRANSACTION_DATE,
     [MONTH],
-    FINAL_STATUS,
+    STATUS_ID,
 	[P20_DENOM],
 	[P50_DENOM],
 	[P100_DENOM],
@@ -385,22 +906,64 @@ INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] (
 	[P500_DENOM],
 	[P1000_DENOM]
 )
-SELECT CAST(TRANSACTION_DATE AS DATE) AS TRANSACTION_DATE
-,MONTH(TRANSACTION_DATE) AS MONTH
-, FINAL_STATUS
-, SUM(P20 * 20) AS [P20_DENOM]
-, SUM(P50 * 50) AS [P50_DENOM]
-, SUM(P100 * 100) AS [P100_DENOM]
-, SUM(P200 * 200) AS [P200_DENOM]
-, SUM(P500 * 500) AS [P500_DENOM]
-, SUM(P1000 * 1000) AS [P1000_DENOM]
-FROM TMP_TXN A
-LEFT JOIN TMP_CASHBILL1 B
-ON A.TRANSACTION_CODE = B.TRANSACTION_CODE
-AND A.TERMINAL_CODE = B.TERMINAL_CODE
-GROUP BY MONTH(TRANSACTION_DATE)
-, FINAL_STATUS
-, CAST(TRANSACTION_DATE AS DATE);
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, [P20_DENOM]
+, [P50_DENOM]
+, [P100_DENOM]
+, [P200_DENOM]
+, [P500_DENOM]
+, [P1000_DENOM]
+FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < @MONTH_AFTER
+AND (TRANSACTION_DATE < @START_DT OR TRANSACTION_DATE > @END_DT);
+
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_stage] (
+	TRANSACTION_DATE,
+    [MONTH],
+    STATUS_ID,
+	[P20_DENOM],
+	[P50_DENOM],
+	[P100_DENOM],
+	[P200_DENOM],
+	[P500_DENOM],
+	[P1000_DENOM]
+)
+SELECT TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID
+, SUM(P20) * 20 AS [P20_DENOM]
+, SUM(P50) * 50 AS [P50_DENOM]
+, SUM(P100) * 100 AS [P100_DENOM]
+, SUM(P200) * 200 AS [P200_DENOM]
+, SUM(P500) * 500 AS [P500_DENOM]
+, SUM(P1000) * 1000 AS [P1000_DENOM]
+FROM #TMP_TXN_DAILY
+GROUP BY TRANSACTION_DATE
+, [MONTH]
+, STATUS_ID;
+
+--SWITCH THE REBUILT MONTHS IN
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_time_of_day_txn_count', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_sla', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_sla_wo_cbi', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_sla_with_cbi', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_transaction_amount', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_pay_cash_amt_txn', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_pay_cash_amt_vol', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_total_denom_cbi_txn', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_total_denom_cbi_vol', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_total_per_cash_bill_cbi_txn', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+EXEC [dbo].[sp_txn_analysis_switch_months] @TABLE = N'txn_analysis_total_per_cash_bill_cbi_vol', @MONTH_FROM = @MONTH_FROM, @MONTH_LAST = @MONTH_LAST;
+
+COMMIT TRANSACTION;
+
+--WEEK AND MONTH ROLLUPS OF THE PERIODS THE RANGE TOUCHED
+--After the commit, in the procedure's own transaction, so the switched tables are
+--not held while they regroup. A failed rollup leaves the switched months in place;
+--the retried run rebuilds both.
+EXEC [dbo].[sp_txn_analysis_rollup] @START_DT = @START_DT, @END_DT = @END_DT;
 
 END
 
@@ -0,0 +1,69 @@
+CREATE OR ALTER   PROCEDURE [dbo].[sp_txn_analysis_add_partitions]
+    @START_DT DATE,
+    @END_DT   DATE
+AS
+BEGIN
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+
+--Splits pf_txn_analysis_month so every month of @START_DT..@END_DT, and the one
+--after it, starts a partition of its own. Splitting ahead of the data keeps every
+--split a metadata operation on an empty partition.
+DECLARE @MONTH DATE = DATEFROMPARTS(YEAR(@START_DT), MONTH(@START_DT), 1);
+DECLARE @MONTH_AFTER DATE = DATEADD(MONTH, 1, DATEFROMPARTS(YEAR(@END_DT), MONTH(@END_DT), 1));
+
+WHILE @MONTH <= @MONTH_AFTER
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM sys.partition_range_values V
+        JOIN sys.partition_functions F ON F.function_id = V.function_id
+        WHERE F.name = 'pf_txn_analysis_month'
+        AND CAST(V.value AS DATE) = @MONTH
+    )
+    BEGIN
+        ALTER PARTITION SCHEME ps_txn_analysis_month NEXT USED [PRIMARY];
+        ALTER PARTITION FUNCTION pf_txn_analysis_month() SPLIT RANGE (@MONTH);
+    END
+
+    SET @MONTH = DATEADD(MONTH, 1, @MONTH);
+END
+
+END
+
+GO
+
+CREATE OR ALTER   PROCEDURE [dbo].[sp_txn_analysis_switch_months]
+    @TABLE      SYSNAME,
+    @MONTH_FROM DATE,
+    @MONTH_LAST DATE
+AS
+BEGIN
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+
+--Replaces the month partitions @MONTH_FROM..@MONTH_LAST of a reporting table with
+--the same partitions of its _stage table, which end up empty. Both the TRUNCATE
+--and the SWITCH are metadata operations. Partition numbers are literals in
+--TRUNCATE ... WITH (PARTITIONS), hence the dynamic SQL.
+DECLARE @FIRST INT = $PARTITION.pf_txn_analysis_month(@MONTH_FROM);
+DECLARE @LAST INT = $PARTITION.pf_txn_analysis_month(@MONTH_LAST);
+DECLARE @LIVE NVARCHAR(300) = N'[dbo].' + QUOTENAME(@TABLE);
+DECLARE @STAGE NVARCHAR(300) = N'[dbo].' + QUOTENAME(@TABLE + N'_stage');
+
+DECLARE @SQL NVARCHAR(MAX) = N'TRUNCATE TABLE ' + @LIVE
+    + N' WITH (PARTITIONS (' + CAST(@FIRST AS NVARCHAR(10)) + N' TO ' + CAST(@LAST AS NVARCHAR(10)) + N'));';
+DECLARE @PARTITION INT = @FIRST;
+WHILE @PARTITION <= @LAST
+BEGIN
+    SET @SQL += N'
+ALTER TABLE ' + @STAGE + N' SWITCH PARTITION ' + CAST(@PARTITION AS NVARCHAR(10))
+        + N' TO ' + @LIVE + N' PARTITION ' + CAST(@PARTITION AS NVARCHAR(10)) + N';';
+    SET @PARTITION += 1;
+END
+
+EXEC sp_executesql @SQL;
+
+END
+
+GO
@@ -0,0 +1,400 @@
+CREATE OR ALTER   PROCEDURE [dbo].[sp_txn_analysis_rollup]
+    @START_DT DATE,
+    @END_DT   DATE
+AS
+BEGIN
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+SET DATEFIRST 7;
+
+--Rebuilds the week and month rollups of every period holding a date of
+--@START_DT..@END_DT from the daily tables. sp_txn_analysis calls it in its own
+--transaction; sql/migrate_txn_analysis_rollups.sql calls it once over the dates
+--loaded before the rollups existed.
+DECLARE @WEEK_FROM DATE = DATEADD(DAY, 1 - DATEPART(WEEKDAY, @START_DT), @START_DT);
+DECLARE @WEEK_TO DATE = DATEADD(DAY, 1 - DATEPART(WEEKDAY, @END_DT), @END_DT);
+DECLARE @MONTH_FROM DATE = DATEFROMPARTS(YEAR(@START_DT), MONTH(@START_DT), 1);
+DECLARE @MONTH_TO DATE = DATEFROMPARTS(YEAR(@END_DT), MONTH(@END_DT), 1);
+
+BEGIN TRANSACTION;
+
+--Runs that touch the same week or month take turns, so each one regroups the
+--daily rows the others committed
+EXEC sp_getapplock @Resource = 'txn_analysis_rollup', @LockMode = 'Exclusive', @LockOwner = 'Transaction';
+
+--TIME OF DAY TXN COUNT WEEK
+DELETE FROM [dbo].[txn_analysis_time_of_day_txn_count_week] WHERE WEEK_START BETWEEN @WEEK_FROM AND @WEEK_TO;
+
+INSERT INTO [dbo].[txn_analysis_time_of_day_txn_count_week] (
+	WEEK_START,
+    WEEK_NUM,
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[0-8],
+	[9-12],
+	[13-16],
+	[17-20],
+	[21-23]
+)
+SELECT DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE) AS WEEK_START
+, WEEK_NUM
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([0-8]) AS [0-8]
+, SUM([9-12]) AS [9-12]
+, SUM([13-16]) AS [13-16]
+, SUM([17-20]) AS [17-20]
+, SUM([21-23]) AS [21-23]
+FROM [dbo].[txn_analysis_time_of_day_txn_count]
+WHERE TRANSACTION_DATE >= @WEEK_FROM AND TRANSACTION_DATE < DATEADD(DAY, 7, @WEEK_TO)
+GROUP BY DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE)
+, WEEK_NUM
+, STATUS_ID;
+
+--SLA WEEK
+DELETE FROM [dbo].[txn_analysis_sla_week] WHERE WEEK_START BETWEEN @WEEK_FROM AND @WEEK_TO;
+
+INSERT INTO [dbo].[txn_analysis_sla_week] (
+	WEEK_START,
+    WEEK_NUM,
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
+	[SLA-91TO120],
+	[SLA-121TO150],
+	[SLA->150]
+)
+SELECT DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE) AS WEEK_START
+, WEEK_NUM
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([SLA-<0]) AS [SLA-<0]
+, SUM([SLA-=0]) AS [SLA-=0]
+, SUM([SLA-1TO30]) AS [SLA-1TO30]
+, SUM([SLA-31TO60]) AS [SLA-31TO60]
+, SUM([SLA-61TO90]) AS [SLA-61TO90]
+, SUM([SLA-91TO120]) AS [SLA-91TO120]
+, SUM([SLA-121TO150]) AS [SLA-121TO150]
+, SUM([SLA->150]) AS [SLA->150]
+FROM [dbo].[txn_analysis_sla]
+WHERE TRANSACTION_DATE >= @WEEK_FROM AND TRANSACTION_DATE < DATEADD(DAY, 7, @WEEK_TO)
+GROUP BY DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE)
+, WEEK_NUM
+, STATUS_ID;
+
+--SLA WO CBI WEEK
+DELETE FROM [dbo].[txn_analysis_sla_wo_cbi_week] WHERE WEEK_START BETWEEN @WEEK_FROM AND @WEEK_TO;
+
+INSERT INTO [dbo].[txn_analysis_sla_wo_cbi_week] (
+	WEEK_START,
+    WEEK_NUM,
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
+	[SLA-91TO120],
+	[SLA-121TO150],
+	[SLA->150]
+)
+SELECT DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE) AS WEEK_START
+, WEEK_NUM
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([SLA-<0]) AS [SLA-<0]
+, SUM([SLA-=0]) AS [SLA-=0]
+, SUM([SLA-1TO30]) AS [SLA-1TO30]
+, SUM([SLA-31TO60]) AS [SLA-31TO60]
+, SUM([SLA-61TO90]) AS [SLA-61TO90]
+, SUM([SLA-91TO120]) AS [SLA-91TO120]
+, SUM([SLA-121TO150]) AS [SLA-121TO150]
+, SUM([SLA->150]) AS [SLA->150]
+FROM [dbo].[txn_analysis_sla_wo_cbi]
+WHERE TRANSACTION_DATE >= @WEEK_FROM AND TRANSACTION_DATE < DATEADD(DAY, 7, @WEEK_TO)
+GROUP BY DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE)
+, WEEK_NUM
+, STATUS_ID;
+
+--SLA WITH CBI WEEK
+DELETE FROM [dbo].[txn_analysis_sla_with_cbi_week] WHERE WEEK_START BETWEEN @WEEK_FROM AND @WEEK_TO;
+
+INSERT INTO [dbo].[txn_analysis_sla_with_cbi_week] (
+	WEEK_START,
+    WEEK_NUM,
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[SLA-<0],
+	[SLA-=0],
+	[SLA-1TO30],
+	[SLA-31TO60],
+	[SLA-61TO90],
+	[SLA-91TO120],
+	[SLA-121TO150],
+	[SLA->150]
+)
+SELECT DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE) AS WEEK_START
+, WEEK_NUM
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([SLA-<0]) AS [SLA-<0]
+, SUM([SLA-=0]) AS [SLA-=0]
+, SUM([SLA-1TO30]) AS [SLA-1TO30]
+, SUM([SLA-31TO60]) AS [SLA-31TO60]
+, SUM([SLA-61TO90]) AS [SLA-61TO90]
+, SUM([SLA-91TO120]) AS [SLA-91TO120]
+, SUM([SLA-121TO150]) AS [SLA-121TO150]
+, SUM([SLA->150]) AS [SLA->150]
+FROM [dbo].[txn_analysis_sla_with_cbi]
+WHERE TRANSACTION_DATE >= @WEEK_FROM AND TRANSACTION_DATE < DATEADD(DAY, 7, @WEEK_TO)
+GROUP BY DATEADD(DAY, 1 - DATEPART(WEEKDAY, TRANSACTION_DATE), TRANSACTION_DATE)
+, WEEK_NUM
+, STATUS_ID;
+
+--TRANSACTION AMOUNT MONTH
+DELETE FROM [dbo].[txn_analysis_transaction_amount_month] WHERE MONTH_START BETWEEN @MONTH_FROM AND @MONTH_TO;
+
+INSERT INTO [dbo].[txn_analysis_transaction_amount_month] (
+	MONTH_START,
+    [MONTH],
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[< 500],
+	[500 TO 999],
+	[1000 TO 2999],
+	[3000 TO 4999],
+	[>= 5000]
+)
+SELECT DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1) AS MONTH_START
+, [MONTH]
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([< 500]) AS [< 500]
+, SUM([500 TO 999]) AS [500 TO 999]
+, SUM([1000 TO 2999]) AS [1000 TO 2999]
+, SUM([3000 TO 4999]) AS [3000 TO 4999]
+, SUM([>= 5000]) AS [>= 5000]
+FROM [dbo].[txn_analysis_transaction_amount]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < DATEADD(MONTH, 1, @MONTH_TO)
+GROUP BY DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1)
+, [MONTH]
+, STATUS_ID;
+
+--PAY CASH AMT TXN MONTH
+DELETE FROM [dbo].[txn_analysis_pay_cash_amt_txn_month] WHERE MONTH_START BETWEEN @MONTH_FROM AND @MONTH_TO;
+
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_txn_month] (
+	MONTH_START,
+    [MONTH],
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[PAY_CASH=0],
+	[PAY_CASH=1TO499],
+	[PAY_CASH=500T999],
+	[PAY_CASH=1000TO2999],
+	[PAY_CASH=3000TO4999],
+	[PAY_CASH>=5000]
+)
+SELECT DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1) AS MONTH_START
+, [MONTH]
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([PAY_CASH=0]) AS [PAY_CASH=0]
+, SUM([PAY_CASH=1TO499]) AS [PAY_CASH=1TO499]
+, SUM([PAY_CASH=500T999]) AS [PAY_CASH=500T999]
+, SUM([PAY_CASH=1000TO2999]) AS [PAY_CASH=1000TO2999]
+, SUM([PAY_CASH=3000TO4999]) AS [PAY_CASH=3000TO4999]
+, SUM([PAY_CASH>=5000]) AS [PAY_CASH>=5000]
+FROM [dbo].[txn_analysis_pay_cash_amt_txn]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < DATEADD(MONTH, 1, @MONTH_TO)
+GROUP BY DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1)
+, [MONTH]
+, STATUS_ID;
+
+--PAY CASH AMT VOL MONTH
+DELETE FROM [dbo].[txn_analysis_pay_cash_amt_vol_month] WHERE MONTH_START BETWEEN @MONTH_FROM AND @MONTH_TO;
+
+INSERT INTO [dbo].[txn_analysis_pay_cash_amt_vol_month] (
+	MONTH_START,
+    [MONTH],
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[PAY_CASH=0],
+	[PAY_CASH=1TO499],
+	[PAY_CASH=500T999],
+	[PAY_CASH=1000TO2999],
+	[PAY_CASH=3000TO4999],
+	[PAY_CASH>=5000]
+)
+SELECT DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1) AS MONTH_START
+, [MONTH]
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([PAY_CASH=0]) AS [PAY_CASH=0]
+, SUM([PAY_CASH=1TO499]) AS [PAY_CASH=1TO499]
+, SUM([PAY_CASH=500T999]) AS [PAY_CASH=500T999]
+, SUM([PAY_CASH=1000TO2999]) AS [PAY_CASH=1000TO2999]
+, SUM([PAY_CASH=3000TO4999]) AS [PAY_CASH=3000TO4999]
+, SUM([PAY_CASH>=5000]) AS [PAY_CASH>=5000]
+FROM [dbo].[txn_analysis_pay_cash_amt_vol]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < DATEADD(MONTH, 1, @MONTH_TO)
+GROUP BY DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1)
+, [MONTH]
+, STATUS_ID;
+
+--TOTAL DENOM CBI TXN MONTH
+DELETE FROM [dbo].[txn_analysis_total_denom_cbi_txn_month] WHERE MONTH_START BETWEEN @MONTH_FROM AND @MONTH_TO;
+
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_txn_month] (
+	MONTH_START,
+    [MONTH],
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[DENOMINATION=0],
+	[DENOMINATION=1TO499],
+	[DENOMINATION=500T999],
+	[DENOMINATION=1000TO2999],
+	[DENOMINATION=3000TO4999],
+	[DENOMINATION>=5000]
+)
+SELECT DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1) AS MONTH_START
+, [MONTH]
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([DENOMINATION=0]) AS [DENOMINATION=0]
+, SUM([DENOMINATION=1TO499]) AS [DENOMINATION=1TO499]
+, SUM([DENOMINATION=500T999]) AS [DENOMINATION=500T999]
+, SUM([DENOMINATION=1000TO2999]) AS [DENOMINATION=1000TO2999]
+, SUM([DENOMINATION=3000TO4999]) AS [DENOMINATION=3000TO4999]
+, SUM([DENOMINATION>=5000]) AS [DENOMINATION>=5000]
+FROM [dbo].[txn_analysis_total_denom_cbi_txn]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < DATEADD(MONTH, 1, @MONTH_TO)
+GROUP BY DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1)
+, [MONTH]
+, STATUS_ID;
+
+--TOTAL DENOM CBI VOL MONTH
+DELETE FROM [dbo].[txn_analysis_total_denom_cbi_vol_month] WHERE MONTH_START BETWEEN @MONTH_FROM AND @MONTH_TO;
+
+INSERT INTO [dbo].[txn_analysis_total_denom_cbi_vol_month] (
+	MONTH_START,
+    [MONTH],
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[DENOMINATION=0],
+	[DENOMINATION=1TO499],
+	[DENOMINATION=500T999],
+	[DENOMINATION=1000TO2999],
+	[DENOMINATION=3000TO4999],
+	[DENOMINATION>=5000]
+)
+SELECT DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1) AS MONTH_START
+, [MONTH]
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([DENOMINATION=0]) AS [DENOMINATION=0]
+, SUM([DENOMINATION=1TO499]) AS [DENOMINATION=1TO499]
+, SUM([DENOMINATION=500T999]) AS [DENOMINATION=500T999]
+, SUM([DENOMINATION=1000TO2999]) AS [DENOMINATION=1000TO2999]
+, SUM([DENOMINATION=3000TO4999]) AS [DENOMINATION=3000TO4999]
+, SUM([DENOMINATION>=5000]) AS [DENOMINATION>=5000]
+FROM [dbo].[txn_analysis_total_denom_cbi_vol]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < DATEADD(MONTH, 1, @MONTH_TO)
+GROUP BY DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1)
+, [MONTH]
+, STATUS_ID;
+
+--TOTAL PER CASH BILL CBI TXN MONTH
+DELETE FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month] WHERE MONTH_START BETWEEN @MONTH_FROM AND @MONTH_TO;
+
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month] (
+	MONTH_START,
+    [MONTH],
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[P20_DENOM],
+	[P50_DENOM],
+	[P100_DENOM],
+	[P200_DENOM],
+	[P500_DENOM],
+	[P1000_DENOM]
+)
+SELECT DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1) AS MONTH_START
+, [MONTH]
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([P20_DENOM]) AS [P20_DENOM]
+, SUM([P50_DENOM]) AS [P50_DENOM]
+, SUM([P100_DENOM]) AS [P100_DENOM]
+, SUM([P200_DENOM]) AS [P200_DENOM]
+, SUM([P500_DENOM]) AS [P500_DENOM]
+, SUM([P1000_DENOM]) AS [P1000_DENOM]
+FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_txn]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < DATEADD(MONTH, 1, @MONTH_TO)
+GROUP BY DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1)
+, [MONTH]
+, STATUS_ID;
+
+--TOTAL PER CASH BILL CBI VOL MONTH
+DELETE FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month] WHERE MONTH_START BETWEEN @MONTH_FROM AND @MONTH_TO;
+
+INSERT INTO [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month] (
+	MONTH_START,
+    [MONTH],
+    STATUS_ID,
+    FIRST_DATE,
+    LAST_DATE,
+	[P20_DENOM],
+	[P50_DENOM],
+	[P100_DENOM],
+	[P200_DENOM],
+	[P500_DENOM],
+	[P1000_DENOM]
+)
+SELECT DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1) AS MONTH_START
+, [MONTH]
+, STATUS_ID
+, MIN(TRANSACTION_DATE) AS FIRST_DATE
+, MAX(TRANSACTION_DATE) AS LAST_DATE
+, SUM([P20_DENOM]) AS [P20_DENOM]
+, SUM([P50_DENOM]) AS [P50_DENOM]
+, SUM([P100_DENOM]) AS [P100_DENOM]
+, SUM([P200_DENOM]) AS [P200_DENOM]
+, SUM([P500_DENOM]) AS [P500_DENOM]
+, SUM([P1000_DENOM]) AS [P1000_DENOM]
+FROM [dbo].[txn_analysis_total_per_cash_bill_cbi_vol]
+WHERE TRANSACTION_DATE >= @MONTH_FROM AND TRANSACTION_DATE < DATEADD(MONTH, 1, @MONTH_TO)
+GROUP BY DATEFROMPARTS(YEAR(TRANSACTION_DATE), MONTH(TRANSACTION_DATE), 1)
+, [MONTH]
+, STATUS_ID;
+
+COMMIT TRANSACTION;
+
+END
+
+GO
@@ -0,0 +1,19 @@
+--Indexes on the source tables that the extraction of sp_txn_analysis (1A and 1B)
+--seeks. Build them in a quiet window; ONLINE = ON needs Enterprise edition.
+
+--1A. TRANSACTIONS OF THE RANGE
+--Range seek on TRANSACTION_DATE, covering every column the procedure stages.
+--Filtered on the same predicate as the procedure, so rows without a mobile number
+--are never stored. Statements writing TBL_TRANSACTION_MASTER need ANSI_NULLS and
+--QUOTED_IDENTIFIER ON, the driver defaults, once a filtered index exists.
+CREATE NONCLUSTERED INDEX ix_transaction_master_txn_analysis
+ON [BTIPAYMENTDB].[dbo].[TBL_TRANSACTION_MASTER] (TRANSACTION_DATE)
+INCLUDE (CREATED_DATE, UPDATED_DATE, TRANSACTION_CODE, TERMINAL_CODE, FINAL_STATUS, PAY_CASH_AMOUNT, TRANSACTION_AMOUNT)
+WHERE CUSTOMER_MOBILE <> ''
+WITH (ONLINE = ON, DATA_COMPRESSION = PAGE);
+
+--1B. CASH BILLS OF THE STAGED TRANSACTIONS
+CREATE NONCLUSTERED INDEX ix_inserted_bill_logs_txn_analysis
+ON [BTIPAYMENTDB].[dbo].[TBL_TRANSACTION_INSERTED_BILL_LOGS] (TRANSACTION_CODE)
+INCLUDE (TERMINAL_CODE, DENOMINATION, INSERTED_DATE)
+WITH (ONLINE = ON, DATA_COMPRESSION = PAGE);
@@ -1,3 +1,16 @@
+--LEGACY - DO NOT DEPLOY. The original heap layout of the daily tables, keyed by the
+--FINAL_STATUS strings: the schema installs made before the compressed layout still
+--have, and the "before" side of benchmarks/bench_txn_analysis_storage.py.
+--sp_txn_analysis cannot run on it: there are no _stage tables, partition scheme,
+--status dimension or rollups. An install on it is upgraded by running, in order:
+--  1. sql/migrate_txn_analysis_compressed.sql
+--  2. sql/sp_txn_analysis_partitions.sql
+--  3. sql/txn_analysis_partitioning.sql
+--  4. sql/migrate_txn_analysis_status.sql
+--  5. sql/sp_txn_analysis_rollup.sql and sql/sp_sla_report.sql
+--  6. sql/migrate_txn_analysis_rollups.sql
+--A fresh install runs sql/txn_analysis_ddl_compressed.sql, then steps 2, 3 and 5.
+
 CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count] (
 	TRANSACTION_DATE DATE NULL,
     WEEK_NUM     INT NOT NULL,
@@ -0,0 +1,338 @@
+--Compact variant of sql/txn_analysis_ddl.sql: every daily table is clustered on
+--its (TRANSACTION_DATE, period key, STATUS_ID) key with PAGE compression, in
+--place of a heap with two nonclustered date indexes. Report queries read a date
+--range in clustered key order, and the stored procedure's DELETE/INSERT of a
+--range touches only that range's pages.
+--A few thousand rows a year per table never fill a columnstore rowgroup, so
+--the tables stay rowstore. Existing tables are converted, still keyed by
+--FINAL_STATUS, by sql/migrate_txn_analysis_compressed.sql; its header lists the
+--rest of the upgrade.
+--This is the file a fresh install starts from: it also creates the status
+--dimension and the week and month rollups. Either way, install
+--sql/sp_txn_analysis_partitions.sql and run sql/txn_analysis_partitioning.sql
+--next: sp_txn_analysis switches whole month partitions in.
+
+--FINAL_STATUS labels, stored once; the reporting tables keep their STATUS_ID.
+--sp_txn_analysis registers statuses it has not seen before.
+CREATE TABLE [dbo].[txn_analysis_status] (
+    STATUS_ID    TINYINT IDENTITY(1,1) NOT NULL,
+    FINAL_STATUS VARCHAR(50) NOT NULL,
+    CONSTRAINT pk_txn_analysis_status PRIMARY KEY CLUSTERED (STATUS_ID),
+    CONSTRAINT uq_txn_analysis_status_final_status UNIQUE (FINAL_STATUS)
+);
+
+CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [0-8]        INT NOT NULL DEFAULT 0,
+    [9-12]       INT NOT NULL DEFAULT 0,
+    [13-16]      INT NOT NULL DEFAULT 0,
+    [17-20]      INT NOT NULL DEFAULT 0,
+    [21-23]      INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_time_of_day_txn_count PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_sla] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_sla_wo_cbi] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_wo_cbi PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_sla_with_cbi] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_with_cbi PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_transaction_amount] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [< 500] INT NOT NULL DEFAULT 0,
+    [500 TO 999] INT NOT NULL DEFAULT 0,
+    [1000 TO 2999] INT NOT NULL DEFAULT 0,
+    [3000 TO 4999] INT NOT NULL DEFAULT 0,
+    [>= 5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_transaction_amount PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [PAY_CASH=0] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] INT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_txn PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [PAY_CASH=0] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_vol PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [DENOMINATION=0] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] INT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_txn PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [DENOMINATION=0] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_vol PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count_week] (
+    WEEK_START   DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [0-8] INT NOT NULL DEFAULT 0,
+    [9-12] INT NOT NULL DEFAULT 0,
+    [13-16] INT NOT NULL DEFAULT 0,
+    [17-20] INT NOT NULL DEFAULT 0,
+    [21-23] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_time_of_day_txn_count_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_sla_week] (
+    WEEK_START   DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+    [SLA-91TO120] INT NOT NULL DEFAULT 0,
+    [SLA-121TO150] INT NOT NULL DEFAULT 0,
+    [SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_sla_wo_cbi_week] (
+    WEEK_START   DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+    [SLA-91TO120] INT NOT NULL DEFAULT 0,
+    [SLA-121TO150] INT NOT NULL DEFAULT 0,
+    [SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_wo_cbi_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_sla_with_cbi_week] (
+    WEEK_START   DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+    [SLA-91TO120] INT NOT NULL DEFAULT 0,
+    [SLA-121TO150] INT NOT NULL DEFAULT 0,
+    [SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_with_cbi_week PRIMARY KEY CLUSTERED (WEEK_START, WEEK_NUM, STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_transaction_amount_month] (
+    MONTH_START  DATE NOT NULL,
+    [MONTH]      INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [< 500] INT NOT NULL DEFAULT 0,
+    [500 TO 999] INT NOT NULL DEFAULT 0,
+    [1000 TO 2999] INT NOT NULL DEFAULT 0,
+    [3000 TO 4999] INT NOT NULL DEFAULT 0,
+    [>= 5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_transaction_amount_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn_month] (
+    MONTH_START  DATE NOT NULL,
+    [MONTH]      INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [PAY_CASH=0] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_txn_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol_month] (
+    MONTH_START  DATE NOT NULL,
+    [MONTH]      INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [PAY_CASH=0] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_vol_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn_month] (
+    MONTH_START  DATE NOT NULL,
+    [MONTH]      INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [DENOMINATION=0] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_txn_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol_month] (
+    MONTH_START  DATE NOT NULL,
+    [MONTH]      INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [DENOMINATION=0] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_vol_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_month] (
+    MONTH_START  DATE NOT NULL,
+    [MONTH]      INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
+
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_month] (
+    MONTH_START  DATE NOT NULL,
+    [MONTH]      INT NOT NULL,
+    STATUS_ID    TINYINT NOT NULL,
+    FIRST_DATE   DATE NOT NULL,
+    LAST_DATE    DATE NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol_month PRIMARY KEY CLUSTERED (MONTH_START, [MONTH], STATUS_ID) WITH (DATA_COMPRESSION = PAGE)
+);
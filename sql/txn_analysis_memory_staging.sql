@@ -0,0 +1,127 @@
+--Memory-optimized table types for sp_txn_analysis @STAGING = 'MEMORY'. Table
+--variables of these types hold the staged transactions and cash bills of a run in
+--memory only: nothing is written to tempdb and nothing is logged, and each run
+--still gets private copies. The database needs a MEMORY_OPTIMIZED_DATA filegroup
+--first, e.g.
+--
+--  ALTER DATABASE CURRENT ADD FILEGROUP txn_analysis_mod CONTAINS MEMORY_OPTIMIZED_DATA;
+--  ALTER DATABASE CURRENT ADD FILE (NAME = 'txn_analysis_mod', FILENAME = 'D:\Data\txn_analysis_mod')
+--      TO FILEGROUP txn_analysis_mod;
+--
+--Staged rows count against the server's memory for the length of a run, so size
+--[procedure] chunk and workers in config.ini to fit.
+--
+--The staged columns take their type, length, collation and nullability from
+--sys.columns of the source tables, as the #temp tables of the TEMP staging do, so
+--the types are generated here rather than written out. Run the script again after
+--the source columns change; it drops and recreates the types.
+SET XACT_ABORT ON;
+
+--STAGED COLUMNS - A SOURCE COLUMN, OR A FIXED TYPE FOR THE AGGREGATES OF 1C
+DECLARE @COLUMNS TABLE (
+    TYPE_NAME     SYSNAME NOT NULL,
+    POSITION      INT NOT NULL,
+    COLUMN_NAME   SYSNAME NOT NULL,
+    SOURCE_TABLE  SYSNAME NULL,
+    SOURCE_COLUMN SYSNAME NULL,
+    FORCE_NULL    BIT NOT NULL DEFAULT 0,
+    FIXED_TYPE    NVARCHAR(100) NULL
+);
+
+INSERT INTO @COLUMNS (TYPE_NAME, POSITION, COLUMN_NAME, SOURCE_TABLE, SOURCE_COLUMN, FORCE_NULL, FIXED_TYPE)
+VALUES
+--1A. TRANSACTIONS OF THE RANGE
+    (N'txn_analysis_stage_txn', 1, N'TRANSACTION_DATE', N'TBL_TRANSACTION_MASTER', N'TRANSACTION_DATE', 0, NULL),
+    (N'txn_analysis_stage_txn', 2, N'CREATED_DATE', N'TBL_TRANSACTION_MASTER', N'CREATED_DATE', 0, NULL),
+    (N'txn_analysis_stage_txn', 3, N'UPDATED_DATE', N'TBL_TRANSACTION_MASTER', N'UPDATED_DATE', 0, NULL),
+    (N'txn_analysis_stage_txn', 4, N'TRANSACTION_CODE', N'TBL_TRANSACTION_MASTER', N'TRANSACTION_CODE', 0, NULL),
+    (N'txn_analysis_stage_txn', 5, N'TERMINAL_CODE', N'TBL_TRANSACTION_MASTER', N'TERMINAL_CODE', 0, NULL),
+    (N'txn_analysis_stage_txn', 6, N'FINAL_STATUS', N'TBL_TRANSACTION_MASTER', N'FINAL_STATUS', 0, NULL),
+    (N'txn_analysis_stage_txn', 7, N'PAY_CASH_AMOUNT', N'TBL_TRANSACTION_MASTER', N'PAY_CASH_AMOUNT', 0, NULL),
+    (N'txn_analysis_stage_txn', 8, N'TRANSACTION_AMOUNT', N'TBL_TRANSACTION_MASTER', N'TRANSACTION_AMOUNT', 0, NULL),
+--1B. DEDUPLICATED CASH BILLS
+    (N'txn_analysis_stage_bill', 1, N'TERMINAL_CODE', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'TERMINAL_CODE', 0, NULL),
+    (N'txn_analysis_stage_bill', 2, N'TRANSACTION_CODE', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'TRANSACTION_CODE', 0, NULL),
+    (N'txn_analysis_stage_bill', 3, N'DENOMINATION', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'DENOMINATION', 0, NULL),
+    (N'txn_analysis_stage_bill', 4, N'INSERTED_DATE', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'INSERTED_DATE', 0, NULL),
+--1C. CASH BILLS PER TRANSACTION
+    (N'txn_analysis_stage_cashbill', 1, N'TRANSACTION_CODE', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'TRANSACTION_CODE', 0, NULL),
+    (N'txn_analysis_stage_cashbill', 2, N'TERMINAL_CODE', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'TERMINAL_CODE', 0, NULL),
+    (N'txn_analysis_stage_cashbill', 3, N'START_INSERTED_DATE', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'INSERTED_DATE', 1, NULL),
+    (N'txn_analysis_stage_cashbill', 4, N'END_INSERTED_DATE', N'TBL_TRANSACTION_INSERTED_BILL_LOGS', N'INSERTED_DATE', 1, NULL),
+    (N'txn_analysis_stage_cashbill', 5, N'P20', NULL, NULL, 0, N'INT NULL'),
+    (N'txn_analysis_stage_cashbill', 6, N'P50', NULL, NULL, 0, N'INT NULL'),
+    (N'txn_analysis_stage_cashbill', 7, N'P100', NULL, NULL, 0, N'INT NULL'),
+    (N'txn_analysis_stage_cashbill', 8, N'P200', NULL, NULL, 0, N'INT NULL'),
+    (N'txn_analysis_stage_cashbill', 9, N'P500', NULL, NULL, 0, N'INT NULL'),
+    (N'txn_analysis_stage_cashbill', 10, N'P1000', NULL, NULL, 0, N'INT NULL'),
+    (N'txn_analysis_stage_cashbill', 11, N'TOTAL_DENOMINATION', NULL, NULL, 0, N'DECIMAL(38,0) NULL');
+
+--SOURCE TYPES
+DECLARE @DEFINITIONS TABLE (
+    TYPE_NAME   SYSNAME NOT NULL,
+    POSITION    INT NOT NULL,
+    COLUMN_NAME SYSNAME NOT NULL,
+    DEFINITION  NVARCHAR(300) NULL
+);
+
+INSERT INTO @DEFINITIONS (TYPE_NAME, POSITION, COLUMN_NAME, DEFINITION)
+SELECT C.TYPE_NAME
+, C.POSITION
+, C.COLUMN_NAME
+, COALESCE(C.FIXED_TYPE,
+    UPPER(T.name)
+    + CASE WHEN T.name IN ('varchar', 'char', 'varbinary', 'binary')
+            THEN '(' + CASE WHEN S.max_length = -1 THEN 'MAX' ELSE CAST(S.max_length AS VARCHAR(10)) END + ')'
+        WHEN T.name IN ('nvarchar', 'nchar')
+            THEN '(' + CASE WHEN S.max_length = -1 THEN 'MAX' ELSE CAST(S.max_length / 2 AS VARCHAR(10)) END + ')'
+        WHEN T.name IN ('decimal', 'numeric')
+            THEN '(' + CAST(S.precision AS VARCHAR(10)) + ',' + CAST(S.scale AS VARCHAR(10)) + ')'
+        WHEN T.name IN ('datetime2', 'datetimeoffset', 'time')
+            THEN '(' + CAST(S.scale AS VARCHAR(10)) + ')'
+        ELSE '' END
+    + CASE WHEN S.collation_name IS NOT NULL THEN ' COLLATE ' + S.collation_name ELSE '' END
+    + CASE WHEN S.is_nullable = 1 OR C.FORCE_NULL = 1 THEN ' NULL' ELSE ' NOT NULL' END)
+FROM @COLUMNS C
+LEFT JOIN [BTIPAYMENTDB].sys.columns S
+ON S.object_id = OBJECT_ID(N'[BTIPAYMENTDB].[dbo].' + QUOTENAME(C.SOURCE_TABLE))
+AND S.name = C.SOURCE_COLUMN
+LEFT JOIN [BTIPAYMENTDB].sys.types T
+ON T.user_type_id = S.system_type_id;
+
+IF EXISTS (SELECT 1 FROM @DEFINITIONS WHERE DEFINITION IS NULL)
+BEGIN
+    DECLARE @MISSING NVARCHAR(2000) = N'Source columns not found: ' + (
+        SELECT STRING_AGG(C.SOURCE_TABLE + N'.' + C.SOURCE_COLUMN, N', ')
+        FROM @COLUMNS C
+        JOIN @DEFINITIONS D ON D.TYPE_NAME = C.TYPE_NAME AND D.POSITION = C.POSITION
+        WHERE D.DEFINITION IS NULL
+    );
+    THROW 50000, @MISSING, 1;
+END
+
+--TYPES - EACH INDEXED ON (TRANSACTION_CODE, TERMINAL_CODE) LIKE THE #TEMP TABLES
+DECLARE @TYPE_NAME SYSNAME;
+DECLARE @SQL NVARCHAR(MAX);
+DECLARE TYPE_CURSOR CURSOR LOCAL FAST_FORWARD FOR
+    SELECT DISTINCT TYPE_NAME FROM @DEFINITIONS;
+
+OPEN TYPE_CURSOR;
+FETCH NEXT FROM TYPE_CURSOR INTO @TYPE_NAME;
+WHILE @@FETCH_STATUS = 0
+BEGIN
+    SELECT @SQL = N'CREATE TYPE [dbo].' + QUOTENAME(@TYPE_NAME) + N' AS TABLE (
+    ' + STRING_AGG(QUOTENAME(COLUMN_NAME) + N' ' + DEFINITION, N',
+    ') WITHIN GROUP (ORDER BY POSITION) + N',
+    INDEX ' + QUOTENAME(N'ix_' + @TYPE_NAME + N'_code') + N' NONCLUSTERED (TRANSACTION_CODE, TERMINAL_CODE)
+) WITH (MEMORY_OPTIMIZED = ON);'
+    FROM @DEFINITIONS
+    WHERE TYPE_NAME = @TYPE_NAME;
+
+    EXEC (N'DROP TYPE IF EXISTS [dbo].' + QUOTENAME(@TYPE_NAME) + N';');
+    EXEC (@SQL);
+
+    FETCH NEXT FROM TYPE_CURSOR INTO @TYPE_NAME;
+END
+CLOSE TYPE_CURSOR;
+DEALLOCATE TYPE_CURSOR;
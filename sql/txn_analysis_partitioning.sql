@@ -0,0 +1,258 @@
+--Partitions the daily txn_analysis tables by month and creates the _stage tables
+--sp_txn_analysis rebuilds the months it touches in before switching them in.
+--Run it once on the layout of sql/txn_analysis_ddl_compressed.sql, fresh or
+--converted by sql/migrate_txn_analysis_compressed.sql, after installing
+--sql/sp_txn_analysis_partitions.sql. The week and month rollups stay unpartitioned.
+--Tables still keyed by FINAL_STATUS keep it here. That is step 3 of an upgrade
+--from sql/txn_analysis_ddl.sql, which runs, in order:
+--  1. sql/migrate_txn_analysis_compressed.sql
+--  2. sql/sp_txn_analysis_partitions.sql
+--  3. sql/txn_analysis_partitioning.sql
+--  4. sql/migrate_txn_analysis_status.sql
+--  5. sql/sp_txn_analysis_rollup.sql and sql/sp_sla_report.sql
+--  6. sql/migrate_txn_analysis_rollups.sql
+SET XACT_ABORT ON;
+
+BEGIN TRANSACTION;
+
+IF NOT EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = 'pf_txn_analysis_month')
+    CREATE PARTITION FUNCTION pf_txn_analysis_month (DATE) AS RANGE RIGHT FOR VALUES ('2025-01-01');
+
+IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = 'ps_txn_analysis_month')
+    CREATE PARTITION SCHEME ps_txn_analysis_month AS PARTITION pf_txn_analysis_month ALL TO ([PRIMARY]);
+
+--One partition per month from the first loaded date to a year ahead, split while
+--no table uses the function yet
+DECLARE @FIRST_DATE DATE = ISNULL((SELECT MIN(TRANSACTION_DATE) FROM [dbo].[txn_analysis_transaction_amount]), GETDATE());
+DECLARE @YEAR_AHEAD DATE = DATEADD(YEAR, 1, GETDATE());
+EXEC [dbo].[sp_txn_analysis_add_partitions] @START_DT = @FIRST_DATE, @END_DT = @YEAR_AHEAD;
+
+--The tables and _stage tables are keyed by the status column the tables have:
+--{STATUS} is its definition and {STATUS_KEY} its name.
+DECLARE @TABLES NVARCHAR(MAX) = N'
+--TIME OF DAY TXN COUNT
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_time_of_day_txn_count ON [dbo].[txn_analysis_time_of_day_txn_count] (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_time_of_day_txn_count_stage];
+CREATE TABLE [dbo].[txn_analysis_time_of_day_txn_count_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [0-8]        INT NOT NULL DEFAULT 0,
+    [9-12]       INT NOT NULL DEFAULT 0,
+    [13-16]      INT NOT NULL DEFAULT 0,
+    [17-20]      INT NOT NULL DEFAULT 0,
+    [21-23]      INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_time_of_day_txn_count_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--SLA
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_sla ON [dbo].[txn_analysis_sla] (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_sla_stage];
+CREATE TABLE [dbo].[txn_analysis_sla_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--SLA WO CBI
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_sla_wo_cbi ON [dbo].[txn_analysis_sla_wo_cbi] (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_sla_wo_cbi_stage];
+CREATE TABLE [dbo].[txn_analysis_sla_wo_cbi_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_wo_cbi_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--SLA WITH CBI
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_sla_with_cbi ON [dbo].[txn_analysis_sla_with_cbi] (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_sla_with_cbi_stage];
+CREATE TABLE [dbo].[txn_analysis_sla_with_cbi_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    WEEK_NUM     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [SLA-<0] INT NOT NULL DEFAULT 0,
+    [SLA-=0] INT NOT NULL DEFAULT 0,
+    [SLA-1TO30] INT NOT NULL DEFAULT 0,
+    [SLA-31TO60] INT NOT NULL DEFAULT 0,
+    [SLA-61TO90] INT NOT NULL DEFAULT 0,
+	[SLA-91TO120] INT NOT NULL DEFAULT 0,
+	[SLA-121TO150] INT NOT NULL DEFAULT 0,
+	[SLA->150] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_sla_with_cbi_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, WEEK_NUM, {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TRANSACTION AMOUNT
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_transaction_amount ON [dbo].[txn_analysis_transaction_amount] (TRANSACTION_DATE, [MONTH], {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_transaction_amount_stage];
+CREATE TABLE [dbo].[txn_analysis_transaction_amount_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [< 500] INT NOT NULL DEFAULT 0,
+    [500 TO 999] INT NOT NULL DEFAULT 0,
+    [1000 TO 2999] INT NOT NULL DEFAULT 0,
+    [3000 TO 4999] INT NOT NULL DEFAULT 0,
+    [>= 5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_transaction_amount_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--PAY CASH AMT TXN
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_pay_cash_amt_txn ON [dbo].[txn_analysis_pay_cash_amt_txn] (TRANSACTION_DATE, [MONTH], {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_pay_cash_amt_txn_stage];
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_txn_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [PAY_CASH=0] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] INT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] INT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_txn_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--PAY CASH AMT VOL
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_pay_cash_amt_vol ON [dbo].[txn_analysis_pay_cash_amt_vol] (TRANSACTION_DATE, [MONTH], {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_pay_cash_amt_vol_stage];
+CREATE TABLE [dbo].[txn_analysis_pay_cash_amt_vol_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [PAY_CASH=0] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=500T999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [PAY_CASH=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[PAY_CASH>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_pay_cash_amt_vol_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL DENOM CBI TXN
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_total_denom_cbi_txn ON [dbo].[txn_analysis_total_denom_cbi_txn] (TRANSACTION_DATE, [MONTH], {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_total_denom_cbi_txn_stage];
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_txn_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [DENOMINATION=0] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] INT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] INT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] INT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_txn_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL DENOM CBI VOL
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_total_denom_cbi_vol ON [dbo].[txn_analysis_total_denom_cbi_vol] (TRANSACTION_DATE, [MONTH], {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_total_denom_cbi_vol_stage];
+CREATE TABLE [dbo].[txn_analysis_total_denom_cbi_vol_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [DENOMINATION=0] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1TO499] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=500T999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=1000TO2999] BIGINT NOT NULL DEFAULT 0,
+    [DENOMINATION=3000TO4999] BIGINT NOT NULL DEFAULT 0,
+	[DENOMINATION>=5000] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_denom_cbi_vol_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL PER CASH BILL CBI TXN
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_total_per_cash_bill_cbi_txn ON [dbo].[txn_analysis_total_per_cash_bill_cbi_txn] (TRANSACTION_DATE, [MONTH], {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_stage];
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_txn_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_txn_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+--TOTAL PER CASH BILL CBI VOL
+CREATE UNIQUE CLUSTERED INDEX pk_txn_analysis_total_per_cash_bill_cbi_vol ON [dbo].[txn_analysis_total_per_cash_bill_cbi_vol] (TRANSACTION_DATE, [MONTH], {STATUS_KEY})
+WITH (DROP_EXISTING = ON, DATA_COMPRESSION = PAGE)
+ON ps_txn_analysis_month (TRANSACTION_DATE);
+
+DROP TABLE IF EXISTS [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_stage];
+CREATE TABLE [dbo].[txn_analysis_total_per_cash_bill_cbi_vol_stage] (
+	TRANSACTION_DATE DATE NOT NULL,
+    [MONTH]     INT NOT NULL,
+    {STATUS} NOT NULL,
+    [P20_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P50_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P100_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P200_DENOM] BIGINT NOT NULL DEFAULT 0,
+    [P500_DENOM] BIGINT NOT NULL DEFAULT 0,
+	[P1000_DENOM] BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_txn_analysis_total_per_cash_bill_cbi_vol_stage PRIMARY KEY CLUSTERED (TRANSACTION_DATE, [MONTH], {STATUS_KEY}) WITH (DATA_COMPRESSION = PAGE)
+) ON ps_txn_analysis_month (TRANSACTION_DATE);
+';
+
+IF COL_LENGTH(N'dbo.txn_analysis_transaction_amount', N'STATUS_ID') IS NULL
+    SET @TABLES = REPLACE(REPLACE(@TABLES,
+        N'{STATUS}', N'FINAL_STATUS VARCHAR(50)'),
+        N'{STATUS_KEY}', N'FINAL_STATUS');
+ELSE
+    SET @TABLES = REPLACE(REPLACE(@TABLES,
+        N'{STATUS}', N'STATUS_ID    TINYINT'),
+        N'{STATUS_KEY}', N'STATUS_ID');
+
+EXEC sp_executesql @TABLES;
+
+COMMIT TRANSACTION;